@@ -0,0 +1,227 @@
+"""
+Archive Manager for PWD Tools Desktop Application
+Moves closed financial years into per-year database files
+"""
+
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+from config.migrations import DASHBOARD_TABLES, dashboard_expressions, financial_year_sql, table_columns
+
+FINANCIAL_YEAR_PATTERN = re.compile(r"^(\d{4})-(\d{2})$")
+# Archives attached to one connection at a time; SQLite allows 10
+# attached databases by default, so some are left for other callers
+ATTACH_BATCH = 8
+
+
+def financial_year_for(day=None):
+    """Return the April-March financial year ('2024-25') containing a date"""
+    day = day or date.today()
+    if isinstance(day, str):
+        day = datetime.strptime(day[:10], "%Y-%m-%d").date()
+    start_year = day.year if day.month >= 4 else day.year - 1
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def archive_alias(financial_year):
+    """Schema name an archive is attached under, e.g. archive_2023_24"""
+    match = FINANCIAL_YEAR_PATTERN.match(financial_year or "")
+    if not match:
+        raise ValueError(f"Invalid financial year: {financial_year}")
+    return f"archive_{match.group(1)}_{match.group(2)}"
+
+
+class ArchiveManager:
+    """Moves closed financial years out of the live tables into archive files
+
+    Each archived year lives in its own file (archive_2023_24.db) next to the
+    live database, with the same tables. The live tables, and therefore
+    everyday queries and backups, only hold open years; archives are attached
+    on demand when a query reaches back into them.
+    """
+
+    def __init__(self, db_manager, archive_dir=None):
+        self.db_manager = db_manager
+        if archive_dir is None:
+            self.archive_dir = Path(db_manager.db_path).parent / "archive"
+        else:
+            self.archive_dir = Path(archive_dir)
+        self._lock = threading.Lock()
+
+    def archive_path(self, financial_year):
+        """Return the archive file for a financial year"""
+        return self.archive_dir / f"{archive_alias(financial_year)}.db"
+
+    def archived_years(self):
+        """Return the financial years already archived, oldest first"""
+        rows = self.db_manager.fetch_all("SELECT financial_year FROM archives ORDER BY financial_year")
+        return [row[0] for row in rows]
+
+    def closed_years(self):
+        """Return financial years before the current one that still have live records"""
+        rows = self.db_manager.fetch_all('''
+            SELECT DISTINCT financial_year FROM dashboard_stats
+            WHERE record_count > 0 AND financial_year < ? AND financial_year != 'Unknown'
+            ORDER BY financial_year
+        ''', (financial_year_for(),))
+        return [row[0] for row in rows]
+
+    def years_between(self, date_from=None, date_to=None):
+        """Return archived years overlapping the date range (open ends allowed)"""
+        first = financial_year_for(date_from) if date_from else None
+        last = financial_year_for(date_to) if date_to else None
+        return [
+            year for year in self.archived_years()
+            if (first is None or year >= first) and (last is None or year <= last)
+        ]
+
+    def attach(self, conn, financial_year):
+        """Attach a year's archive file to a connection (no-op if already attached)"""
+        alias = archive_alias(financial_year)
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        if alias not in attached:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(self.archive_path(financial_year)),))
+        return alias
+
+    def detach(self, conn, financial_year):
+        """Detach a year's archive file from a connection if it is attached"""
+        alias = archive_alias(financial_year)
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        if alias in attached:
+            conn.execute(f"DETACH DATABASE {alias}")
+
+    @contextmanager
+    def attached(self, conn, financial_years):
+        """Attach archives for the duration of a with block
+
+        Yields {financial_year: alias} for the archives that could be
+        attached. On exit the archives this call attached are detached
+        again, so the connection never accumulates attachments.
+        """
+        before = {row[1] for row in conn.execute("PRAGMA database_list")}
+        aliases = {}
+        try:
+            for financial_year in financial_years:
+                try:
+                    aliases[financial_year] = self.attach(conn, financial_year)
+                except sqlite3.Error as e:
+                    print(f"Error attaching archive {financial_year}: {e}")
+            yield aliases
+        finally:
+            for financial_year, alias in aliases.items():
+                if alias in before:
+                    continue
+                try:
+                    conn.execute(f"DETACH DATABASE {alias}")
+                except sqlite3.Error as e:
+                    print(f"Error detaching archive {financial_year}: {e}")
+
+    def archive_year(self, financial_year):
+        """Move every record of a closed financial year into its archive file
+
+        The archive is a separate file, and in WAL mode SQLite does not
+        commit an attached file atomically with the main one. The move
+        therefore runs in two transactions: the rows are first copied and
+        committed to the archive, then deleted from the live tables - but
+        only rows whose id the archive now holds. An interruption leaves
+        rows in both places at worst, never in neither, and running the
+        archive again completes it: rows already in the archive are not
+        copied twice. The totals of the deleted rows move to archive_stats
+        with the delete. The archive is detached again afterwards, also
+        on failure. Returns {table: rows moved}.
+        """
+        if financial_year >= financial_year_for():
+            raise ValueError(f"Financial year {financial_year} is not closed yet")
+
+        with self._lock:
+            conn = self.db_manager.get_connection()
+            with self.attached(conn, [financial_year]) as aliases:
+                if financial_year not in aliases:
+                    raise sqlite3.OperationalError(f"Could not attach the archive of {financial_year}")
+                return self._move_year(financial_year, aliases[financial_year])
+
+    def _move_year(self, financial_year, alias):
+        """Copy a year's rows into the attached archive, then delete them from the live tables"""
+        tables = {}
+        with self.db_manager.transaction() as cursor:
+            for table_name, spec in DASHBOARD_TABLES.items():
+                if spec["date"] not in table_columns(cursor, table_name):
+                    continue
+                column_list = ", ".join(self._create_archive_table(cursor, alias, table_name))
+                date_column = f"{table_name}.{spec['date']}"
+                in_year = f"{financial_year_sql(date_column)} = ?"
+                cursor.execute(f'''
+                    INSERT INTO {alias}.{table_name} ({column_list})
+                    SELECT {column_list} FROM main.{table_name}
+                    WHERE {in_year} AND id NOT IN (SELECT id FROM {alias}.{table_name})
+                ''', (financial_year,))
+                tables[table_name] = in_year
+
+        moved = {}
+        with self.db_manager.transaction() as cursor:
+            for table_name, in_year in tables.items():
+                # Rows saved after the copy are not in the archive and stay live
+                moving = f"{in_year} AND id IN (SELECT id FROM {alias}.{table_name})"
+                _, amount, refunded = dashboard_expressions(table_name, table_name)
+                count, total_amount, refunded_amount = cursor.execute(
+                    f"SELECT COUNT(*), SUM({amount}), SUM({refunded}) FROM main.{table_name} WHERE {moving}",
+                    (financial_year,)
+                ).fetchone()
+                if count == 0:
+                    continue
+                moved[table_name] = count
+
+                cursor.execute('''
+                    INSERT INTO archive_stats
+                        (table_name, financial_year, record_count, total_amount, refunded_amount)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (table_name, financial_year) DO UPDATE SET
+                        record_count = record_count + excluded.record_count,
+                        total_amount = total_amount + excluded.total_amount,
+                        refunded_amount = refunded_amount + excluded.refunded_amount
+                ''', (table_name, financial_year, count, total_amount or 0, refunded_amount or 0))
+                cursor.execute(f"DELETE FROM main.{table_name} WHERE {moving}", (financial_year,))
+
+            cursor.execute(
+                "INSERT OR REPLACE INTO archives (financial_year, file_name, archived_at) VALUES (?, ?, ?)",
+                (financial_year, self.archive_path(financial_year).name, datetime.now().isoformat())
+            )
+        return moved
+
+    def _create_archive_table(self, cursor, alias, table_name):
+        """Create a table in the archive with the live table's definition
+
+        An archive table created before the live table gained columns is
+        given the missing ones. Returns the live table's columns.
+        """
+        row = cursor.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchone()
+        definition = re.sub(
+            r"^CREATE TABLE\s+(IF NOT EXISTS\s+)?[\"'`\[]?\w+[\"'`\]]?",
+            f"CREATE TABLE IF NOT EXISTS {alias}.{table_name}",
+            row[0].strip(),
+            count=1,
+            flags=re.IGNORECASE
+        )
+        cursor.execute(definition)
+
+        archived = {row[1] for row in cursor.execute(f"PRAGMA {alias}.table_info({table_name})")}
+        columns = []
+        for column in cursor.execute(f"PRAGMA main.table_info({table_name})").fetchall():
+            if column[1] not in archived:
+                cursor.execute(f"ALTER TABLE {alias}.{table_name} ADD COLUMN {column[1]} {column[2]}")
+            columns.append(column[1])
+        return columns
+
+    def archive_tables(self, conn, financial_year):
+        """Return the tables present in an attached archive"""
+        alias = archive_alias(financial_year)
+        return {
+            row[0] for row in conn.execute(f"SELECT name FROM {alias}.sqlite_master WHERE type = 'table'")
+        }
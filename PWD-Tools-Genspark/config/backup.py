@@ -0,0 +1,122 @@
+"""
+Backup Manager for PWD Tools Desktop Application
+Online SQLite backups with rotation, retention and optional compression
+"""
+
+import gzip
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Defaults used when settings do not provide backup_settings
+DEFAULT_RETENTION_COUNT = 10
+DEFAULT_INTERVAL_HOURS = 24
+DEFAULT_PAGES_PER_STEP = 256
+STEP_PAUSE_SECONDS = 0.005
+
+
+class BackupManager:
+    """Creates consistent backups of a live database with sqlite3 backup API"""
+
+    def __init__(self, db_path, backup_dir=None, retention_count=DEFAULT_RETENTION_COUNT,
+                 pages_per_step=DEFAULT_PAGES_PER_STEP):
+        self.db_path = Path(db_path)
+        if backup_dir is None:
+            self.backup_dir = self.db_path.parent / "backups"
+        else:
+            self.backup_dir = Path(backup_dir)
+        self.retention_count = retention_count
+        self.pages_per_step = pages_per_step
+        self.backup_prefix = f"{self.db_path.stem}_backup_"
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, db_path, settings=None):
+        """Create a backup manager configured from AppSettings"""
+        backup_settings = settings.get_backup_settings() if settings is not None else {}
+        return cls(
+            db_path,
+            backup_dir=backup_settings.get('backup_dir') or None,
+            retention_count=backup_settings.get('retention_count', DEFAULT_RETENTION_COUNT),
+            pages_per_step=backup_settings.get('pages_per_step', DEFAULT_PAGES_PER_STEP)
+        )
+
+    def create_backup(self, compress=False, progress_callback=None):
+        """Copy the live database page-chunk by page-chunk and return the backup path
+
+        Each step copies pages_per_step pages and then briefly yields, so
+        writers on other connections are never held up for long. The copy is a
+        consistent snapshot even while the application keeps writing.
+        progress_callback(remaining_pages, total_pages) is called after each step.
+        """
+        with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            # Microseconds keep backups taken within one second apart
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            backup_path = self.backup_dir / f"{self.backup_prefix}{timestamp}.db"
+            partial_path = backup_path.with_suffix(".db.partial")
+
+            def on_step(status, remaining, total):
+                if progress_callback is not None:
+                    progress_callback(remaining, total)
+                time.sleep(STEP_PAUSE_SECONDS)
+
+            source = sqlite3.connect(str(self.db_path))
+            destination = sqlite3.connect(str(partial_path))
+            try:
+                source.backup(destination, pages=self.pages_per_step, progress=on_step)
+            except Exception:
+                destination.close()
+                partial_path.unlink(missing_ok=True)
+                raise
+            finally:
+                source.close()
+            destination.close()
+
+            if compress:
+                archive_path = backup_path.with_suffix(".db.gz")
+                with open(partial_path, 'rb') as src, gzip.open(archive_path, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, length=1024 * 1024)
+                partial_path.unlink()
+                backup_path = archive_path
+            else:
+                partial_path.replace(backup_path)
+
+            self.rotate_backups()
+            return backup_path
+
+    def list_backups(self):
+        """Return existing backups, newest first"""
+        if not self.backup_dir.exists():
+            return []
+        backups = [
+            path for path in self.backup_dir.glob(f"{self.backup_prefix}*")
+            if path.name.endswith((".db", ".db.gz"))
+        ]
+        return sorted(backups, key=lambda path: path.name, reverse=True)
+
+    def rotate_backups(self):
+        """Delete the oldest backups beyond the retention count"""
+        removed = []
+        for old_backup in self.list_backups()[self.retention_count:]:
+            try:
+                old_backup.unlink()
+                removed.append(old_backup)
+            except OSError as e:
+                print(f"Error removing old backup {old_backup}: {e}")
+        return removed
+
+    def last_backup_time(self):
+        """Return the modification time of the newest backup, or None"""
+        backups = self.list_backups()
+        if not backups:
+            return None
+        return datetime.fromtimestamp(backups[0].stat().st_mtime)
+
+    def backup_due(self, interval_hours=DEFAULT_INTERVAL_HOURS):
+        """Check whether the newest backup is older than the interval"""
+        last_backup = self.last_backup_time()
+        return last_backup is None or datetime.now() - last_backup >= timedelta(hours=interval_hours)
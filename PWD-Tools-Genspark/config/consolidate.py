@@ -0,0 +1,274 @@
+"""
+Legacy Database Consolidation for PWD Tools Desktop Application
+Copies the per-tool SQLite files into the managed DatabaseManager store
+"""
+
+import sys
+from pathlib import Path
+
+# Both Hindi bill note tools share the same table layout
+HINDI_BILL_COLUMNS = [
+    "bill_type", "work_order_amount", "upto_date_amount", "extra_items", "extra_amount",
+    "start_date", "completion_date", "actual_completion", "repair_work", "excess_quantity",
+    "delay_comment", "generated_note", "date_created",
+]
+
+# Local time of the consolidation, written like the tools' own timestamps;
+# records whose legacy table has no date are dated with it
+CONSOLIDATED_AT = "strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')"
+
+# Each standalone tool's legacy file, the table to copy, the managed target
+# table, a target-column -> source-expression mapping, and the target columns
+# that identify a duplicate record.
+LEGACY_SOURCES = [
+    {
+        "file": "hindi_bills.db",
+        "table": "hindi_bills",
+        "target": "hindi_bills",
+        "columns": {column: column for column in HINDI_BILL_COLUMNS},
+        "key": ["date_created", "bill_type", "work_order_amount", "upto_date_amount", "generated_note"],
+    },
+    {
+        "file": "simple_hindi_bills.db",
+        "table": "hindi_bills",
+        "target": "hindi_bills",
+        "columns": {column: column for column in HINDI_BILL_COLUMNS},
+        "key": ["date_created", "bill_type", "work_order_amount", "upto_date_amount", "generated_note"],
+    },
+    {
+        "file": "emd_refund_a4.db",
+        "table": "emd_refund_a4_records",
+        "target": "emd_refund_a4_records",
+        "columns": {
+            "payee_name": "payee_name",
+            "amount": "amount",
+            "work_description": "work_description",
+            "receipt_number": "receipt_number",
+            "refund_date": "refund_date",
+            "date_created": "date_created",
+        },
+        "key": ["receipt_number", "payee_name", "date_created"],
+    },
+    {
+        "file": "delay_calculator.db",
+        "table": "delay_records",
+        "target": "delay_records",
+        "columns": {
+            "project_name": "COALESCE(project_name, '')",
+            "contractor_name": "''",
+            "planned_start_date": "COALESCE(planned_start_date, '')",
+            "actual_start_date": "actual_start_date",
+            "planned_completion_date": "COALESCE(planned_completion_date, '')",
+            "actual_completion_date": "actual_completion_date",
+            "delay_days": "delay_days",
+            "delay_reason": "delay_reason",
+            "penalty_amount": "penalty_amount",
+            "date_created": "COALESCE(date_created, '')",
+        },
+        "key": ["project_name", "date_created"],
+    },
+    {
+        "file": "financial_analysis.db",
+        "table": "financial_records",
+        "target": "financial_records",
+        "columns": {
+            "project_name": "project_name",
+            "start_date": "start_date",
+            "end_date": "end_date",
+            "budget_amount": "budget_amount",
+            "spent_amount": "spent_amount",
+            "remaining_amount": "remaining_amount",
+            "completion_percentage": "completion_percentage",
+            "analysis_date": "analysis_date",
+        },
+        "key": ["project_name", "analysis_date"],
+    },
+    {
+        "file": "pwd_tools.db",
+        "table": "bills",
+        "target": "bills",
+        "columns": {
+            "bill_number": "bill_number",
+            "contractor_name": "contractor_name",
+            "work_description": "work_description",
+            "bill_amount": "bill_amount",
+            "date_created": "date_created",
+            "status": "COALESCE(status, 'Active')",
+        },
+        "key": ["bill_number"],
+    },
+    {
+        "file": "pwd_tools.db",
+        "table": "emd_records",
+        "target": "emd_records",
+        "columns": {
+            "tender_number": "tender_number",
+            "contractor_name": "contractor_name",
+            "emd_amount": "emd_amount",
+            "bank_name": "bank_name",
+            "guarantee_number": "guarantee_number",
+            "validity_date": "validity_date",
+            "refund_status": "COALESCE(refund_status, 'Pending')",
+            "date_created": CONSOLIDATED_AT,
+        },
+        "key": ["tender_number", "contractor_name", "emd_amount"],
+    },
+]
+
+LEGACY_ALIAS = "legacy"
+# Declared column types SQLite gives numeric affinity
+NUMERIC_TYPE_WORDS = ("INT", "REAL", "FLOA", "DOUB", "NUM", "DEC")
+
+
+def find_legacy_files(search_dirs):
+    """Return {file name: path} for legacy database files found in search_dirs"""
+    found = {}
+    for directory in search_dirs:
+        for source in LEGACY_SOURCES:
+            candidate = Path(directory) / source["file"]
+            if source["file"] not in found and candidate.is_file():
+                found[source["file"]] = candidate.resolve()
+    return found
+
+
+def not_null_fallbacks(cursor, table_name):
+    """Return {column: SQL fallback} for the NOT NULL columns of a managed table
+
+    A legacy NULL in such a column is replaced by the column's declared
+    default, else 0 in numeric columns and '' in the rest.
+    """
+    fallbacks = {}
+    for _, column, declared, not_null, default, _ in cursor.execute(f"PRAGMA main.table_info({table_name})"):
+        if not not_null:
+            continue
+        if default is not None:
+            fallbacks[column] = default
+        elif any(word in (declared or "").upper() for word in NUMERIC_TYPE_WORDS):
+            fallbacks[column] = "0"
+        else:
+            fallbacks[column] = "''"
+    return fallbacks
+
+
+def build_select(source, fallbacks=None):
+    """Build the SELECT of the new, de-duplicated rows of a legacy table
+
+    Duplicates inside the legacy table collapse to their newest row (highest
+    id); rows whose key already exists in the managed table are left out.
+    fallbacks (see not_null_fallbacks) fill NULLs of NOT NULL columns.
+    """
+    fallbacks = fallbacks or {}
+    expressions = {
+        column: f"COALESCE({expression}, {fallbacks[column]})" if column in fallbacks else expression
+        for column, expression in source["columns"].items()
+    }
+    select_columns = ", ".join(f"{expression} AS {column}" for column, expression in expressions.items())
+    group_by = ", ".join(expressions[column] for column in source["key"])
+    key_match = " AND ".join(f"m.{column} IS src.{column}" for column in source["key"])
+
+    return f'''
+        SELECT {", ".join(expressions)} FROM (
+            SELECT {select_columns}, MAX(id) AS latest_id
+            FROM {LEGACY_ALIAS}.{source["table"]}
+            GROUP BY {group_by}
+        ) AS src
+        WHERE NOT EXISTS (
+            SELECT 1 FROM main.{source["target"]} AS m WHERE {key_match}
+        )
+    '''
+
+
+def build_copy_statement(source, fallbacks=None):
+    """Build the INSERT ... SELECT that copies new, de-duplicated rows
+
+    INSERT OR IGNORE skips rows that still break a managed constraint, such
+    as a bill number that is already used; consolidate_file counts them.
+    """
+    return f'''
+        INSERT OR IGNORE INTO main.{source["target"]} ({", ".join(source["columns"])})
+        {build_select(source, fallbacks)}
+    '''
+
+
+def consolidate_file(db_manager, legacy_path, sources):
+    """ATTACH one legacy file and copy its tables in a single transaction
+
+    Returns a list of (table, legacy_rows, copied_rows, rejected_rows)
+    tuples. Legacy rows neither copied nor rejected were duplicates;
+    rejected rows were new but broke a constraint of the managed table.
+    """
+    conn = db_manager.get_connection()
+    if Path(legacy_path).resolve() == Path(db_manager.db_path).resolve():
+        return []
+
+    results = []
+    conn.execute(f"ATTACH DATABASE ? AS {LEGACY_ALIAS}", (str(legacy_path),))
+    try:
+        legacy_tables = {
+            row[0] for row in conn.execute(
+                f"SELECT name FROM {LEGACY_ALIAS}.sqlite_master WHERE type = 'table'"
+            )
+        }
+        with db_manager.transaction() as cursor:
+            for source in sources:
+                if source["table"] not in legacy_tables:
+                    continue
+                legacy_rows = cursor.execute(
+                    f"SELECT COUNT(*) FROM {LEGACY_ALIAS}.{source['table']}"
+                ).fetchone()[0]
+                fallbacks = not_null_fallbacks(cursor, source["target"])
+                new_rows = cursor.execute(
+                    f"SELECT COUNT(*) FROM ({build_select(source, fallbacks)})"
+                ).fetchone()[0]
+                cursor.execute(build_copy_statement(source, fallbacks))
+                copied_rows = max(cursor.rowcount, 0)
+                results.append((source["target"], legacy_rows, copied_rows, new_rows - copied_rows))
+    finally:
+        conn.execute(f"DETACH DATABASE {LEGACY_ALIAS}")
+    return results
+
+
+def consolidate_legacy_databases(db_manager, search_dirs=None):
+    """Copy every legacy per-tool database found into the managed store
+
+    Safe to run repeatedly: already-copied records are de-duplicated.
+    Returns {legacy file path: [(table, legacy_rows, copied_rows, rejected_rows), ...]}.
+    """
+    if search_dirs is None:
+        search_dirs = [Path(__file__).parent.parent, Path.cwd()]
+
+    report = {}
+    for file_name, legacy_path in find_legacy_files(search_dirs).items():
+        sources = [source for source in LEGACY_SOURCES if source["file"] == file_name]
+        try:
+            report[str(legacy_path)] = consolidate_file(db_manager, legacy_path, sources)
+        except Exception as e:
+            print(f"Error consolidating {legacy_path}: {e}")
+            report[str(legacy_path)] = []
+    return report
+
+
+def main(argv=None):
+    """Command line entry point: python -m config.consolidate [<dir> ...]"""
+    from config.database import DatabaseManager
+
+    search_dirs = argv if argv is not None else sys.argv[1:]
+    db_manager = DatabaseManager()
+    try:
+        report = consolidate_legacy_databases(db_manager, search_dirs or None)
+        if not report:
+            print("No legacy databases found.")
+        for legacy_path, tables in report.items():
+            print(legacy_path)
+            for table, legacy_rows, copied_rows, rejected_rows in tables:
+                duplicates = legacy_rows - copied_rows - rejected_rows
+                print(f"  {table}: {copied_rows} of {legacy_rows} rows copied, {duplicates} duplicates skipped")
+                if rejected_rows:
+                    print(f"  {table}: {rejected_rows} rows not copied, they break a constraint of the table")
+    finally:
+        db_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
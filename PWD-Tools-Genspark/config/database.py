@@ -4,10 +4,66 @@ Handles SQLite database operations and data management
 """
 
 import sqlite3
-import os
+import re
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-import json
+
+from config.archive import ATTACH_BATCH, ArchiveManager
+from config.backup import BackupManager
+from config.diagnostics import QueryProfiler
+from config.migrations import (
+    SEARCH_COLUMNS, apply_migrations, get_schema_version, rebuild_dashboard_stats,
+    search_columns
+)
+
+# Connection tuning applied once when a pooled connection is opened
+CONNECTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -16000,        # negative value = size in KiB (~16 MB)
+    "mmap_size": 134217728,      # 128 MB memory-mapped I/O
+    "busy_timeout": 5000,        # milliseconds
+}
+STATEMENT_CACHE_SIZE = 256
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# One "column [ASC|DESC]" term of an ORDER BY list
+ORDER_TERM_PATTERN = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+
+# Markers placed around matched terms in search highlights and snippets
+HIGHLIGHT_START = "["
+HIGHLIGHT_END = "]"
+
+
+def _fts_match_query(text):
+    """Turn free text typed by a user into a safe FTS5 prefix query"""
+    terms = []
+    for token in text.split():
+        token = token.replace('"', '')
+        if any(character.isalnum() for character in token):
+            terms.append(f'"{token}"*')
+    return " ".join(terms)
+
+
+def _order_terms(order_by):
+    """Split an ORDER BY list into [(column, descending)]; raises ValueError if malformed"""
+    if not order_by:
+        return []
+    terms = []
+    for term in order_by.split(","):
+        match = ORDER_TERM_PATTERN.match(term)
+        if not match:
+            raise ValueError(f"Invalid order by: {order_by}")
+        terms.append((match.group(1), (match.group(2) or "").upper() == "DESC"))
+    return terms
+
+
+class _PartialBatch(Exception):
+    """Raised internally when executemany applied fewer rows than given"""
+
 
 class DatabaseManager:
     def __init__(self, db_path=None):
@@ -20,12 +76,55 @@ class DatabaseManager:
         # Ensure data directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # One long-lived connection per thread, shared by every tool window
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        # Online backups (reconfigured from settings via configure_backups)
+        self.backup_manager = BackupManager(self.db_path)
+        
+        # Per-statement timing and slow-query log (see configure_diagnostics)
+        self.profiler = QueryProfiler(self.db_path.parent / "logs" / "slow_queries.log")
+        
+        # Closed financial years moved out into per-year archive files
+        self.archive_manager = ArchiveManager(self)
+        
         # Initialize database
         self.init_database()
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(str(self.db_path))
+        """Get the pooled database connection for the calling thread"""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.connection = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _open_connection(self):
+        """Open and configure a new SQLite connection"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=CONNECTION_PRAGMAS["busy_timeout"] / 1000,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False
+        )
+        for pragma, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+    
+    def close(self):
+        """Close every pooled connection (call on application exit)"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing connection: {e}")
+        self._local = threading.local()
     
     def init_database(self):
         """Initialize database with required tables"""
@@ -177,36 +276,169 @@ class DatabaseManager:
                 ''')
                 
                 conn.commit()
-                print("Database initialized successfully")
+            
+            # Bring indexes and later schema changes up to date
+            self.migrate()
+            print("Database initialized successfully")
                 
         except Exception as e:
             print(f"Error initializing database: {e}")
     
+    def migrate(self):
+        """Apply pending schema migrations and return the versions applied"""
+        applied = apply_migrations(self.get_connection())
+        if applied:
+            print(f"Applied schema migrations: {', '.join(map(str, applied))}")
+        return applied
+    
+    def get_schema_version(self):
+        """Get the current schema version of the database"""
+        try:
+            return get_schema_version(self.get_connection())
+        except Exception as e:
+            print(f"Error getting schema version: {e}")
+            return 0
+    
+    def _explainer(self, conn, query, params=None):
+        """Return a callable producing EXPLAIN QUERY PLAN rows for a statement"""
+        return lambda: conn.execute(f"EXPLAIN QUERY PLAN {query}", params or ()).fetchall()
+    
     def execute_query(self, query, params=None):
         """Execute a query and return success status"""
+        conn = self.get_connection()
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            cursor = conn.cursor()
+            with self.profiler.measure(query, params, self._explainer(conn, query, params)) as measurement:
                 if params:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
+                measurement["rows"] = max(cursor.rowcount, 0)
+            # Inside transaction() the outermost block commits
+            if not self._in_transaction():
                 conn.commit()
-                return True
+            return True
         except Exception as e:
+            if not self._in_transaction():
+                conn.rollback()
             print(f"Error executing query: {e}")
             return False
     
+    def _in_transaction(self):
+        """Check whether the calling thread is inside a transaction() block"""
+        return getattr(self._local, "transaction_depth", 0) > 0
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements as one transaction
+        
+        Yields a cursor on the pooled connection. The block is committed when
+        it exits normally and rolled back on any exception. Nested blocks use
+        savepoints, so an inner failure only undoes the inner block.
+        """
+        conn = self.get_connection()
+        depth = getattr(self._local, "transaction_depth", 0)
+        savepoint = f"pwd_tx_{depth}"
+        
+        if depth == 0:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        
+        self._local.transaction_depth = depth + 1
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            if depth == 0:
+                conn.commit()
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+        finally:
+            self._local.transaction_depth = depth
+            cursor.close()
+    
+    def execute_many(self, query, params_seq):
+        """Execute one statement for many parameter rows in a single transaction
+        
+        Rows that fail are skipped and reported; the remaining rows are still
+        committed. Returns a dict with:
+            row_ids   - inserted rowid per input row (None if the row failed
+                        or the statement is not an INSERT)
+            succeeded - number of rows applied
+            errors    - list of (row_index, error_message) tuples
+        """
+        rows = [tuple(params) for params in params_seq]
+        result = {"row_ids": [None] * len(rows), "succeeded": 0, "errors": []}
+        if not rows:
+            return result
+        
+        is_insert = query.lstrip().upper().startswith(("INSERT", "REPLACE"))
+        explain = self._explainer(self.get_connection(), query, rows[0])
+        
+        with self.profiler.measure(query, rows[0], explain) as measurement:
+            self._execute_batch(query, rows, is_insert, result)
+            measurement["rows"] = result["succeeded"]
+        return result
+    
+    def _execute_batch(self, query, rows, is_insert, result):
+        """Apply execute_many rows, filling in result"""
+        try:
+            with self.transaction() as cursor:
+                # Fast path: a single executemany inside a savepoint
+                try:
+                    with self.transaction() as batch_cursor:
+                        batch_cursor.executemany(query, rows)
+                        applied = batch_cursor.rowcount
+                        if is_insert and applied != len(rows):
+                            # Some rows were ignored; row ids are not contiguous
+                            raise _PartialBatch()
+                    if is_insert:
+                        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                        result["row_ids"] = list(range(last_id - len(rows) + 1, last_id + 1))
+                    result["succeeded"] = len(rows)
+                    return
+                except (sqlite3.Error, _PartialBatch):
+                    pass
+                
+                # Slow path: one savepoint per row to isolate the failures
+                for index, params in enumerate(rows):
+                    try:
+                        with self.transaction() as row_cursor:
+                            row_cursor.execute(query, params)
+                            if is_insert and row_cursor.rowcount > 0:
+                                result["row_ids"][index] = row_cursor.lastrowid
+                        result["succeeded"] += 1
+                    except sqlite3.Error as e:
+                        result["errors"].append((index, str(e)))
+        except Exception as e:
+            print(f"Error executing batch: {e}")
+            result["row_ids"] = [None] * len(rows)
+            result["succeeded"] = 0
+            result["errors"] = [(index, str(e)) for index in range(len(rows))]
+    
     def fetch_one(self, query, params=None):
         """Fetch one record from database"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            with self.profiler.measure(query, params, self._explainer(conn, query, params)) as measurement:
                 if params:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
-                return cursor.fetchone()
+                row = cursor.fetchone()
+                measurement["rows"] = int(row is not None)
+            return row
         except Exception as e:
             print(f"Error fetching one record: {e}")
             return None
@@ -214,50 +446,460 @@ class DatabaseManager:
     def fetch_all(self, query, params=None):
         """Fetch all records from database"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            with self.profiler.measure(query, params, self._explainer(conn, query, params)) as measurement:
                 if params:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
-                return cursor.fetchall()
+                rows = cursor.fetchall()
+                measurement["rows"] = len(rows)
+            return rows
         except Exception as e:
             print(f"Error fetching all records: {e}")
             return []
     
-    def backup_database(self):
-        """Create a backup of the database"""
+    def iter_query(self, query, params=None, batch_size=500, output="rows"):
+        """Stream query results through fetchmany() instead of fetchall()
+        
+        output selects what is yielded:
+            "rows"    - one row tuple at a time
+            "batches" - lists of up to batch_size rows
+            "pandas"  - pandas DataFrames of up to batch_size rows
+            "numpy"   - NumPy record arrays of up to batch_size rows
+        Only one batch is held in memory at a time.
+        """
+        if output not in ("rows", "batches", "pandas", "numpy"):
+            raise ValueError(f"Unknown output format: {output}")
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        # Only time spent in SQLite counts, not time the caller spends per batch
+        elapsed = 0.0
+        row_count = 0
         try:
-            backup_path = self.db_path.parent / f"pwd_tools_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+            started = time.perf_counter()
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            elapsed += time.perf_counter() - started
             
-            # Copy database file
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            columns = [description[0] for description in cursor.description or []]
+            if output in ("pandas", "numpy"):
+                import pandas as pd
             
+            while True:
+                started = time.perf_counter()
+                batch = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not batch:
+                    break
+                row_count += len(batch)
+                if output == "rows":
+                    yield from batch
+                elif output == "batches":
+                    yield batch
+                else:
+                    frame = pd.DataFrame.from_records(batch, columns=columns)
+                    yield frame if output == "pandas" else frame.to_records(index=False)
+        except sqlite3.Error as e:
+            print(f"Error streaming query results: {e}")
+        finally:
+            cursor.close()
+            self.profiler.record(query, params, elapsed * 1000, row_count,
+                                 explain=self._explainer(conn, query, params))
+    
+    def fetch_page(self, table_name, columns, after_id=None, page_size=10,
+                   where=None, params=None):
+        """Fetch one page of a table, newest first, using keyset pagination on id
+        
+        Pass the returned next_after_id back as after_id to get the following
+        page. Returns (rows, next_after_id); next_after_id is None on the last
+        page. Each page is an index range scan, however deep the page is.
+        """
+        for identifier in [table_name, *columns]:
+            if not IDENTIFIER_PATTERN.match(identifier):
+                raise ValueError(f"Invalid identifier: {identifier}")
+        
+        conditions = []
+        query_params = []
+        if where:
+            conditions.append(f"({where})")
+            query_params.extend(params or [])
+        if after_id is not None:
+            conditions.append("id < ?")
+            query_params.append(after_id)
+        
+        query = f"SELECT id, {', '.join(columns)} FROM {table_name}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC LIMIT ?"
+        query_params.append(page_size + 1)
+        
+        rows = self.fetch_all(query, query_params)
+        next_after_id = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_after_id = rows[-1][0]
+        return [row[1:] for row in rows], next_after_id
+
+    def fetch_ids(self, table_name, order_by="id", descending=True, where=None, params=None,
+                  include_archives=False):
+        """Return the ids of the matching rows in display order
+
+        Rows are ordered by order_by, ties broken newest first. Together
+        with fetch_by_ids this lets a table view sort and filter in SQL once
+        and then read only the rows it shows. With include_archives the
+        rows of archived financial years are included (ids stay unique,
+        every table uses AUTOINCREMENT).
+        """
+        for identifier in [table_name, order_by]:
+            if not IDENTIFIER_PATTERN.match(identifier):
+                raise ValueError(f"Invalid identifier: {identifier}")
+
+        direction = "DESC" if descending else "ASC"
+        if include_archives:
+            columns = ["id"] if order_by == "id" else ["id", order_by]
+            order = f"{order_by} {direction}" + (", id DESC" if order_by != "id" else "")
+            rows = self.fetch_with_archives(table_name, columns, where, params, order_by=order)
+            return [row[0] for row in rows]
+
+        query = f"SELECT id FROM {table_name}"
+        if where:
+            query += f" WHERE {where}"
+        query += f" ORDER BY {order_by} {direction}"
+        if order_by != "id":
+            query += ", id DESC"
+        return [row[0] for row in self.fetch_all(query, params)]
+
+    def fetch_by_ids(self, table_name, columns, ids, include_archives=False):
+        """Fetch (id, *columns) rows for the given ids, in the order of ids
+
+        Ids whose rows no longer exist are skipped. With include_archives,
+        ids not found in the live table are looked up in the archives.
+        """
+        for identifier in [table_name, *columns]:
+            if not IDENTIFIER_PATTERN.match(identifier):
+                raise ValueError(f"Invalid identifier: {identifier}")
+        if not ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in ids)
+        rows = self.fetch_all(
+            f"SELECT id, {', '.join(columns)} FROM {table_name} WHERE id IN ({placeholders})",
+            list(ids)
+        )
+        by_id = {row[0]: row for row in rows}
+        missing = [row_id for row_id in ids if row_id not in by_id]
+        if include_archives and missing:
+            placeholders = ", ".join("?" for _ in missing)
+            for row in self.fetch_with_archives(table_name, ["id", *columns], f"id IN ({placeholders})", missing):
+                by_id[row[0]] = row
+        return [by_id[row_id] for row_id in ids if row_id in by_id]
+
+    def search(self, text, tables=None, limit=50):
+        """Full-text search over names, descriptions and remarks
+        
+        Searches every table in SEARCH_COLUMNS (or only those in tables) and
+        returns up to limit results, best match first. Each result is a dict:
+            table   - source table name
+            id      - row id in that table
+            rank    - bm25 relevance (lower is better)
+            snippet - matching text with terms wrapped in [ ]
+            fields  - {column: value with matched terms wrapped in [ ]}
+        Falls back to LIKE scans when FTS5 is not available.
+        """
+        match_query = _fts_match_query(text or "")
+        if not match_query:
+            return []
+        
+        results = []
+        cursor = self.get_connection().cursor()
+        try:
+            for table_name in tables or SEARCH_COLUMNS:
+                columns = self._get_search_columns(table_name)
+                if not columns:
+                    continue
+                if self._has_fts_table(table_name):
+                    rows = self._search_fts(cursor, table_name, columns, match_query, limit)
+                else:
+                    rows = self._search_like(cursor, table_name, columns, text, limit)
+                for row_id, rank, snippet, *values in rows:
+                    results.append({
+                        "table": table_name,
+                        "id": row_id,
+                        "rank": rank,
+                        "snippet": snippet,
+                        "fields": dict(zip(columns, values))
+                    })
+        except sqlite3.Error as e:
+            print(f"Error searching records: {e}")
+        finally:
+            cursor.close()
+        
+        results.sort(key=lambda result: result["rank"])
+        return results[:limit]
+    
+    def _get_search_columns(self, table_name):
+        """Return (and cache) the searchable columns present in a table"""
+        if not hasattr(self, "_search_column_cache"):
+            self._search_column_cache = {}
+        if table_name not in self._search_column_cache:
+            cursor = self.get_connection().cursor()
+            self._search_column_cache[table_name] = search_columns(cursor, table_name)
+            cursor.close()
+        return self._search_column_cache[table_name]
+    
+    def _has_fts_table(self, table_name):
+        """Check whether the FTS5 index for a table exists"""
+        return self.fetch_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (f"{table_name}_fts",)
+        ) is not None
+    
+    def _search_fts(self, cursor, table_name, columns, match_query, limit):
+        """Ranked FTS5 query against one table's index"""
+        fts_table = f"{table_name}_fts"
+        highlights = ", ".join(
+            f"highlight({fts_table}, {index}, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}')"
+            for index in range(len(columns))
+        )
+        query = f'''
+            SELECT rowid, bm25({fts_table}),
+                   snippet({fts_table}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '...', 12),
+                   {highlights}
+            FROM {fts_table}
+            WHERE {fts_table} MATCH ?
+            ORDER BY bm25({fts_table})
+            LIMIT ?
+        '''
+        return self._timed_fetch(cursor, query, (match_query, limit))
+    
+    def _search_like(self, cursor, table_name, columns, text, limit):
+        """Unranked LIKE fallback for builds without FTS5"""
+        conditions = " OR ".join(f"{column} LIKE ?" for column in columns)
+        pattern = f"%{text.strip()}%"
+        query = f'''
+            SELECT id, 0, {columns[0]}, {", ".join(columns)}
+            FROM {table_name}
+            WHERE {conditions}
+            ORDER BY id DESC
+            LIMIT ?
+        '''
+        return self._timed_fetch(cursor, query, [pattern] * len(columns) + [limit])
+    
+    def _timed_fetch(self, cursor, query, params):
+        """Execute and fetchall on an existing cursor, recording the timing"""
+        explain = self._explainer(cursor.connection, query, params)
+        with self.profiler.measure(query, params, explain) as measurement:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            measurement["rows"] = len(rows)
+        return rows
+    
+    def configure_diagnostics(self, settings):
+        """Apply diagnostics_settings (threshold, plans, log rotation) from AppSettings"""
+        self.profiler = QueryProfiler.from_settings(
+            self.db_path.parent / "logs" / "slow_queries.log", settings
+        )
+    
+    def get_query_stats(self):
+        """Return the diagnostics report: per-statement latency, rows and call sites"""
+        return self.profiler.to_dict()
+    
+    def dump_query_stats(self, path):
+        """Write the diagnostics report to a JSON file; returns success status"""
+        try:
+            self.profiler.dump_json(path)
+            return True
+        except Exception as e:
+            print(f"Error writing query diagnostics: {e}")
+            return False
+    
+    def configure_backups(self, settings):
+        """Apply backup_settings (directory, retention, chunk size) from AppSettings"""
+        self.backup_manager = BackupManager.from_settings(self.db_path, settings)
+    
+    def backup_database(self, compress=False, progress_callback=None):
+        """Create an online backup of the database
+        
+        Uses the sqlite3 backup API in page chunks, so the copy is consistent
+        even while other connections are writing. Old backups beyond the
+        retention count are removed afterwards.
+        """
+        try:
+            backup_path = self.backup_manager.create_backup(
+                compress=compress,
+                progress_callback=progress_callback
+            )
             print(f"Database backed up to: {backup_path}")
             return True
         except Exception as e:
             print(f"Error creating backup: {e}")
             return False
     
+    def archive_financial_year(self, financial_year, vacuum=True):
+        """Move a closed financial year out of the live tables into its archive file
+        
+        With vacuum, the freed pages are then released so the live database
+        file (and every backup of it) shrinks to the open years. Returns
+        {table: rows moved}, or None on failure.
+        """
+        try:
+            moved = self.archive_manager.archive_year(financial_year)
+            if vacuum and moved:
+                self.get_connection().execute("VACUUM main")
+            print(f"Archived {sum(moved.values())} records of {financial_year}")
+            return moved
+        except Exception as e:
+            print(f"Error archiving financial year {financial_year}: {e}")
+            return None
+    
+    def fetch_with_archives(self, table_name, columns, where=None, params=None,
+                            date_from=None, date_to=None, order_by=None, limit=None):
+        """Fetch rows from a live table plus its archived financial years
+        
+        Archives whose financial year overlaps date_from..date_to (either end
+        may be open) are attached and combined with UNION ALL, so callers see
+        one table. The where clause and params apply to every part; order_by
+        (columns among those fetched, each optionally ASC/DESC) and limit
+        apply to the combined result. Only the live table is read when the
+        range falls inside open years.
+        
+        Archives are attached only for the query and detached afterwards,
+        ATTACH_BATCH at a time. When more years are needed, each batch is
+        read separately and the rows are ordered and limited here.
+        """
+        for identifier in [table_name, *columns]:
+            if not IDENTIFIER_PATTERN.match(identifier):
+                raise ValueError(f"Invalid identifier: {identifier}")
+        order = _order_terms(order_by)
+        for column, _ in order:
+            if column not in columns:
+                raise ValueError(f"Order by column is not fetched: {column}")
+        
+        years = self.archive_manager.years_between(date_from, date_to)
+        batches = [years[start:start + ATTACH_BATCH] for start in range(0, len(years), ATTACH_BATCH)] or [[]]
+        if len(batches) == 1:
+            return self._fetch_union(table_name, columns, where, params, batches[0], True, order_by, limit)
+        
+        rows = []
+        for number, batch in enumerate(batches):
+            rows.extend(self._fetch_union(table_name, columns, where, params, batch, number == 0, order_by, limit))
+        # Stable sorts from the last term to the first; NULLs sort low as in SQLite
+        for column, descending in reversed(order):
+            position = columns.index(column)
+            rows.sort(key=lambda row: (row[position] is not None, row[position]), reverse=descending)
+        return rows[:limit] if limit is not None else rows
+    
+    def _fetch_union(self, table_name, columns, where, params, financial_years, include_main,
+                     order_by=None, limit=None):
+        """Run one UNION ALL query over the live table and the given archives"""
+        conn = self.get_connection()
+        with self.archive_manager.attached(conn, financial_years) as aliases:
+            sources = [f"main.{table_name}"] if include_main else []
+            for financial_year, alias in aliases.items():
+                if table_name in self.archive_manager.archive_tables(conn, financial_year):
+                    sources.append(f"{alias}.{table_name}")
+            if not sources:
+                return []
+            
+            condition = f" WHERE {where}" if where else ""
+            query = " UNION ALL ".join(
+                f"SELECT {', '.join(columns)} FROM {source}{condition}" for source in sources
+            )
+            query_params = list(params or []) * len(sources)
+            if order_by or limit is not None:
+                query = f"SELECT * FROM ({query})"
+                if order_by:
+                    query += f" ORDER BY {order_by}"
+                if limit is not None:
+                    query += " LIMIT ?"
+                    query_params.append(limit)
+            return self.fetch_all(query, query_params)
+    
     def get_table_info(self, table_name):
         """Get information about a table"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                return cursor.fetchall()
+            cursor = self.get_connection().cursor()
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            return cursor.fetchall()
         except Exception as e:
             print(f"Error getting table info: {e}")
             return []
     
     def get_table_count(self, table_name):
-        """Get record count for a table"""
+        """Get record count for a table
+        
+        Served from the trigger-maintained dashboard_stats table when the
+        table is summarised there, otherwise counted directly.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                return cursor.fetchone()[0]
+            cursor = self.get_connection().cursor()
+            cursor.execute(
+                "SELECT SUM(record_count) FROM dashboard_stats WHERE table_name = ?",
+                (table_name,)
+            )
+            count = cursor.fetchone()[0]
+            if count is not None:
+                return count
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            return cursor.fetchone()[0]
         except Exception as e:
             print(f"Error getting table count: {e}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    def get_dashboard_stats(self, financial_year=None, include_archived=True):
+        """Record counts and rupee totals without scanning the record tables
+        
+        Reads the small dashboard_stats summary kept current by triggers (plus
+        archive_stats for archived years), so the cost does not grow with the
+        number of records. Returns:
+            {
+                "tables": {table: {"records", "amount", "refunded"}},
+                "financial_years": {year: {table: {"records", "amount", "refunded"}}},
+                "totals": {"records", "amount", "refunded"}
+            }
+        Pass financial_year (e.g. "2024-25") to limit every figure to that year.
+        """
+        stats = {
+            "tables": {},
+            "financial_years": {},
+            "totals": {"records": 0, "amount": 0.0, "refunded": 0.0}
+        }
+        summary_tables = ["dashboard_stats"]
+        if include_archived:
+            summary_tables.append("archive_stats")
+        query = f'''
+            SELECT table_name, financial_year, SUM(record_count), SUM(total_amount), SUM(refunded_amount)
+            FROM ({" UNION ALL ".join(f"SELECT * FROM {table}" for table in summary_tables)})
+            WHERE financial_year = COALESCE(?, financial_year)
+            GROUP BY table_name, financial_year
+            HAVING SUM(record_count) > 0
+        '''
+        params = (financial_year,)
+        
+        for table_name, year, records, amount, refunded in self.fetch_all(query, params):
+            figures = {"records": records, "amount": amount, "refunded": refunded}
+            stats["financial_years"].setdefault(year, {})[table_name] = figures
+            
+            table_totals = stats["tables"].setdefault(
+                table_name, {"records": 0, "amount": 0.0, "refunded": 0.0}
+            )
+            for key, value in figures.items():
+                table_totals[key] += value
+                stats["totals"][key] += value
+        
+        return stats
+    
+    def refresh_dashboard_stats(self):
+        """Recompute dashboard_stats from the record tables (repairs any drift)"""
+        try:
+            with self.transaction() as cursor:
+                rebuild_dashboard_stats(cursor)
+            return True
+        except Exception as e:
+            print(f"Error refreshing dashboard stats: {e}")
+            return False
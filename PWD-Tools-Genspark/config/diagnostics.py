@@ -0,0 +1,242 @@
+"""
+Query Diagnostics for PWD Tools Desktop Application
+Per-statement timing, slow-query logging and query plans
+"""
+
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+# Defaults used when settings do not provide diagnostics_settings
+DEFAULT_SLOW_QUERY_MS = 100
+DEFAULT_LOG_MAX_BYTES = 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+MAX_CALL_SITES = 10
+MAX_LOGGED_PARAMS = 200
+
+# Frames from these files are skipped when finding where a query came from
+_INTERNAL_FILES = ("database.py", "diagnostics.py", "contextlib.py")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+
+def normalize_statement(query):
+    """Collapse whitespace so the same statement always maps to one entry"""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def bucket_label(elapsed_ms):
+    """Return the histogram bucket a latency falls into"""
+    for upper_bound in LATENCY_BUCKETS_MS:
+        if elapsed_ms <= upper_bound:
+            return f"<={upper_bound}ms"
+    return f">{LATENCY_BUCKETS_MS[-1]}ms"
+
+
+def find_call_site():
+    """Return 'file:line in function' for the first frame outside the database layer"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        file_name = Path(frame.f_code.co_filename).name
+        if file_name not in _INTERNAL_FILES:
+            return f"{file_name}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class QueryProfiler:
+    """Collects latency statistics for every statement the database runs
+
+    Statements are grouped by their normalized SQL text. For each one the
+    profiler keeps call and row counts, total/max latency, a latency
+    histogram and the call sites it was issued from. Statements slower than
+    slow_query_ms are written to a rotating log, together with their
+    EXPLAIN QUERY PLAN output the first time they are flagged.
+    """
+
+    def __init__(self, log_path, slow_query_ms=DEFAULT_SLOW_QUERY_MS, explain_slow=True,
+                 log_max_bytes=DEFAULT_LOG_MAX_BYTES, log_backup_count=DEFAULT_LOG_BACKUP_COUNT,
+                 enabled=True):
+        self.log_path = Path(log_path)
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow = explain_slow
+        self.log_max_bytes = log_max_bytes
+        self.log_backup_count = log_backup_count
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._statements = {}
+        self._lock = threading.Lock()
+        self._logger = None
+
+    @classmethod
+    def from_settings(cls, log_path, settings=None):
+        """Create a profiler configured from AppSettings"""
+        diagnostics = settings.get_diagnostics_settings() if settings is not None else {}
+        return cls(
+            log_path,
+            slow_query_ms=diagnostics.get('slow_query_ms', DEFAULT_SLOW_QUERY_MS),
+            explain_slow=diagnostics.get('explain_slow_queries', True),
+            log_max_bytes=diagnostics.get('log_max_bytes', DEFAULT_LOG_MAX_BYTES),
+            log_backup_count=diagnostics.get('log_backup_count', DEFAULT_LOG_BACKUP_COUNT),
+            enabled=diagnostics.get('enabled', True)
+        )
+
+    @contextmanager
+    def measure(self, query, params=None, explain=None):
+        """Time the enclosed block as one execution of query
+
+        Yields a dict; set its "rows" key to the number of rows fetched or
+        changed. explain, if given, is a callable returning the statement's
+        EXPLAIN QUERY PLAN rows and is only called for slow statements.
+        """
+        if not self.enabled:
+            yield {}
+            return
+
+        measurement = {"rows": 0}
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield measurement
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.record(query, params, elapsed_ms, measurement.get("rows") or 0,
+                        explain=None if failed else explain, failed=failed)
+
+    def record(self, query, params, elapsed_ms, rows, explain=None, failed=False):
+        """Add one execution to the statistics and log it if it was slow"""
+        if not self.enabled:
+            return
+        statement = normalize_statement(query)
+        call_site = find_call_site()
+        slow = elapsed_ms >= self.slow_query_ms
+
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "slow_calls": 0,
+                    "histogram": {},
+                    "call_sites": {},
+                    "plan": None,
+                }
+            stats["calls"] += 1
+            stats["errors"] += int(failed)
+            stats["rows"] += rows
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            bucket = bucket_label(elapsed_ms)
+            stats["histogram"][bucket] = stats["histogram"].get(bucket, 0) + 1
+            if call_site in stats["call_sites"] or len(stats["call_sites"]) < MAX_CALL_SITES:
+                stats["call_sites"][call_site] = stats["call_sites"].get(call_site, 0) + 1
+            if slow:
+                stats["slow_calls"] += 1
+            needs_plan = slow and self.explain_slow and explain is not None and stats["plan"] is None
+
+        if not slow:
+            return
+
+        plan = None
+        if needs_plan and statement.upper().startswith(_EXPLAINABLE):
+            try:
+                plan = [row[-1] for row in explain()]
+                with self._lock:
+                    stats["plan"] = plan
+            except Exception as e:
+                plan = [f"EXPLAIN QUERY PLAN failed: {e}"]
+        self._log_slow_query(statement, params, elapsed_ms, rows, call_site, plan)
+
+    def _log_slow_query(self, statement, params, elapsed_ms, rows, call_site, plan):
+        """Write a slow statement to the rotating slow-query log"""
+        try:
+            logger = self._get_logger()
+            message = f"{elapsed_ms:.1f} ms | {rows} rows | {call_site} | {statement}"
+            if params:
+                message += f" | params={str(params)[:MAX_LOGGED_PARAMS]}"
+            if plan:
+                message += "\n    plan: " + "\n    plan: ".join(plan)
+            logger.warning(message)
+        except Exception as e:
+            print(f"Error writing slow query log: {e}")
+
+    def _get_logger(self):
+        """Create the rotating slow-query logger on first use"""
+        if self._logger is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            logger = logging.getLogger(f"pwd_tools.slow_queries.{id(self)}")
+            logger.setLevel(logging.WARNING)
+            logger.propagate = False
+            handler = RotatingFileHandler(
+                self.log_path,
+                maxBytes=self.log_max_bytes,
+                backupCount=self.log_backup_count,
+                encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def snapshot(self):
+        """Return per-statement statistics, slowest total time first"""
+        with self._lock:
+            statements = [
+                {
+                    "statement": statement,
+                    **stats,
+                    "avg_ms": stats["total_ms"] / stats["calls"],
+                    "histogram": dict(stats["histogram"]),
+                    "call_sites": dict(stats["call_sites"]),
+                }
+                for statement, stats in self._statements.items()
+            ]
+        return sorted(statements, key=lambda stats: stats["total_ms"], reverse=True)
+
+    def slow_statements(self):
+        """Return only the statements that were slow at least once"""
+        return [stats for stats in self.snapshot() if stats["slow_calls"]]
+
+    def reset(self):
+        """Forget all collected statistics"""
+        with self._lock:
+            self._statements = {}
+            self.started_at = datetime.now()
+
+    def to_dict(self):
+        """Return the full diagnostics report as plain data"""
+        statements = self.snapshot()
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "collecting_since": self.started_at.isoformat(),
+            "slow_query_ms": self.slow_query_ms,
+            "histogram_buckets_ms": list(LATENCY_BUCKETS_MS),
+            "total_calls": sum(stats["calls"] for stats in statements),
+            "total_ms": sum(stats["total_ms"] for stats in statements),
+            "statements": statements,
+        }
+
+    def dump_json(self, path):
+        """Write the diagnostics report to a JSON file for offline analysis"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return path
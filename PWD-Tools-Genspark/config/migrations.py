@@ -0,0 +1,458 @@
+"""
+Schema Migrations for PWD Tools Desktop Application
+Versioned, ordered upgrades applied to existing SQLite databases
+"""
+
+import sqlite3
+import sys
+from datetime import datetime
+
+# Lookup columns indexed by migration 1, per table
+SECONDARY_INDEXES = {
+    "bills": ["bill_number", "contractor_name", "date_created", "status"],
+    "emd_records": ["tender_number", "contractor_name", "date_created", "refund_status"],
+    "delay_calculations": ["work_name", "date_created", "status"],
+    "deductions": ["bill_number", "contractor_name", "date_created"],
+    "financial_progress": ["project_name", "date_created"],
+    "security_refunds": ["contractor_name", "date_created", "refund_eligibility"],
+    "stamp_duty_calculations": ["work_order_number", "contractor_name", "date_created"],
+    "tender_processing": ["tender_number", "contractor_name", "date_created", "processing_status"],
+    "bill_deviations": ["bill_number", "contractor_name", "date_created", "approval_status"],
+}
+
+# Lookup columns indexed by migration 2 on the standalone tool tables
+STANDALONE_TOOL_INDEXES = {
+    "hindi_bills": ["date_created"],
+    "emd_refund_a4_records": ["receipt_number", "payee_name", "date_created"],
+    "delay_records": ["project_name", "date_created"],
+    "financial_records": ["project_name", "analysis_date"],
+}
+
+# Text columns indexed for full-text search by migration 3, per table
+SEARCH_COLUMNS = {
+    "bills": ["bill_number", "contractor_name", "work_description", "remarks"],
+    "emd_records": ["tender_number", "contractor_name", "bank_name"],
+    "tender_processing": ["tender_number", "tender_title", "contractor_name", "remarks"],
+    "delay_calculations": ["work_name", "remarks"],
+    "deductions": ["bill_number", "contractor_name"],
+    "security_refunds": ["contractor_name", "work_description"],
+    "stamp_duty_calculations": ["work_order_number", "contractor_name", "work_description"],
+    "bill_deviations": ["bill_number", "contractor_name", "reason"],
+}
+
+# Tables summarised in dashboard_stats by migration 4: the date column that
+# decides the financial year, the rupee amount and the refunded amount.
+# Expressions use {row}, replaced by new/old in triggers.
+DASHBOARD_TABLES = {
+    "bills": {"date": "date_created", "amount": "{row}.bill_amount"},
+    "emd_records": {
+        "date": "date_created",
+        "amount": "{row}.emd_amount",
+        "refunded": "{row}.refund_amount",
+    },
+    "deductions": {"date": "date_created", "amount": "{row}.gross_amount - {row}.net_amount"},
+    "stamp_duty_calculations": {"date": "date_created", "amount": "{row}.stamp_duty_amount"},
+    "security_refunds": {
+        "date": "date_created",
+        "amount": "{row}.security_amount",
+        "refunded": "{row}.refund_amount",
+    },
+    "tender_processing": {"date": "date_created", "amount": "{row}.tender_amount"},
+    "delay_calculations": {"date": "date_created", "amount": "{row}.penalty_amount"},
+    "financial_progress": {"date": "date_created", "amount": "{row}.amount_released"},
+    "bill_deviations": {"date": "date_created", "amount": "{row}.deviation_amount"},
+    "hindi_bills": {"date": "date_created", "amount": "{row}.upto_date_amount"},
+    "emd_refund_a4_records": {
+        "date": "date_created",
+        "amount": "0",
+        "refunded": "{row}.amount",
+    },
+    "delay_records": {"date": "date_created", "amount": "{row}.penalty_amount"},
+    "financial_records": {"date": "analysis_date", "amount": "{row}.spent_amount"},
+}
+
+
+def financial_year_sql(date_expression):
+    """SQL expression giving the April-March financial year ('2024-25') of a date
+
+    Understands the 'YYYY-MM-DD...' and 'DD/MM/YYYY' forms the tools store;
+    anything else is reported as 'Unknown'.
+    """
+    def from_parts(year, month):
+        year = f"CAST({year} AS INTEGER)"
+        return (
+            f"CASE WHEN CAST({month} AS INTEGER) >= 4 "
+            f"THEN {year} || '-' || printf('%02d', ({year} + 1) % 100) "
+            f"ELSE ({year} - 1) || '-' || printf('%02d', {year} % 100) END"
+        )
+
+    iso_form = from_parts(f"substr({date_expression}, 1, 4)", f"substr({date_expression}, 6, 2)")
+    indian_form = from_parts(f"substr({date_expression}, 7, 4)", f"substr({date_expression}, 4, 2)")
+    return (
+        f"CASE WHEN {date_expression} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*' THEN {iso_form} "
+        f"WHEN {date_expression} GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]*' THEN {indian_form} "
+        f"ELSE 'Unknown' END"
+    )
+
+
+def dashboard_expressions(table_name, row):
+    """Return (financial_year, amount, refunded) SQL expressions for a row alias"""
+    spec = DASHBOARD_TABLES[table_name]
+    financial_year = financial_year_sql(f"{row}.{spec['date']}")
+    amount = f"COALESCE({spec['amount'].format(row=row)}, 0)"
+    refunded = f"COALESCE({spec.get('refunded', '0').format(row=row)}, 0)"
+    return financial_year, amount, refunded
+
+
+def rebuild_dashboard_stats(cursor):
+    """Recompute every dashboard_stats row from the source tables"""
+    cursor.execute("DELETE FROM dashboard_stats")
+    for table_name in DASHBOARD_TABLES:
+        if DASHBOARD_TABLES[table_name]["date"] not in table_columns(cursor, table_name):
+            continue
+        financial_year, amount, refunded = dashboard_expressions(table_name, "t")
+        cursor.execute(f'''
+            INSERT INTO dashboard_stats
+                (table_name, financial_year, record_count, total_amount, refunded_amount)
+            SELECT ?, {financial_year}, COUNT(*), SUM({amount}), SUM({refunded})
+            FROM {table_name} AS t
+            GROUP BY 2
+        ''', (table_name,))
+
+
+def fts_available(cursor):
+    """Check whether this SQLite build includes the FTS5 extension"""
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(content)")
+        cursor.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def search_columns(cursor, table_name):
+    """Return the configured search columns that exist in the table"""
+    existing = table_columns(cursor, table_name)
+    return [column for column in SEARCH_COLUMNS.get(table_name, []) if column in existing]
+
+
+def table_columns(cursor, table_name):
+    """Return the column names of a table (empty list if it does not exist)"""
+    return [row[1] for row in cursor.execute(f"PRAGMA table_info({table_name})")]
+
+
+def has_leading_index(cursor, table_name, column):
+    """Check whether an existing index already starts with the given column"""
+    for index in cursor.execute(f"PRAGMA index_list({table_name})").fetchall():
+        index_columns = cursor.execute(f"PRAGMA index_info({index[1]})").fetchall()
+        if index_columns and index_columns[0][2] == column:
+            return True
+    return False
+
+
+def create_index(cursor, table_name, column):
+    """Create idx_<table>_<column>, skipping tables/columns that do not exist"""
+    if column not in table_columns(cursor, table_name):
+        return False
+    if has_leading_index(cursor, table_name, column):
+        return False
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{column} ON {table_name} ({column})"
+    )
+    return True
+
+
+def migration_001_secondary_indexes(cursor):
+    """Index contractor, tender, bill number, date and status lookups"""
+    for table_name, columns in SECONDARY_INDEXES.items():
+        for column in columns:
+            create_index(cursor, table_name, column)
+
+
+def migration_002_standalone_tool_tables(cursor):
+    """Tables for records of the standalone tools, so they share this store"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS hindi_bills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bill_type TEXT,
+            work_order_amount REAL,
+            upto_date_amount REAL,
+            extra_items TEXT,
+            extra_amount REAL,
+            start_date TEXT,
+            completion_date TEXT,
+            actual_completion TEXT,
+            repair_work TEXT,
+            excess_quantity TEXT,
+            delay_comment TEXT,
+            generated_note TEXT,
+            date_created TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS emd_refund_a4_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payee_name TEXT,
+            amount REAL,
+            work_description TEXT,
+            receipt_number TEXT,
+            refund_date TEXT,
+            date_created TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS delay_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_name TEXT NOT NULL,
+            contractor_name TEXT NOT NULL,
+            planned_start_date TEXT NOT NULL,
+            actual_start_date TEXT,
+            planned_completion_date TEXT NOT NULL,
+            actual_completion_date TEXT,
+            delay_days INTEGER DEFAULT 0,
+            delay_reason TEXT,
+            penalty_amount REAL DEFAULT 0,
+            date_created TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS financial_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_name TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            budget_amount REAL,
+            spent_amount REAL,
+            remaining_amount REAL,
+            completion_percentage REAL,
+            analysis_date TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    for table_name, columns in STANDALONE_TOOL_INDEXES.items():
+        for column in columns:
+            create_index(cursor, table_name, column)
+
+
+def migration_003_full_text_search(cursor):
+    """FTS5 indexes over names, descriptions and remarks, kept in sync by triggers"""
+    if not fts_available(cursor):
+        print("FTS5 is not available in this SQLite build; search will use LIKE scans")
+        return
+
+    for table_name in SEARCH_COLUMNS:
+        columns = search_columns(cursor, table_name)
+        if not columns:
+            continue
+
+        fts_table = f"{table_name}_fts"
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        # External-content table: the index stores no copy of the text
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {column_list},
+                content='{table_name}',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table_name} BEGIN
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table_name} BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {table_name} BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+
+        # Index the rows that already exist
+        cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+
+
+def migration_004_dashboard_stats(cursor):
+    """Per-table, per-financial-year counts and rupee sums kept by triggers"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dashboard_stats (
+            table_name TEXT NOT NULL,
+            financial_year TEXT NOT NULL,
+            record_count INTEGER NOT NULL DEFAULT 0,
+            total_amount REAL NOT NULL DEFAULT 0,
+            refunded_amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, financial_year)
+        ) WITHOUT ROWID
+    ''')
+
+    for table_name, spec in DASHBOARD_TABLES.items():
+        if spec["date"] not in table_columns(cursor, table_name):
+            continue
+
+        new_year, new_amount, new_refunded = dashboard_expressions(table_name, "new")
+        old_year, old_amount, old_refunded = dashboard_expressions(table_name, "old")
+        add_new = f'''
+            INSERT INTO dashboard_stats
+                (table_name, financial_year, record_count, total_amount, refunded_amount)
+            VALUES ('{table_name}', {new_year}, 1, {new_amount}, {new_refunded})
+            ON CONFLICT (table_name, financial_year) DO UPDATE SET
+                record_count = record_count + 1,
+                total_amount = total_amount + excluded.total_amount,
+                refunded_amount = refunded_amount + excluded.refunded_amount;
+        '''
+        remove_old = f'''
+            UPDATE dashboard_stats SET
+                record_count = record_count - 1,
+                total_amount = total_amount - {old_amount},
+                refunded_amount = refunded_amount - {old_refunded}
+            WHERE table_name = '{table_name}' AND financial_year = {old_year};
+        '''
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_stats_ai AFTER INSERT ON {table_name} BEGIN
+                {add_new}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_stats_ad AFTER DELETE ON {table_name} BEGIN
+                {remove_old}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_stats_au AFTER UPDATE ON {table_name} BEGIN
+                {remove_old}
+                {add_new}
+            END
+        ''')
+
+    # Summarise the rows that already exist
+    rebuild_dashboard_stats(cursor)
+
+
+def migration_005_archive_registry(cursor):
+    """Registry of archived financial years and the totals moved into them"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archives (
+            financial_year TEXT PRIMARY KEY,
+            file_name TEXT NOT NULL,
+            archived_at TEXT NOT NULL
+        )
+    ''')
+
+    # Same shape as dashboard_stats, for rows that now live in archive files
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_stats (
+            table_name TEXT NOT NULL,
+            financial_year TEXT NOT NULL,
+            record_count INTEGER NOT NULL DEFAULT 0,
+            total_amount REAL NOT NULL DEFAULT 0,
+            refunded_amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, financial_year)
+        ) WITHOUT ROWID
+    ''')
+
+
+# Ordered list of (version, description, function); append new migrations at the end
+MIGRATIONS = [
+    (1, "Secondary indexes on lookup, date and status columns", migration_001_secondary_indexes),
+    (2, "Tables for standalone tool records", migration_002_standalone_tool_tables),
+    (3, "Full-text search indexes", migration_003_full_text_search),
+    (4, "Dashboard counters per table and financial year", migration_004_dashboard_stats),
+    (5, "Financial year archive registry", migration_005_archive_registry),
+]
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 for a fresh database)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    """Apply all pending migrations in order, each in its own transaction
+
+    Returns the list of versions applied.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    current_version = get_schema_version(conn)
+    conn.commit()
+
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version <= current_version:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.cursor()
+            migrate(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now().isoformat())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+
+    return applied
+
+
+def upgrade_database(db_path):
+    """Upgrade an existing database file in place"""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        applied = apply_migrations(conn)
+        conn.execute("PRAGMA optimize")
+        return applied
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    """Command line entry point: python -m config.migrations <db> [<db> ...]"""
+    paths = argv if argv is not None else sys.argv[1:]
+    if not paths:
+        print("Usage: python -m config.migrations <database.db> [<database.db> ...]")
+        return 1
+
+    for db_path in paths:
+        try:
+            applied = upgrade_database(db_path)
+            if applied:
+                print(f"{db_path}: applied migrations {', '.join(map(str, applied))}")
+            else:
+                print(f"{db_path}: already up to date")
+        except sqlite3.Error as e:
+            print(f"{db_path}: migration failed: {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,7 +31,8 @@ class AppSettings:
                 "color_scheme": "blue",
                 "window_width": 1200,
                 "window_height": 800,
-                "font_size": 12
+                "font_size": 12,
+                "prewarm_tools": True
             },
             "department_info": {
                 "name": "Public Works Department",
@@ -43,13 +44,29 @@ class AppSettings:
                 "deduction_rate": 2.0,
                 "stamp_duty_rate": 0.1,
                 "penalty_rate": 0.5,
+                "penalty_cap_percent": 10.0,
                 "tax_rate": 18.0
             },
             "export_settings": {
                 "default_export_path": "exports",
                 "pdf_quality": "high",
                 "excel_format": "xlsx",
-                "auto_backup": True
+                "auto_backup": True,
+                "devanagari_font": ""
+            },
+            "backup_settings": {
+                "backup_dir": "",
+                "interval_hours": 24,
+                "retention_count": 10,
+                "compress": True,
+                "pages_per_step": 256
+            },
+            "diagnostics_settings": {
+                "enabled": True,
+                "slow_query_ms": 100,
+                "explain_slow_queries": True,
+                "log_max_bytes": 1048576,
+                "log_backup_count": 5
             },
             "last_updated": datetime.now().isoformat()
         }
@@ -125,6 +142,14 @@ class AppSettings:
         """Get UI settings"""
         return self.get('ui_settings', {})
     
+    def get_backup_settings(self):
+        """Get database backup settings"""
+        return self.get('backup_settings', {})
+    
+    def get_diagnostics_settings(self):
+        """Get query diagnostics settings"""
+        return self.get('diagnostics_settings', {})
+    
     def get_calculation_defaults(self):
         """Get calculation default values"""
         return self.get('calculation_defaults', {})
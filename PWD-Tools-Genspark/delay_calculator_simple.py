@@ -8,7 +8,9 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from datetime import datetime
 import os
-import sqlite3
+
+from config.database import DatabaseManager
+from utils.delay_engine import compute_work_delay
 
 class SimpleCalendarWidget:
     """Professional one-liner calendar widget"""
@@ -131,25 +133,8 @@ class SimpleDelayCalculatorTool:
         self.create_interface()
     
     def init_database(self):
-        """Initialize simple database"""
-        self.conn = sqlite3.connect('delay_calculator.db')
-        self.cursor = self.conn.cursor()
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS delay_records (
-                id INTEGER PRIMARY KEY,
-                project_name TEXT,
-                planned_start_date TEXT,
-                actual_start_date TEXT,
-                planned_completion_date TEXT,
-                actual_completion_date TEXT,
-                delay_days INTEGER,
-                delay_reason TEXT,
-                penalty_amount REAL,
-                date_created TEXT
-            )
-        ''')
-        self.conn.commit()
+        """Use the shared PWD Tools database (pooled connection, managed schema)"""
+        self.db_manager = DatabaseManager()
     
     def create_interface(self):
         """Create interface"""
@@ -369,14 +354,18 @@ class SimpleDelayCalculatorTool:
                 messagebox.showerror("Error", "Please enter dates in DD/MM/YYYY format")
                 return
             
-            # Calculate delays
-            start_delay = (actual_start_dt - planned_start_dt).days
-            completion_delay = (actual_completion_dt - planned_completion_dt).days
+            # Calculate delays (early start/finish shows as negative days)
+            delay = compute_work_delay(
+                planned_start_dt, planned_completion_dt, 0,
+                actual_start=actual_start_dt, actual_completion=actual_completion_dt
+            )
+            start_delay = delay['start_variance_days']
+            completion_delay = delay['completion_variance_days']
             total_delay = completion_delay
             
             # Calculate project duration
-            planned_duration = (planned_completion_dt - planned_start_dt).days
-            actual_duration = (actual_completion_dt - actual_start_dt).days
+            planned_duration = delay['planned_duration']
+            actual_duration = delay['actual_duration']
             
             # Generate analysis
             analysis = f"""
@@ -472,14 +461,15 @@ DELAY ANALYSIS
         
         try:
             calc = self.current_calculation
-            self.cursor.execute('''
+            success = self.db_manager.execute_query('''
                 INSERT INTO delay_records (
-                    project_name, planned_start_date, actual_start_date, 
+                    project_name, contractor_name, planned_start_date, actual_start_date, 
                     planned_completion_date, actual_completion_date, 
                     delay_days, delay_reason, penalty_amount, date_created
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 calc['project_name'],
+                '',  # Contractor is not captured by this tool
                 calc['planned_start_date'],
                 calc['actual_start_date'],
                 calc['planned_completion_date'],
@@ -490,8 +480,10 @@ DELAY ANALYSIS
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ))
             
-            self.conn.commit()
-            messagebox.showinfo("Success", "Calculation saved successfully!")
+            if success:
+                messagebox.showinfo("Success", "Calculation saved successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to save calculation")
             
         except Exception as e:
             messagebox.showerror("Error", f"Save error: {str(e)}")
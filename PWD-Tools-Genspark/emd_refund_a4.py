@@ -8,10 +8,13 @@ import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
 from datetime import datetime
 import os
-import sqlite3
 import webbrowser
 import tempfile
 
+from config.database import DatabaseManager
+from utils.indian_numbering import format_inr, number_to_words
+from utils.template_engine import TemplateEngine
+
 class SimpleEMDRefundA4Tool:
     def __init__(self):
         """Initialize EMD Refund A4 tool"""
@@ -34,26 +37,15 @@ class SimpleEMDRefundA4Tool:
         # Simple database
         self.init_database()
         
+        # Receipt template, compiled once for every receipt generated
+        self.template_engine = TemplateEngine()
+        
         # Create interface
         self.create_interface()
     
     def init_database(self):
-        """Initialize simple database"""
-        self.conn = sqlite3.connect('emd_refund_a4.db')
-        self.cursor = self.conn.cursor()
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS emd_refund_a4_records (
-                id INTEGER PRIMARY KEY,
-                payee_name TEXT,
-                amount REAL,
-                work_description TEXT,
-                receipt_number TEXT,
-                refund_date TEXT,
-                date_created TEXT
-            )
-        ''')
-        self.conn.commit()
+        """Use the shared PWD Tools database (pooled connection, managed schema)"""
+        self.db_manager = DatabaseManager()
     
     def create_interface(self):
         """Create interface"""
@@ -148,48 +140,6 @@ class SimpleEMDRefundA4Tool:
                             width=15, height=1, font=("Arial", 9), bg="lightgray")
         clear_btn.pack(side="left", padx=5)
     
-    def convert_number_to_words(self, num):
-        """Convert number to words"""
-        ones = ["", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine"]
-        tens = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
-        teens = ["Ten", "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen", "Seventeen", "Eighteen", "Nineteen"]
-        
-        if num == 0:
-            return "Zero"
-        
-        def convert_hundreds(n):
-            result = ""
-            if n >= 100:
-                result += ones[n // 100] + " Hundred "
-                n %= 100
-            if n >= 20:
-                result += tens[n // 10] + " "
-                n %= 10
-            elif n >= 10:
-                result += teens[n - 10] + " "
-                return result
-            if n > 0:
-                result += ones[n] + " "
-            return result
-        
-        if num < 0:
-            return "Negative " + convert_number_to_words(-num)
-        
-        result = ""
-        if num >= 10000000:  # Crores
-            result += convert_hundreds(num // 10000000) + "Crore "
-            num %= 10000000
-        if num >= 100000:  # Lakhs
-            result += convert_hundreds(num // 100000) + "Lakh "
-            num %= 100000
-        if num >= 1000:  # Thousands
-            result += convert_hundreds(num // 1000) + "Thousand "
-            num %= 1000
-        if num > 0:
-            result += convert_hundreds(num)
-        
-        return result.strip()
-    
     def generate_a4_receipt(self):
         """Generate A4 EMD refund receipt in standard RPWA 28 format"""
         try:
@@ -211,198 +161,17 @@ class SimpleEMDRefundA4Tool:
                 return
             
             # Convert amount to words
-            amount_words = self.convert_number_to_words(int(amount))
+            amount_words = number_to_words(int(amount))
             
             # Generate receipt number
             receipt_number = f"EMD-{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
             # Generate A4 HTML receipt
-            html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=210mm, height: 297mm">
-    <title>Hand Receipt (RPWA 28)</title>
-    <style>
-        body { 
-            font-family: 'Times New Roman', serif; 
-            margin: 0; 
-            padding: 0;
-            background: white;
-        }
-        @page {{
-            size: A4 portrait;
-            margin: 10mm;
-        }}
-        .container {{
-            width: 210mm;
-            min-height: 297mm;
-            margin: 0;
-            padding: 20mm;
-            box-sizing: border-box;
-            position: relative;
-            border: 2px solid #000;
-            background: white;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 20px;
-            color: #000;
-        }}
-        .header h2 {{
-            margin: 5px 0;
-            font-size: 18px;
-            font-weight: bold;
-        }}
-        .header p {{
-            margin: 3px 0;
-            font-size: 14px;
-        }}
-        .details {{
-            margin-bottom: 15px;
-            line-height: 1.6;
-        }}
-        .details p {{
-            margin: 8px 0;
-            font-size: 14px;
-        }}
-        .amount-words {{
-            font-style: italic;
-            font-weight: bold;
-        }}
-        .signature-area {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 30px;
-            margin-bottom: 20px;
-        }}
-        .signature-area td, .signature-area th {{
-            border: 1px solid #000;
-            padding: 8px;
-            text-align: left;
-            font-size: 12px;
-        }}
-        .offices {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }}
-        .offices td, .offices th {{
-            border: 1px solid #000;
-            padding: 8px;
-            text-align: left;
-            font-size: 12px;
-        }}
-        .input-field {{
-            border-bottom: 1px dotted #000;
-            padding: 2px;
-            min-width: 200px;
-            display: inline-block;
-        }}
-        .bottom-left-box {{
-            position: absolute;
-            bottom: 20mm;
-            left: 20mm;
-            border: 2px solid #000;
-            padding: 10px;
-            width: 120mm;
-            text-align: left;
-            height: 40mm;
-            font-size: 12px;
-        }}
-        .bottom-left-box p {{
-            margin: 2px 0;
-        }}
-        .seal-area {{
-            position: absolute;
-            bottom: 20mm;
-            right: 20mm;
-            width: 50mm;
-            height: 30mm;
-            border: 1px solid #000;
-            text-align: center;
-            padding: 5px;
-        }}
-        .seal-area p {{
-            margin: 5px 0;
-            font-size: 10px;
-        }}
-        @media print {{
-            .container {{
-                border: 2px solid #000;
-                width: 210mm;
-                min-height: 297mm;
-                margin: 0;
-                padding: 20mm;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h2>Payable to: - {payee_name} (Electric Contractor)</h2>
-            <h2>HAND RECEIPT (RPWA 28)</h2>
-            <p>(Referred to in PWF&A Rules 418,424,436 & 438)</p>
-            <p>Division - PWD Electric Division, Udaipur</p>
-        </div>
-        <div class="details">
-            <p>(1) Cash Book Voucher No. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Date &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</p>
-            <p>(2) Cheque No. and Date &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</p>
-            <p>(3) Pay for ECS Rs.{amount:,.0f}/- (Rupees <span class="amount-words">{amount_words} Only</span>)</p>
-            <p>(4) Paid by me</p>
-            <p>(5) Received from The Executive Engineer PWD Electric Division, Udaipur the sum of Rs. {amount:,.0f}/- (Rupees <span class="amount-words">{amount_words} Only</span>)</p>
-            <p>Name of work for which payment is made: <span class="input-field">{work_description}</span></p>
-            <p>Chargeable to Head:- 8443 [EMD-Refund]</p>
-            <table class="signature-area">
-                <tr>
-                    <td>Witness</td>
-                    <td>Stamp</td>
-                    <td>Signature of payee</td>
-                </tr>
-                <tr>
-                    <td>Cash Book No. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Page No. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</td>
-                    <td></td>
-                    <td></td>
-                </tr>
-            </table>
-            <table class="offices">
-                <tr>
-                    <td>For use in the Divisional Office</td>
-                    <td>For use in the Accountant General's office</td>
-                </tr>
-                <tr>
-                    <td>Checked</td>
-                    <td>Audited/Reviewed</td>
-                </tr>
-                <tr>
-                    <td>Accounts Clerk</td>
-                    <td>DA &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Auditor &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Supdt. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; G.O.</td>
-                </tr>
-            </table>
-        </div>
-        <div class="seal-area">
-            <p>SEAL</p>
-            <p></p>
-            <p></p>
-            <p></p>
-        </div>
-        <div class="bottom-left-box">
-            <p></p>
-            <p></p>
-            <p></p>
-            <p>Passed for Rs. {amount:,.0f}</p>
-            <p>In Words Rupees: {amount_words} Only</p>
-            <p>Chargeable to Head:- 8443 [EMD-Refund]</p>
-            <div style="margin-top: 10px;">
-                <p>Ar.&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;D.A.&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;E.E.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
+            html_content = self.template_engine.render('emd_refund', {
+                'payee': payee_name,
+                'amount': amount,
+                'work_description': work_description
+            })
             
             # Display preview
             preview_text = f"""
@@ -415,7 +184,7 @@ Date: {datetime.now().strftime('%d/%m/%Y')}
 PAYEE DETAILS
 =============
 Payee Name: {payee_name}
-Amount: ₹ {amount:,.2f}
+Amount: {format_inr(amount)}
 Amount in Words: {amount_words} Only
 Work Description: {work_description}
 
@@ -472,7 +241,7 @@ Click 'Open in Browser' to view full A4 format
         
         try:
             receipt = self.current_receipt
-            self.cursor.execute('''
+            success = self.db_manager.execute_query('''
                 INSERT INTO emd_refund_a4_records (
                     payee_name, amount, work_description, receipt_number, refund_date, date_created
                 ) VALUES (?, ?, ?, ?, ?, ?)
@@ -485,8 +254,10 @@ Click 'Open in Browser' to view full A4 format
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ))
             
-            self.conn.commit()
-            messagebox.showinfo("Success", "Receipt saved successfully!")
+            if success:
+                messagebox.showinfo("Success", "Receipt saved successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to save receipt")
             
         except Exception as e:
             messagebox.showerror("Error", f"Save error: {str(e)}")
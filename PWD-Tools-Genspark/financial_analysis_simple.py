@@ -8,7 +8,8 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from datetime import datetime
 import os
-import sqlite3
+
+from config.database import DatabaseManager
 
 class SimpleCalendarWidget:
     """Professional one-liner calendar widget"""
@@ -131,24 +132,8 @@ class SimpleFinancialAnalysisTool:
         self.create_interface()
     
     def init_database(self):
-        """Initialize simple database"""
-        self.conn = sqlite3.connect('financial_analysis.db')
-        self.cursor = self.conn.cursor()
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS financial_records (
-                id INTEGER PRIMARY KEY,
-                project_name TEXT,
-                start_date TEXT,
-                end_date TEXT,
-                budget_amount REAL,
-                spent_amount REAL,
-                remaining_amount REAL,
-                completion_percentage REAL,
-                analysis_date TEXT
-            )
-        ''')
-        self.conn.commit()
+        """Use the shared PWD Tools database (pooled connection, managed schema)"""
+        self.db_manager = DatabaseManager()
     
     def create_interface(self):
         """Create interface"""
@@ -404,7 +389,7 @@ FINANCIAL STATUS
         
         try:
             analysis = self.current_analysis
-            self.cursor.execute('''
+            success = self.db_manager.execute_query('''
                 INSERT INTO financial_records (
                     project_name, start_date, end_date, budget_amount, 
                     spent_amount, remaining_amount, completion_percentage, analysis_date
@@ -420,8 +405,10 @@ FINANCIAL STATUS
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ))
             
-            self.conn.commit()
-            messagebox.showinfo("Success", "Analysis saved successfully!")
+            if success:
+                messagebox.showinfo("Success", "Analysis saved successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to save analysis")
             
         except Exception as e:
             messagebox.showerror("Error", f"Save error: {str(e)}")
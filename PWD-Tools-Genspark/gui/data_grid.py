@@ -0,0 +1,294 @@
+"""
+Data Grid for PWD Tools Desktop Application
+Virtualized table that shows only the visible rows of a paged source
+"""
+
+import math
+import tkinter as tk
+from tkinter import ttk
+
+import customtkinter as ctk
+
+ROW_HEIGHT = 24
+WHEEL_ROWS = 3
+# Wait this long after the last keystroke before filtering
+FILTER_DELAY_MS = 250
+GRID_STYLE = "DataGrid.Treeview"
+
+
+def display_text(value):
+    """Default cell text: empty for missing values, str() otherwise"""
+    if value is None:
+        return ""
+    try:
+        if value != value:
+            # NaN / NaT
+            return ""
+    except (TypeError, ValueError):
+        return ""
+    return str(value)
+
+
+class DataGrid:
+    """Treeview table over a DataFrameSource or QuerySource
+
+    The tree only ever holds one screenful of items. Scrolling moves a
+    window over the source and rewrites those items in place with the
+    rows source.rows() returns, so a table of 100,000 records costs no
+    more to show than one of twenty. Clicking a heading sorts and the
+    filter box filters; both are handed to the source, which does them
+    in pandas or SQL.
+    """
+
+    def __init__(self, parent, source, headings=None, formatters=None, widths=None,
+                 height=8, on_activate=None, searchable=True, empty_text="No records found."):
+        self.source = source
+        self.headings = headings or {}
+        self.formatters = formatters or {}
+        self.widths = widths or {}
+        self.on_activate = on_activate
+        self.empty_text = empty_text
+        self.top = 0
+        self.visible_rows = height
+        self.selected = None
+        self.records = []
+        self.sort_column = None
+        self.descending = False
+        self._refresh_pending = False
+        self._filter_job = None
+
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+
+        bar = ctk.CTkFrame(self.frame, fg_color="transparent")
+        bar.pack(fill="x", pady=(0, 5))
+        self.filter_var = tk.StringVar()
+        if searchable:
+            filter_entry = ctk.CTkEntry(
+                bar,
+                textvariable=self.filter_var,
+                placeholder_text="Filter...",
+                width=220
+            )
+            filter_entry.pack(side="left")
+            self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
+        self.count_label = ctk.CTkLabel(bar, text="", font=ctk.CTkFont(size=11), text_color="#666666")
+        self.count_label.pack(side="right", padx=5)
+
+        table = tk.Frame(self.frame)
+        table.pack(fill="both", expand=True)
+        style = ttk.Style(table)
+        style.configure(GRID_STYLE, rowheight=ROW_HEIGHT)
+
+        self.tree = ttk.Treeview(table, show="headings", selectmode="browse", height=height, style=GRID_STYLE)
+        self.scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Double-1>", self.on_double_click)
+        self.tree.bind("<Return>", lambda event: self.activate())
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(WHEEL_ROWS))
+        for key, step in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda event, step=step: self.move_selection(step))
+        self.tree.bind("<Prior>", lambda event: self.move_selection(-self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.move_selection(self.visible_rows))
+        self.tree.bind("<Home>", lambda event: self.move_selection(-len(self.source)))
+        self.tree.bind("<End>", lambda event: self.move_selection(len(self.source)))
+
+        self.setup_columns()
+        self.refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def setup_columns(self):
+        """Create one tree column per source column"""
+        columns = list(self.source.columns)
+        self.tree.configure(columns=columns)
+        for column in columns:
+            self.tree.heading(column, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=self.widths.get(column, 120), stretch=True)
+        self.update_headings()
+
+    def update_headings(self):
+        for column in self.source.columns:
+            text = self.headings.get(column, column)
+            if column == self.sort_column:
+                text += " ▼" if self.descending else " ▲"
+            self.tree.heading(column, text=text)
+
+    def set_source(self, source):
+        """Show another source, keeping the current filter and sort where possible"""
+        same_columns = list(source.columns) == list(self.source.columns)
+        self.source = source
+        if not same_columns:
+            self.setup_columns()
+        if self.sort_column in source.columns:
+            self.source.sort(self.sort_column, self.descending)
+        else:
+            self.sort_column = None
+            self.update_headings()
+        if self.filter_var.get().strip():
+            self.source.filter(self.filter_var.get())
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def reload(self):
+        """Re-read the source, e.g. after records were saved"""
+        self.source.refresh()
+        self.selected = None
+        self.refresh()
+
+    def sort_by(self, column):
+        """Heading click: sort ascending, then descending, then back to the source order"""
+        if column != self.sort_column:
+            self.sort_column, self.descending = column, False
+        elif not self.descending:
+            self.descending = True
+        else:
+            self.sort_column, self.descending = None, False
+        self.source.sort(self.sort_column, self.descending)
+        self.update_headings()
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def schedule_filter(self):
+        if self._filter_job is not None:
+            self.tree.after_cancel(self._filter_job)
+        self._filter_job = self.tree.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self._filter_job = None
+        self.source.filter(self.filter_var.get())
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def format_row(self, values):
+        """Cell texts for one row; formatters only see values that are present"""
+        cells = []
+        for column, value in zip(self.source.columns, values):
+            text = display_text(value)
+            formatter = self.formatters.get(column)
+            cells.append(formatter(value) if formatter is not None and text else text)
+        return cells
+
+    def refresh(self):
+        """Rewrite the visible items from the source"""
+        self._refresh_pending = False
+        count = len(self.source)
+        self.top = max(0, min(self.top, count - self.visible_rows))
+        try:
+            rows = self.source.rows(self.top, self.top + self.visible_rows) if count else []
+        except Exception as e:
+            print(f"Error reading table rows: {e}")
+            rows = []
+        self.records = [values for _, values in rows]
+
+        items = self.tree.get_children()
+        for index, values in enumerate(self.records):
+            text = self.format_row(values)
+            if index < len(items):
+                self.tree.item(items[index], values=text)
+            else:
+                self.tree.insert("", "end", values=text)
+        if len(items) > len(self.records):
+            self.tree.delete(*items[len(self.records):])
+
+        items = self.tree.get_children()
+        if self.selected is not None and self.top <= self.selected < self.top + len(items):
+            item = items[self.selected - self.top]
+            if self.tree.selection() != (item,):
+                self.tree.selection_set(item)
+            self.tree.focus(item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + len(items)) / count))
+        else:
+            self.scrollbar.set(0, 1)
+        self.update_count(count)
+
+    def update_count(self, count):
+        total = getattr(self.source, "total", count)
+        if not total:
+            text = self.empty_text
+        elif count == total:
+            text = f"{count:,} records"
+        else:
+            text = f"{count:,} of {total:,} records"
+        self.count_label.configure(text=text)
+
+    def schedule_refresh(self):
+        """Coalesce the scroll events of one drag into a single refresh"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.tree.after_idle(self.refresh)
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), len(self.source) - self.visible_rows))
+        if top != self.top:
+            self.top = top
+            self.schedule_refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * len(self.source)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def on_resize(self, event):
+        """Show as many rows as fit; the heading takes about one row"""
+        rows = max(1, math.floor(event.height / ROW_HEIGHT) - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.schedule_refresh()
+
+    def on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            self.selected = self.top + self.tree.index(selection[0])
+
+    def move_selection(self, step):
+        """Keyboard navigation over the whole source, scrolling as needed"""
+        count = len(self.source)
+        if not count:
+            return "break"
+        current = self.selected if self.selected is not None else self.top - (1 if step > 0 else 0)
+        self.selected = max(0, min(current + step, count - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.visible_rows:
+            self.top = self.selected - self.visible_rows + 1
+        self.refresh()
+        return "break"
+
+    def on_double_click(self, event):
+        if self.tree.identify_region(event.x, event.y) == "cell":
+            self.activate()
+
+    def selected_record(self):
+        """Return the raw values of the selected row, or None"""
+        if self.selected is None or not self.top <= self.selected < self.top + len(self.records):
+            return None
+        return self.records[self.selected - self.top]
+
+    def activate(self):
+        record = self.selected_record()
+        if record is not None and self.on_activate is not None:
+            self.on_activate(record)
+        return "break"
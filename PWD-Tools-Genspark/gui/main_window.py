@@ -7,22 +7,153 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from datetime import datetime
-from gui.tools.excel_emd import ExcelEMDTool
-from gui.tools.bill_note import BillNoteTool
-from gui.tools.emd_refund import EMDRefundTool
-from gui.tools.deductions_table import DeductionsTableTool
-from gui.tools.delay_calculator import DelayCalculatorTool
-from gui.tools.security_refund import SecurityRefundTool
-from gui.tools.financial_progress import FinancialProgressTool
-from gui.tools.stamp_duty import StampDutyTool
-from gui.tools.bill_deviation import BillDeviationTool
-from gui.tools.tender_processing import TenderProcessingTool
+import importlib
+import time
+
+from utils.task_runner import task_runner_for
+
+# Automatic backup: first check shortly after startup, then hourly
+AUTO_BACKUP_DELAY_MS = 10 * 1000
+AUTO_BACKUP_CHECK_MS = 60 * 60 * 1000
+
+# Dashboard figures in the status bar are cheap to read, so refresh every minute
+DASHBOARD_REFRESH_MS = 60 * 1000
+
+# Global search: result limit, and the tool that owns each searchable table
+SEARCH_RESULT_LIMIT = 100
+SEARCH_TABLE_LABELS = {
+    "bills": ("Bills", "open_bill_note"),
+    "emd_records": ("EMD Records", "open_emd_refund"),
+    "tender_processing": ("Tenders", "open_tender_processing"),
+    "delay_calculations": ("Delay Calculations", "open_delay_calculator"),
+    "deductions": ("Deductions", "open_deductions_table"),
+    "security_refunds": ("Security Refunds", "open_security_refund"),
+    "stamp_duty_calculations": ("Stamp Duty", "open_stamp_duty"),
+    "bill_deviations": ("Bill Deviations", "open_bill_deviation"),
+}
+
+# Tool registry: only names, icons and where the tool lives. A tool's module
+# (and the pandas/openpyxl/reportlab it pulls in) is imported on first open.
+TOOL_REGISTRY = [
+    {
+        "key": "excel_emd",
+        "name": "Excel se EMD",
+        "description": "Hand Receipt Generator from Excel files",
+        "icon": "📊",
+        "color": "#8B5CF6",
+        "module": "gui.tools.excel_emd",
+        "class": "ExcelEMDTool"
+    },
+    {
+        "key": "bill_note",
+        "name": "Bill Note Sheet",
+        "description": "Bill Note Sheet Generator for PWD documentation",
+        "icon": "📝",
+        "color": "#10B981",
+        "module": "gui.tools.bill_note",
+        "class": "BillNoteTool"
+    },
+    {
+        "key": "emd_refund",
+        "name": "EMD Refund",
+        "description": "Generate EMD refund receipts and documentation",
+        "icon": "💰",
+        "color": "#F59E0B",
+        "module": "gui.tools.emd_refund",
+        "class": "EMDRefundTool"
+    },
+    {
+        "key": "deductions_table",
+        "name": "Deductions Table",
+        "description": "Calculate all standard deductions for bill amounts",
+        "icon": "📊",
+        "color": "#EF4444",
+        "module": "gui.tools.deductions_table",
+        "class": "DeductionsTableTool"
+    },
+    {
+        "key": "delay_calculator",
+        "name": "Delay Calculator",
+        "description": "Calculate project delays and timeline analysis",
+        "icon": "⏰",
+        "color": "#6366F1",
+        "module": "gui.tools.delay_calculator",
+        "class": "DelayCalculatorTool"
+    },
+    {
+        "key": "security_refund",
+        "name": "Security Refund",
+        "description": "Process security deposit refund calculations",
+        "icon": "🔒",
+        "color": "#8B5CF6",
+        "module": "gui.tools.security_refund",
+        "class": "SecurityRefundTool"
+    },
+    {
+        "key": "financial_progress",
+        "name": "Financial Progress",
+        "description": "Track financial progress and liquidity damages",
+        "icon": "📈",
+        "color": "#10B981",
+        "module": "gui.tools.financial_progress",
+        "class": "FinancialProgressTool"
+    },
+    {
+        "key": "stamp_duty",
+        "name": "Stamp Duty",
+        "description": "Calculate stamp duty for work orders",
+        "icon": "📋",
+        "color": "#F59E0B",
+        "module": "gui.tools.stamp_duty",
+        "class": "StampDutyTool"
+    },
+    {
+        "key": "bill_deviation",
+        "name": "Bill & Deviation",
+        "description": "Infrastructure Billing System with deviation tracking",
+        "icon": "💰",
+        "color": "#EF4444",
+        "module": "gui.tools.bill_deviation",
+        "class": "BillDeviationTool"
+    },
+    {
+        "key": "tender_processing",
+        "name": "Tender Processing",
+        "description": "Comprehensive tender management system",
+        "icon": "📋",
+        "color": "#6366F1",
+        "module": "gui.tools.tender_processing",
+        "class": "TenderProcessingTool"
+    }
+]
+TOOLS_BY_KEY = {tool["key"]: tool for tool in TOOL_REGISTRY}
+
+# Pre-warming imports the remaining tool modules in the background, one at a
+# time, whenever the user has not touched keyboard or mouse for a while
+TOOL_PREWARM_CHECK_MS = 1000
+TOOL_PREWARM_IDLE_SECONDS = 3.0
+
+_tool_classes = {}
+
+
+def load_tool_class(key):
+    """Import a tool's module on first use and return its window class"""
+    tool_class = _tool_classes.get(key)
+    if tool_class is None:
+        tool = TOOLS_BY_KEY[key]
+        module = importlib.import_module(tool["module"])
+        tool_class = getattr(module, tool["class"])
+        _tool_classes[key] = tool_class
+    return tool_class
+
 
 class PWDToolsMainWindow:
     def __init__(self, db_manager, settings, root=None):
         """Initialize the main application window"""
         self.db_manager = db_manager
         self.settings = settings
+        self.db_manager.configure_backups(settings)
+        self.db_manager.configure_diagnostics(settings)
         
         # Use provided root window or create new one
         if root is not None:
@@ -30,11 +161,25 @@ class PWDToolsMainWindow:
         else:
             self.root = ctk.CTk()
         
+        # Background jobs of the main window and all tool windows
+        self.task_runner = task_runner_for(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.close_application)
+        
         self.setup_window()
         self.create_interface()
         
         # Tool windows tracking
         self.open_tools = {}
+        
+        # Check for a due automatic backup once the window is up
+        self.root.after(AUTO_BACKUP_DELAY_MS, self.schedule_auto_backup)
+        
+        # Import tool modules in the background while the user is idle
+        self.last_activity = time.monotonic()
+        if self.settings.get('ui_settings.prewarm_tools', True):
+            for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>", "<Motion>"):
+                self.root.bind_all(sequence, self.note_activity, add="+")
+            self.root.after(TOOL_PREWARM_CHECK_MS, self.prewarm_tools)
     
     def setup_window(self):
         """Configure main window properties"""
@@ -106,94 +251,37 @@ class PWDToolsMainWindow:
             text="🎯 Select a tool to begin working with PWD operations",
             font=ctk.CTkFont(size=16, weight="bold")
         )
-        welcome_label.pack(pady=15)
+        welcome_label.pack(side="left", padx=15, pady=15)
+        
+        # Global search across all tool records
+        search_button = ctk.CTkButton(
+            welcome_frame,
+            text="🔍 Search",
+            width=90,
+            command=self.run_global_search
+        )
+        search_button.pack(side="right", padx=(5, 15), pady=15)
+        
+        self.search_entry = ctk.CTkEntry(
+            welcome_frame,
+            width=300,
+            placeholder_text="Search contractors, tenders, bills, works..."
+        )
+        self.search_entry.pack(side="right", pady=15)
+        self.search_entry.bind("<Return>", lambda event: self.run_global_search())
         
         # Tools grid
         self.create_tools_grid(main_frame)
     
     def create_tools_grid(self, parent):
         """Create grid of tool buttons"""
-        # Tools configuration
-        tools_config = [
-            {
-                "name": "Excel se EMD",
-                "description": "Hand Receipt Generator from Excel files",
-                "icon": "📊",
-                "color": "#8B5CF6",
-                "command": self.open_excel_emd
-            },
-            {
-                "name": "Bill Note Sheet",
-                "description": "Bill Note Sheet Generator for PWD documentation",
-                "icon": "📝",
-                "color": "#10B981",
-                "command": self.open_bill_note
-            },
-            {
-                "name": "EMD Refund",
-                "description": "Generate EMD refund receipts and documentation",
-                "icon": "💰",
-                "color": "#F59E0B",
-                "command": self.open_emd_refund
-            },
-            {
-                "name": "Deductions Table",
-                "description": "Calculate all standard deductions for bill amounts",
-                "icon": "📊",
-                "color": "#EF4444",
-                "command": self.open_deductions_table
-            },
-            {
-                "name": "Delay Calculator",
-                "description": "Calculate project delays and timeline analysis",
-                "icon": "⏰",
-                "color": "#6366F1",
-                "command": self.open_delay_calculator
-            },
-            {
-                "name": "Security Refund",
-                "description": "Process security deposit refund calculations",
-                "icon": "🔒",
-                "color": "#8B5CF6",
-                "command": self.open_security_refund
-            },
-            {
-                "name": "Financial Progress",
-                "description": "Track financial progress and liquidity damages",
-                "icon": "📈",
-                "color": "#10B981",
-                "command": self.open_financial_progress
-            },
-            {
-                "name": "Stamp Duty",
-                "description": "Calculate stamp duty for work orders",
-                "icon": "📋",
-                "color": "#F59E0B",
-                "command": self.open_stamp_duty
-            },
-            {
-                "name": "Bill & Deviation",
-                "description": "Infrastructure Billing System with deviation tracking",
-                "icon": "💰",
-                "color": "#EF4444",
-                "command": self.open_bill_deviation
-            },
-            {
-                "name": "Tender Processing",
-                "description": "Comprehensive tender management system",
-                "icon": "📋",
-                "color": "#6366F1",
-                "command": self.open_tender_processing
-            }
-        ]
-        
         # Create scrollable frame for tools
         tools_frame = ctk.CTkScrollableFrame(parent, label_text="Available Tools")
         tools_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Create tool buttons in grid (4 columns)
         columns = 4
-        for i, tool in enumerate(tools_config):
+        for i, tool in enumerate(TOOL_REGISTRY):
             row = i // columns
             col = i % columns
             
@@ -230,7 +318,7 @@ class PWDToolsMainWindow:
             open_btn = ctk.CTkButton(
                 tool_frame,
                 text="Open",
-                command=tool["command"],
+                command=lambda key=tool["key"]: self.open_tool(key),
                 fg_color=tool["color"],
                 hover_color=self.darken_color(tool["color"]),
                 width=100,
@@ -259,16 +347,45 @@ class PWDToolsMainWindow:
         status_frame.pack_propagate(False)
         
         # Status text
+        self.default_status_text = "Ready | PWD Tools Desktop v1.0.0 | All tools offline and independent"
         self.status_label = ctk.CTkLabel(
             status_frame,
-            text="Ready | PWD Tools Desktop v1.0.0 | All tools offline and independent",
+            text=self.default_status_text,
             font=ctk.CTkFont(size=11)
         )
         self.status_label.pack(side="left", padx=10, pady=5)
         
+        # Record counts and EMD totals from the dashboard counters
+        self.stats_label = ctk.CTkLabel(
+            status_frame,
+            text="",
+            font=ctk.CTkFont(size=11)
+        )
+        self.stats_label.pack(side="left", padx=10, pady=5)
+        self.update_dashboard_stats()
+        
         # Current time
         self.update_time()
     
+    def show_dashboard_stats(self):
+        """Show record and EMD totals in the status bar"""
+        stats = self.db_manager.get_dashboard_stats()
+        emd = stats["tables"].get("emd_records", {"amount": 0.0, "refunded": 0.0})
+        self.stats_label.configure(
+            text=f"Records: {stats['totals']['records']:,} | "
+                 f"EMD received: ₹{emd['amount']:,.2f} | "
+                 f"EMD refunded: ₹{emd['refunded']:,.2f}"
+        )
+    
+    def update_dashboard_stats(self):
+        """Refresh the status bar totals periodically"""
+        try:
+            self.show_dashboard_stats()
+            self.root.after(DASHBOARD_REFRESH_MS, self.update_dashboard_stats)
+        except:
+            # Window was destroyed, stop updating
+            pass
+    
     def update_time(self):
         """Update current time in status bar"""
         try:
@@ -295,8 +412,9 @@ class PWDToolsMainWindow:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Backup Database", command=self.backup_database)
+        file_menu.add_command(label="Archive Closed Years...", command=self.archive_closed_years)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.close_application)
         
         # Tools menu
         tools_menu = tk.Menu(menubar, tearoff=0)
@@ -305,91 +423,333 @@ class PWDToolsMainWindow:
         tools_menu.add_command(label="Bill Note Sheet", command=self.open_bill_note)
         tools_menu.add_command(label="EMD Refund", command=self.open_emd_refund)
         
+        # Diagnostics menu
+        diagnostics_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Diagnostics", menu=diagnostics_menu)
+        diagnostics_menu.add_command(label="Query Statistics", command=self.show_query_statistics)
+        diagnostics_menu.add_command(label="Slow Queries", command=lambda: self.show_query_statistics(slow_only=True))
+        diagnostics_menu.add_command(label="Export Statistics (JSON)...", command=self.export_query_statistics)
+        diagnostics_menu.add_separator()
+        diagnostics_menu.add_command(label="Reset Statistics", command=self.reset_query_statistics)
+        
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="About", command=self.show_about)
     
     # Tool opening methods
+    def open_tool(self, key):
+        """Open a tool window, importing its module on first use"""
+        if key in self.open_tools:
+            self.open_tools[key].focus()
+            return
+        
+        tool = TOOLS_BY_KEY[key]
+        if key not in _tool_classes:
+            self.status_label.configure(text=f"Loading {tool['name']}...")
+            self.root.update_idletasks()
+        try:
+            tool_class = load_tool_class(key)
+            self.open_tools[key] = tool_class(self.db_manager, self.settings, self.root)
+        except Exception as e:
+            messagebox.showerror("Tool Error", f"Failed to open {tool['name']}:\n{str(e)}")
+        finally:
+            self.status_label.configure(text=self.default_status_text)
+    
+    def note_activity(self, event=None):
+        """Remember when the user last used keyboard or mouse"""
+        self.last_activity = time.monotonic()
+    
+    def prewarm_tools(self):
+        """Import the next unopened tool module in the background once the user is idle"""
+        pending = [tool["key"] for tool in TOOL_REGISTRY if tool["key"] not in _tool_classes]
+        if not pending:
+            return
+        
+        try:
+            idle = time.monotonic() - self.last_activity >= TOOL_PREWARM_IDLE_SECONDS
+            if idle and "tool_prewarm" not in self.task_runner.active:
+                key = pending[0]
+                self.task_runner.submit(
+                    load_tool_class, key,
+                    key="tool_prewarm",
+                    description=f"Loading {TOOLS_BY_KEY[key]['name']}",
+                    on_error=lambda error: self.prewarm_failed(key, error)
+                )
+            self.root.after(TOOL_PREWARM_CHECK_MS, self.prewarm_tools)
+        except Exception:
+            # Window was destroyed, stop pre-warming
+            pass
+    
+    def prewarm_failed(self, key, error):
+        """Skip a tool that failed to pre-load; opening it reports the error"""
+        print(f"Error pre-loading tool {key}: {error}")
+        _tool_classes[key] = None
+    
     def open_excel_emd(self):
         """Open Excel EMD tool"""
-        if "excel_emd" not in self.open_tools:
-            self.open_tools["excel_emd"] = ExcelEMDTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["excel_emd"].focus()
+        self.open_tool("excel_emd")
     
     def open_bill_note(self):
         """Open Bill Note Sheet tool"""
-        if "bill_note" not in self.open_tools:
-            self.open_tools["bill_note"] = BillNoteTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["bill_note"].focus()
+        self.open_tool("bill_note")
     
     def open_emd_refund(self):
         """Open EMD Refund tool"""
-        if "emd_refund" not in self.open_tools:
-            self.open_tools["emd_refund"] = EMDRefundTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["emd_refund"].focus()
+        self.open_tool("emd_refund")
     
     def open_deductions_table(self):
         """Open Deductions Table tool"""
-        if "deductions_table" not in self.open_tools:
-            self.open_tools["deductions_table"] = DeductionsTableTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["deductions_table"].focus()
+        self.open_tool("deductions_table")
     
     def open_delay_calculator(self):
         """Open Delay Calculator tool"""
-        if "delay_calculator" not in self.open_tools:
-            self.open_tools["delay_calculator"] = DelayCalculatorTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["delay_calculator"].focus()
+        self.open_tool("delay_calculator")
     
     def open_security_refund(self):
         """Open Security Refund tool"""
-        if "security_refund" not in self.open_tools:
-            self.open_tools["security_refund"] = SecurityRefundTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["security_refund"].focus()
+        self.open_tool("security_refund")
     
     def open_financial_progress(self):
         """Open Financial Progress tool"""
-        if "financial_progress" not in self.open_tools:
-            self.open_tools["financial_progress"] = FinancialProgressTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["financial_progress"].focus()
+        self.open_tool("financial_progress")
     
     def open_stamp_duty(self):
         """Open Stamp Duty tool"""
-        if "stamp_duty" not in self.open_tools:
-            self.open_tools["stamp_duty"] = StampDutyTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["stamp_duty"].focus()
+        self.open_tool("stamp_duty")
     
     def open_bill_deviation(self):
         """Open Bill & Deviation tool"""
-        if "bill_deviation" not in self.open_tools:
-            self.open_tools["bill_deviation"] = BillDeviationTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["bill_deviation"].focus()
+        self.open_tool("bill_deviation")
     
     def open_tender_processing(self):
         """Open Tender Processing tool"""
-        if "tender_processing" not in self.open_tools:
-            self.open_tools["tender_processing"] = TenderProcessingTool(self.db_manager, self.settings, self.root)
-        else:
-            self.open_tools["tender_processing"].focus()
+        self.open_tool("tender_processing")
+    
+    def run_global_search(self):
+        """Search every tool's records and show ranked results"""
+        text = self.search_entry.get().strip()
+        if not text:
+            return
+        
+        results = self.db_manager.search(text, limit=SEARCH_RESULT_LIMIT)
+        self.show_search_results(text, results)
+    
+    def show_search_results(self, text, results):
+        """Display search results in a separate window"""
+        window = ctk.CTkToplevel(self.root)
+        window.title(f"Search Results - {text}")
+        window.geometry("800x500")
+        window.transient(self.root)
+        
+        summary_label = ctk.CTkLabel(
+            window,
+            text=f"{len(results)} result(s) for \"{text}\"",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        summary_label.pack(anchor="w", padx=15, pady=(15, 5))
+        
+        results_frame = ctk.CTkScrollableFrame(window)
+        results_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        
+        if not results:
+            ctk.CTkLabel(results_frame, text="No matching records found.").pack(pady=20)
+            return
+        
+        for result in results:
+            label, opener = SEARCH_TABLE_LABELS.get(result["table"], (result["table"], None))
+            row_frame = ctk.CTkFrame(results_frame)
+            row_frame.pack(fill="x", pady=3)
+            
+            ctk.CTkLabel(
+                row_frame,
+                text=f"{label} #{result['id']}",
+                font=ctk.CTkFont(size=12, weight="bold"),
+                width=170,
+                anchor="w"
+            ).pack(side="left", padx=10, pady=8)
+            
+            details = " | ".join(str(value) for value in result["fields"].values() if value)
+            ctk.CTkLabel(
+                row_frame,
+                text=details,
+                font=ctk.CTkFont(size=12),
+                anchor="w",
+                justify="left",
+                wraplength=450
+            ).pack(side="left", fill="x", expand=True, padx=5, pady=8)
+            
+            if opener is not None:
+                ctk.CTkButton(
+                    row_frame,
+                    text="Open Tool",
+                    width=90,
+                    command=getattr(self, opener)
+                ).pack(side="right", padx=10, pady=8)
     
     def backup_database(self):
-        """Create database backup"""
-        try:
-            if self.db_manager.backup_database():
+        """Create database backup in the background"""
+        self.start_backup(notify=True)
+    
+    def start_backup(self, notify=False):
+        """Run an online backup on a worker thread so the window stays responsive"""
+        if "db_backup" in self.task_runner.active:
+            if notify:
+                messagebox.showinfo("Backup", "A database backup is already running.")
+            return
+        
+        compress = self.settings.get('backup_settings.compress', True)
+        self.status_label.configure(text="Backing up database...")
+        self.task_runner.submit(
+            self.db_manager.backup_database,
+            compress=compress,
+            key="db_backup",
+            description="Database backup",
+            on_done=lambda success: self.backup_finished(success, notify),
+            on_error=lambda error: self.backup_finished(False, notify)
+        )
+    
+    def backup_finished(self, success, notify):
+        """Report a finished background backup"""
+        self.status_label.configure(text=self.default_status_text)
+        if notify:
+            if success:
                 messagebox.showinfo("Success", "Database backup created successfully!")
             else:
                 messagebox.showerror("Error", "Failed to create database backup.")
+    
+    def archive_closed_years(self):
+        """Move closed financial years into per-year archive files"""
+        years = self.db_manager.archive_manager.closed_years()
+        if not years:
+            messagebox.showinfo("Archive", "There are no closed financial years to archive.")
+            return
+        
+        if not messagebox.askyesno(
+            "Archive Closed Years",
+            f"Move the records of {', '.join(years)} into archive files?\n\n"
+            "Archived records stay available to reports but are no longer "
+            "part of the live database or its backups."
+        ):
+            return
+        
+        def archive(task):
+            moved = {}
+            for position, financial_year in enumerate(years):
+                if task.cancelled:
+                    break
+                task.report(position, len(years), f"Archiving {financial_year}...")
+                moved[financial_year] = self.db_manager.archive_financial_year(financial_year)
+            return moved
+        
+        self.status_label.configure(text="Archiving closed financial years...")
+        task = self.task_runner.submit(
+            archive,
+            key="db_archive",
+            description="Archive",
+            report_progress=True,
+            on_done=self.archive_finished,
+            on_error=lambda error: messagebox.showerror("Archive", f"Archiving failed:\n{error}")
+        )
+        task.subscribe(self.show_task_status)
+    
+    def show_task_status(self, task):
+        """Mirror a main-window job in the status bar"""
+        try:
+            if task.finished:
+                self.status_label.configure(text=self.default_status_text)
+            elif task.total:
+                self.status_label.configure(text=f"{task.message} ({task.done_count + 1}/{task.total})")
+        except Exception:
+            # Window was destroyed
+            pass
+    
+    def archive_finished(self, moved):
+        """Report a finished background archive"""
+        self.show_dashboard_stats()
+        failed = [year for year, tables in moved.items() if tables is None]
+        summary = "\n".join(
+            f"{year}: {sum(tables.values())} records"
+            for year, tables in moved.items() if tables is not None
+        )
+        if failed:
+            messagebox.showerror("Archive", f"Could not archive {', '.join(failed)}.\n\n{summary}")
+        else:
+            messagebox.showinfo("Archive", f"Archived closed financial years:\n\n{summary}")
+    
+    def schedule_auto_backup(self):
+        """Back up automatically when the newest backup is older than the interval"""
+        try:
+            if self.settings.get('export_settings.auto_backup', True):
+                interval_hours = self.settings.get('backup_settings.interval_hours', 24)
+                if self.db_manager.backup_manager.backup_due(interval_hours):
+                    self.start_backup()
+            self.root.after(AUTO_BACKUP_CHECK_MS, self.schedule_auto_backup)
         except Exception as e:
-            messagebox.showerror("Error", f"Backup failed: {str(e)}")
+            print(f"Error scheduling automatic backup: {e}")
+    
+    def show_query_statistics(self, slow_only=False):
+        """Show per-statement query timings collected since startup"""
+        report = self.db_manager.get_query_stats()
+        statements = report["statements"]
+        if slow_only:
+            statements = [stats for stats in statements if stats["slow_calls"]]
+        
+        window = ctk.CTkToplevel(self.root)
+        window.title("Slow Queries" if slow_only else "Query Statistics")
+        window.geometry("900x600")
+        window.transient(self.root)
+        
+        summary_label = ctk.CTkLabel(
+            window,
+            text=f"{report['total_calls']:,} queries, {report['total_ms']:,.1f} ms total since "
+                 f"{report['collecting_since'][:19].replace('T', ' ')} | "
+                 f"slow threshold {report['slow_query_ms']} ms",
+            font=ctk.CTkFont(size=13, weight="bold")
+        )
+        summary_label.pack(anchor="w", padx=15, pady=(15, 5))
+        
+        report_text = ctk.CTkTextbox(window, font=ctk.CTkFont(family="Courier", size=11), wrap="word")
+        report_text.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        
+        if not statements:
+            report_text.insert("end", "No slow queries recorded." if slow_only else "No queries recorded.")
+        for stats in statements:
+            histogram = ", ".join(f"{bucket}: {count}" for bucket, count in stats["histogram"].items())
+            call_sites = ", ".join(f"{site} ({count})" for site, count in stats["call_sites"].items())
+            report_text.insert("end", (
+                f"{stats['statement']}\n"
+                f"  calls {stats['calls']} | rows {stats['rows']:,} | avg {stats['avg_ms']:.2f} ms | "
+                f"max {stats['max_ms']:.2f} ms | total {stats['total_ms']:.1f} ms | "
+                f"slow {stats['slow_calls']} | errors {stats['errors']}\n"
+                f"  latency: {histogram}\n"
+                f"  called from: {call_sites}\n"
+            ))
+            if stats["plan"]:
+                report_text.insert("end", "  plan: " + "; ".join(stats["plan"]) + "\n")
+            report_text.insert("end", "\n")
+        report_text.configure(state="disabled")
+    
+    def export_query_statistics(self):
+        """Save the query statistics as JSON for offline analysis"""
+        file_path = filedialog.asksaveasfilename(
+            title="Export Query Statistics",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile=f"query_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        if not file_path:
+            return
+        
+        if self.db_manager.dump_query_stats(file_path):
+            messagebox.showinfo("Success", f"Query statistics exported to:\n{file_path}")
+        else:
+            messagebox.showerror("Error", "Failed to export query statistics.")
+    
+    def reset_query_statistics(self):
+        """Clear the collected query statistics"""
+        self.db_manager.profiler.reset()
+        messagebox.showinfo("Diagnostics", "Query statistics have been reset.")
     
     def show_about(self):
         """Show about dialog"""
@@ -413,6 +773,11 @@ Features:
         
         messagebox.showinfo("About PWD Tools Desktop", about_text)
     
+    def close_application(self):
+        """Stop background jobs and leave the main loop"""
+        self.task_runner.shutdown()
+        self.root.quit()
+    
     def run(self):
         """Start the application main loop"""
         # Don't start mainloop here as it's already running in the main app
@@ -0,0 +1,115 @@
+"""
+Task Progress Panel for PWD Tools Desktop Application
+Uniform progress bar, status line and cancel button for tool windows
+"""
+
+import customtkinter as ctk
+
+from utils.task_runner import task_runner_for
+
+
+class TaskProgressPanel:
+    """Shows the background job a tool window is waiting on
+
+    The panel packs itself along the bottom of its parent. track() a
+    TaskHandle to follow it: jobs that report a total get a determinate
+    bar, others an indeterminate one, and the status line shows the job's
+    latest message followed by its outcome.
+    """
+
+    def __init__(self, parent, idle_text="Ready"):
+        self.idle_text = idle_text
+        self.task = None
+        self.indeterminate = False
+        self.runner = task_runner_for(parent)
+
+        self.frame = ctk.CTkFrame(parent, height=36)
+        self.frame.pack(fill="x", side="bottom", padx=10, pady=(0, 5))
+        self.frame.pack_propagate(False)
+
+        self.status_label = ctk.CTkLabel(
+            self.frame,
+            text=idle_text,
+            font=ctk.CTkFont(size=11),
+            anchor="w"
+        )
+        self.status_label.pack(side="left", fill="x", expand=True, padx=10)
+
+        self.cancel_btn = ctk.CTkButton(
+            self.frame,
+            text="Cancel",
+            command=self.cancel,
+            width=80,
+            height=24,
+            fg_color="#EF4444",
+            state="disabled"
+        )
+        self.cancel_btn.pack(side="right", padx=10)
+
+        self.progress_bar = ctk.CTkProgressBar(self.frame, width=200)
+        self.progress_bar.pack(side="right", padx=10)
+        self.progress_bar.set(0)
+
+    def run(self, fn, *args, **kwargs):
+        """Submit a job to the shared task runner and track it"""
+        task = self.runner.submit(fn, *args, **kwargs)
+        self.track(task)
+        return task
+
+    def track(self, task):
+        """Follow a job's progress until it finishes"""
+        self.task = task
+        task.subscribe(self.update)
+        self.update(task)
+
+    @property
+    def busy(self):
+        return self.task is not None and not self.task.finished
+
+    def update(self, task):
+        """Redraw the panel for the tracked job"""
+        if task is not self.task:
+            return
+        try:
+            if not task.finished:
+                self.cancel_btn.configure(state="normal" if task.cancellable else "disabled")
+                if task.total:
+                    self.set_indeterminate(False)
+                    self.progress_bar.set(min(task.done_count / task.total, 1.0))
+                    counts = f" ({task.done_count:,} / {task.total:,})"
+                else:
+                    self.set_indeterminate(True)
+                    counts = ""
+                self.status_label.configure(text=f"{task.message or task.description + '...'}{counts}")
+                return
+
+            self.cancel_btn.configure(state="disabled")
+            self.set_indeterminate(False)
+            self.progress_bar.set(1 if task.status == "done" else 0)
+            if task.status == "done":
+                text = task.message or f"{task.description}: done"
+            elif task.status == "cancelled":
+                text = f"{task.description}: cancelled"
+            else:
+                text = f"{task.description} failed: {task.error}"
+            self.status_label.configure(text=text)
+        except Exception:
+            # Tool window was closed while the job ran
+            pass
+
+    def set_indeterminate(self, indeterminate):
+        """Switch the bar between a moving indicator and a fill level"""
+        if indeterminate == self.indeterminate:
+            return
+        self.indeterminate = indeterminate
+        if indeterminate:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.status_label.configure(text=f"{self.task.description}: cancelling...")
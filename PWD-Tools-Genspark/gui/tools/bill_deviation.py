@@ -8,6 +8,7 @@ import tkinter as tk
 from tkinter import messagebox, filedialog
 from datetime import datetime
 import json
+from gui.task_progress import TaskProgressPanel
 
 class BillDeviationTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -62,6 +63,9 @@ class BillDeviationTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content with notebook
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -431,8 +435,8 @@ class BillDeviationTool:
                 'contractor_name': self.contractor_entry.get().strip(),
                 'agreement_number': self.agreement_entry.get().strip(),
                 'bill_period': self.bill_period_entry.get().strip(),
-                'bill_items': self.bill_items,
-                'deviations': self.deviation_items,
+                'bill_items': list(self.bill_items),
+                'deviations': list(self.deviation_items),
                 'generation_date': datetime.now().strftime('%d/%m/%Y')
             }
             
@@ -442,14 +446,25 @@ class BillDeviationTool:
             
             filename = f"Bill_Deviation_{bill_data['bill_number'].replace('/', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
             
-            if pdf_gen.generate_bill_deviation_report(bill_data, filename):
-                messagebox.showinfo("Success", f"Bill PDF generated: {filename}")
-            else:
-                messagebox.showerror("Error", "Failed to generate bill PDF.")
+            # Generate PDF in the background
+            self.task_panel.run(
+                pdf_gen.generate_bill_deviation_report, bill_data, filename,
+                key=("bill_deviation_pdf", filename),
+                description="Generating PDF",
+                on_done=lambda success: self.pdf_generated(success, filename),
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to generate PDF: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
     
+    def pdf_generated(self, success, filename):
+        """Report a finished background PDF generation"""
+        if success:
+            messagebox.showinfo("Success", f"Bill PDF generated: {filename}")
+        else:
+            messagebox.showerror("Error", "Failed to generate bill PDF.")
+    
     def save_bill(self):
         """Save bill to database"""
         try:
@@ -464,29 +479,73 @@ class BillDeviationTool:
             
             # Save to database
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            bill_number = self.bill_number_entry.get().strip()
+            contractor_name = self.contractor_entry.get().strip()
             
-            success = self.db_manager.execute_query('''
-                INSERT INTO bills (
-                    bill_number, contractor_name, work_description, bill_amount,
-                    date_created, status
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                self.bill_number_entry.get().strip(),
-                self.contractor_entry.get().strip(),
+            deviation_rows = [
+                (
+                    bill_number,
+                    contractor_name,
+                    dev['original_amount'],
+                    dev['revised_amount'],
+                    dev['deviation_amount'],
+                    (dev['deviation_amount'] / dev['original_amount'] * 100) if dev['original_amount'] else 0,
+                    f"{dev['type']}: {dev['description']} - {dev['justification']}",
+                    current_time
+                )
+                for dev in self.deviation_items
+            ]
+            
+            bill_row = (
+                bill_number,
+                contractor_name,
                 self.work_description_entry.get().strip(),
                 final_total,
                 current_time,
                 'Generated'
-            ))
+            )
             
-            if success:
-                messagebox.showinfo("Success", "Bill saved successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to save bill.")
+            self.task_panel.run(
+                self.insert_bill, bill_row, deviation_rows,
+                key=("save_bill", bill_number),
+                description="Saving bill",
+                on_done=self.bill_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save bill: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save bill: {str(e)}")
     
+    def insert_bill(self, bill_row, deviation_rows):
+        """Insert a bill and its deviations; runs in the background
+        
+        Both are saved together or not at all. Returns the number of
+        deviations saved.
+        """
+        with self.db_manager.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO bills (
+                    bill_number, contractor_name, work_description, bill_amount,
+                    date_created, status
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            ''', bill_row)
+            
+            if deviation_rows:
+                cursor.executemany('''
+                    INSERT INTO bill_deviations (
+                        bill_number, contractor_name, original_amount, revised_amount,
+                        deviation_amount, deviation_percentage, reason, date_created
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', deviation_rows)
+        return len(deviation_rows)
+    
+    def bill_saved(self, deviation_count):
+        """Report a finished background save"""
+        messagebox.showinfo(
+            "Success",
+            f"Bill saved successfully with {deviation_count} deviation(s)!"
+        )
+    
     def focus(self):
         """Bring window to focus"""
         self.window.lift()
@@ -10,6 +10,20 @@ from datetime import datetime
 import os
 from pathlib import Path
 from utils.pdf_generator import PDFGenerator
+from gui.task_progress import TaskProgressPanel
+from gui.data_grid import DataGrid
+from utils.indian_numbering import format_inr
+from utils.table_sources import QuerySource
+
+# Columns of the recent bills table
+RECENT_COLUMNS = ['bill_number', 'contractor_name', 'bill_amount', 'date_created', 'status']
+RECENT_HEADINGS = {
+    'bill_number': 'Bill No.',
+    'contractor_name': 'Contractor',
+    'bill_amount': 'Amount',
+    'date_created': 'Date',
+    'status': 'Status'
+}
 
 class BillNoteTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -61,6 +75,9 @@ class BillNoteTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -183,12 +200,18 @@ class BillNoteTool:
         )
         recent_title.pack(pady=(10, 5))
         
-        # Bills list
-        self.bills_listbox = ctk.CTkScrollableFrame(recent_frame, height=150)
-        self.bills_listbox.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Load recent bills
-        self.load_recent_bills()
+        # Bills table (double-click a row to load it)
+        self.bills_grid = DataGrid(
+            recent_frame,
+            QuerySource(self.db_manager, 'bills', RECENT_COLUMNS, include_archives=True),
+            headings=RECENT_HEADINGS,
+            formatters={'bill_amount': format_inr},
+            widths={'contractor_name': 200},
+            height=6,
+            on_activate=self.load_bill_data,
+            empty_text="No bills found. Create your first bill above."
+        )
+        self.bills_grid.pack(fill="both", expand=True, padx=10, pady=5)
     
     def save_bill(self):
         """Save bill to database"""
@@ -213,22 +236,30 @@ class BillNoteTool:
             # Save to database
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            self.task_panel.run(
+                self.db_manager.execute_query, '''
                 INSERT INTO bills (bill_number, contractor_name, work_description, 
                                  bill_amount, date_created, status, remarks)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (bill_number, contractor_name, work_description, bill_amount, 
-                  current_time, 'Active', remarks))
-            
-            if success:
-                messagebox.showinfo("Success", "Bill saved successfully!")
-                self.load_recent_bills()  # Refresh the list
-            else:
-                messagebox.showerror("Error", "Failed to save bill. Bill number might already exist.")
+                  current_time, 'Active', remarks),
+                key=("save_bill", bill_number),
+                description="Saving bill",
+                on_done=self.bill_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save bill: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save bill: {str(e)}")
     
+    def bill_saved(self, success):
+        """Report a finished background save"""
+        if success:
+            messagebox.showinfo("Success", "Bill saved successfully!")
+            self.load_recent_bills()  # Refresh the list
+        else:
+            messagebox.showerror("Error", "Failed to save bill. Bill number might already exist.")
+    
     def generate_pdf(self):
         """Generate PDF for the current bill"""
         try:
@@ -268,19 +299,29 @@ class BillNoteTool:
             )
             
             if file_path:
-                # Generate PDF
-                if self.pdf_generator.create_bill_note_pdf(bill_data, file_path):
-                    messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {file_path}")
-                    
-                    # Ask if user wants to open the file
-                    if messagebox.askyesno("Open File", "Would you like to open the generated PDF?"):
-                        os.startfile(file_path)
-                else:
-                    messagebox.showerror("Error", "Failed to generate PDF.")
+                # Generate PDF in the background
+                self.task_panel.run(
+                    self.pdf_generator.create_bill_note_pdf, bill_data, file_path,
+                    key=("bill_pdf", file_path),
+                    description="Generating PDF",
+                    on_done=lambda success: self.pdf_generated(success, file_path),
+                    on_error=lambda error: messagebox.showerror("Error", f"Failed to generate PDF: {error}")
+                )
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
     
+    def pdf_generated(self, success, file_path):
+        """Report a finished background PDF generation"""
+        if success:
+            messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {file_path}")
+            
+            # Ask if user wants to open the file
+            if messagebox.askyesno("Open File", "Would you like to open the generated PDF?"):
+                os.startfile(file_path)
+        else:
+            messagebox.showerror("Error", "Failed to generate PDF.")
+    
     def clear_form(self):
         """Clear all form fields"""
         self.bill_number_entry.delete(0, "end")
@@ -290,64 +331,21 @@ class BillNoteTool:
         self.remarks_entry.delete(0, "end")
     
     def load_recent_bills(self):
-        """Load and display recent bills"""
-        try:
-            # Clear existing items
-            for widget in self.bills_listbox.winfo_children():
-                widget.destroy()
-            
-            # Fetch recent bills
-            bills = self.db_manager.fetch_all('''
-                SELECT bill_number, contractor_name, bill_amount, date_created, status
-                FROM bills 
-                ORDER BY date_created DESC 
-                LIMIT 10
-            ''')
-            
-            if bills:
-                for bill in bills:
-                    bill_frame = ctk.CTkFrame(self.bills_listbox)
-                    bill_frame.pack(fill="x", padx=5, pady=2)
-                    
-                    # Bill info
-                    info_text = f"Bill: {bill[0]} | Contractor: {bill[1]} | Amount: ₹{bill[2]:,.2f} | Date: {bill[3]}"
-                    info_label = ctk.CTkLabel(
-                        bill_frame,
-                        text=info_text,
-                        font=ctk.CTkFont(size=11)
-                    )
-                    info_label.pack(side="left", padx=10, pady=5)
-                    
-                    # Load button
-                    load_btn = ctk.CTkButton(
-                        bill_frame,
-                        text="Load",
-                        command=lambda b=bill: self.load_bill_data(b),
-                        width=60,
-                        height=25
-                    )
-                    load_btn.pack(side="right", padx=10, pady=5)
-            else:
-                no_bills_label = ctk.CTkLabel(
-                    self.bills_listbox,
-                    text="No bills found. Create your first bill above.",
-                    font=ctk.CTkFont(size=12),
-                    text_color="#666666"
-                )
-                no_bills_label.pack(pady=20)
-                
-        except Exception as e:
-            print(f"Error loading recent bills: {e}")
+        """Reload the recent bills table"""
+        self.bills_grid.reload()
     
     def load_bill_data(self, bill_tuple):
         """Load bill data into form"""
         try:
-            # Get full bill data
-            bill_data = self.db_manager.fetch_one('''
-                SELECT bill_number, contractor_name, work_description, bill_amount, remarks
-                FROM bills 
-                WHERE bill_number = ?
-            ''', (bill_tuple[0],))
+            # Get full bill data (the bill may be in an archived year)
+            rows = self.db_manager.fetch_with_archives(
+                'bills',
+                ['bill_number', 'contractor_name', 'work_description', 'bill_amount', 'remarks'],
+                where="bill_number = ?",
+                params=(bill_tuple[0],),
+                limit=1
+            )
+            bill_data = rows[0] if rows else None
             
             if bill_data:
                 # Clear form first
@@ -10,6 +10,20 @@ from datetime import datetime
 import os
 from pathlib import Path
 from utils.pdf_generator import PDFGenerator
+from gui.task_progress import TaskProgressPanel
+from gui.data_grid import DataGrid
+from utils.indian_numbering import format_inr
+from utils.table_sources import QuerySource
+
+# Columns of the recent calculations table
+RECENT_COLUMNS = ['bill_number', 'contractor_name', 'gross_amount', 'net_amount', 'date_created']
+RECENT_HEADINGS = {
+    'bill_number': 'Bill No.',
+    'contractor_name': 'Contractor',
+    'gross_amount': 'Gross',
+    'net_amount': 'Net',
+    'date_created': 'Date'
+}
 
 class DeductionsTableTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -61,6 +75,9 @@ class DeductionsTableTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -232,12 +249,18 @@ class DeductionsTableTool:
         )
         recent_title.pack(pady=(10, 5))
         
-        # Calculations list
-        self.calculations_listbox = ctk.CTkScrollableFrame(recent_frame, height=150)
-        self.calculations_listbox.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Load recent calculations
-        self.load_recent_calculations()
+        # Calculations table (double-click a row to load it)
+        self.calculations_grid = DataGrid(
+            recent_frame,
+            QuerySource(self.db_manager, 'deductions', RECENT_COLUMNS, include_archives=True),
+            headings=RECENT_HEADINGS,
+            formatters={'gross_amount': format_inr, 'net_amount': format_inr},
+            widths={'contractor_name': 200},
+            height=6,
+            on_activate=self.load_calculation_data,
+            empty_text="No deduction calculations found. Create your first calculation above."
+        )
+        self.calculations_grid.pack(fill="both", expand=True, padx=10, pady=5)
     
     def calculate_deductions(self):
         """Calculate all deductions for the bill"""
@@ -333,12 +356,13 @@ Calculated on: {result['date_calculated']}"""
             result = self.calculation_result
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            self.task_panel.run(
+                self.db_manager.execute_many, '''
                 INSERT INTO deductions (
                     bill_number, contractor_name, gross_amount, tds_amount,
                     security_deduction, other_deductions, net_amount, date_created
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            ''', [(
                 result['bill_number'],
                 result['contractor_name'],
                 result['gross_amount'],
@@ -347,17 +371,24 @@ Calculated on: {result['date_calculated']}"""
                 result['other_deductions'],
                 result['net_amount'],
                 current_time
-            ))
-            
-            if success:
-                messagebox.showinfo("Success", "Deduction calculation saved successfully!")
-                self.load_recent_calculations()  # Refresh the list
-            else:
-                messagebox.showerror("Error", "Failed to save calculation.")
+            )],
+                key=("save_deductions", result['bill_number']),
+                description="Saving calculation",
+                on_done=self.calculation_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save calculation: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save calculation: {str(e)}")
     
+    def calculation_saved(self, save_result):
+        """Report a finished background save"""
+        if not save_result['errors']:
+            messagebox.showinfo("Success", "Deduction calculation saved successfully!")
+            self.load_recent_calculations()  # Refresh the list
+        else:
+            messagebox.showerror("Error", f"Failed to save calculation: {save_result['errors'][0][1]}")
+    
     def generate_pdf(self):
         """Generate PDF for deduction calculation"""
         if not hasattr(self, 'calculation_result'):
@@ -374,19 +405,29 @@ Calculated on: {result['date_calculated']}"""
             )
             
             if file_path:
-                # Generate PDF
-                if self.pdf_generator.generate_deductions_table_pdf(file_path, self.calculation_result):
-                    messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {file_path}")
-                    
-                    # Ask if user wants to open the file
-                    if messagebox.askyesno("Open File", "Would you like to open the generated PDF?"):
-                        os.startfile(file_path)
-                else:
-                    messagebox.showerror("Error", "Failed to generate PDF.")
+                # Generate PDF in the background
+                self.task_panel.run(
+                    self.pdf_generator.generate_deductions_table_pdf, file_path, self.calculation_result,
+                    key=("deductions_pdf", file_path),
+                    description="Generating PDF",
+                    on_done=lambda success: self.pdf_generated(success, file_path),
+                    on_error=lambda error: messagebox.showerror("Error", f"Failed to generate PDF: {error}")
+                )
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
     
+    def pdf_generated(self, success, file_path):
+        """Report a finished background PDF generation"""
+        if success:
+            messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {file_path}")
+            
+            # Ask if user wants to open the file
+            if messagebox.askyesno("Open File", "Would you like to open the generated PDF?"):
+                os.startfile(file_path)
+        else:
+            messagebox.showerror("Error", "Failed to generate PDF.")
+    
     def clear_form(self):
         """Clear all form fields"""
         self.bill_number_entry.delete(0, "end")
@@ -409,66 +450,22 @@ Calculated on: {result['date_calculated']}"""
             delattr(self, 'calculation_result')
     
     def load_recent_calculations(self):
-        """Load and display recent deduction calculations"""
-        try:
-            # Clear existing items
-            for widget in self.calculations_listbox.winfo_children():
-                widget.destroy()
-            
-            # Fetch recent calculations
-            calculations = self.db_manager.fetch_all('''
-                SELECT bill_number, contractor_name, gross_amount, net_amount, 
-                       total_deductions, date_created
-                FROM deductions 
-                ORDER BY date_created DESC 
-                LIMIT 10
-            ''')
-            
-            if calculations:
-                for calc in calculations:
-                    calc_frame = ctk.CTkFrame(self.calculations_listbox)
-                    calc_frame.pack(fill="x", padx=5, pady=2)
-                    
-                    # Calculation info
-                    info_text = f"Bill: {calc[0]} | Contractor: {calc[1]} | Gross: ₹{calc[2]:,.2f} | Net: ₹{calc[4]:,.2f}"
-                    info_label = ctk.CTkLabel(
-                        calc_frame,
-                        text=info_text,
-                        font=ctk.CTkFont(size=11)
-                    )
-                    info_label.pack(side="left", padx=10, pady=5)
-                    
-                    # Load button
-                    load_btn = ctk.CTkButton(
-                        calc_frame,
-                        text="Load",
-                        command=lambda c=calc: self.load_calculation_data(c),
-                        width=60,
-                        height=25
-                    )
-                    load_btn.pack(side="right", padx=10, pady=5)
-            else:
-                no_calcs_label = ctk.CTkLabel(
-                    self.calculations_listbox,
-                    text="No deduction calculations found. Create your first calculation above.",
-                    font=ctk.CTkFont(size=12),
-                    text_color="#666666"
-                )
-                no_calcs_label.pack(pady=20)
-                
-        except Exception as e:
-            print(f"Error loading recent calculations: {e}")
+        """Reload the recent calculations table"""
+        self.calculations_grid.reload()
     
     def load_calculation_data(self, calc_tuple):
         """Load calculation data into form"""
         try:
-            # Get full calculation data
-            calc_data = self.db_manager.fetch_one('''
-                SELECT bill_number, contractor_name, gross_amount, tds_amount,
-                       security_deduction, other_deductions, work_description
-                FROM deductions 
-                WHERE bill_number = ?
-            ''', (calc_tuple[0],))
+            # Get full calculation data (it may be in an archived year)
+            rows = self.db_manager.fetch_with_archives(
+                'deductions',
+                ['bill_number', 'contractor_name', 'gross_amount', 'tds_amount',
+                 'security_deduction', 'other_deductions', 'work_description'],
+                where="bill_number = ?",
+                params=(calc_tuple[0],),
+                limit=1
+            )
+            calc_data = rows[0] if rows else None
             
             if calc_data:
                 # Clear form first
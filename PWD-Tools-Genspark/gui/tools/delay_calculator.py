@@ -8,12 +8,23 @@ import tkinter as tk
 from tkinter import messagebox, filedialog
 from datetime import datetime, timedelta
 import calendar
+import re
+
+from utils.delay_engine import (
+    DEFAULT_PENALTY_CAP_PERCENT, REGISTER_COLUMNS, compute_work_delay, delay_remarks,
+    process_works_register, summarize_delays
+)
+from utils.hindrance_engine import parse_hindrance_text
+from utils.indian_numbering import format_inr
+from utils.template_engine import TemplateEngine
+from gui.task_progress import TaskProgressPanel
 
 class DelayCalculatorTool:
     def __init__(self, db_manager, settings, parent=None):
         """Initialize Delay Calculator tool window"""
         self.db_manager = db_manager
         self.settings = settings
+        self.template_engine = TemplateEngine(settings)
         
         # Create tool window
         if parent is not None:
@@ -58,6 +69,9 @@ class DelayCalculatorTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -145,6 +159,19 @@ class DelayCalculatorTool:
         self.penalty_rate_entry.insert(0, "0.05")
         self.penalty_rate_entry.grid(row=7, column=1, padx=10, pady=5, sticky="ew")
         
+        # Hindrance periods, one per line
+        ctk.CTkLabel(fields_frame, text="Hindrance Periods:", font=ctk.CTkFont(weight="bold")).grid(
+            row=8, column=0, padx=10, pady=5, sticky="nw"
+        )
+        self.hindrances_text = ctk.CTkTextbox(fields_frame, width=300, height=70)
+        self.hindrances_text.grid(row=8, column=1, padx=10, pady=5, sticky="ew")
+        ctk.CTkLabel(
+            fields_frame,
+            text="One per line: YYYY-MM-DD to YYYY-MM-DD (overlaps are merged)",
+            font=ctk.CTkFont(size=11),
+            text_color="#666666"
+        ).grid(row=9, column=1, padx=10, sticky="w")
+        
         # Calculate button
         calc_btn = ctk.CTkButton(
             fields_frame,
@@ -153,7 +180,7 @@ class DelayCalculatorTool:
             width=200,
             height=35
         )
-        calc_btn.grid(row=8, column=0, columnspan=2, pady=15)
+        calc_btn.grid(row=10, column=0, columnspan=2, pady=15)
         
         # Configure grid weights
         fields_frame.grid_columnconfigure(1, weight=1)
@@ -205,6 +232,27 @@ class DelayCalculatorTool:
         )
         self.save_btn.pack(side="left", padx=5)
         
+        # Export report button
+        self.export_btn = ctk.CTkButton(
+            btn_container,
+            text="📄 Export Report",
+            command=self.export_report,
+            width=150,
+            height=35,
+            state="disabled"
+        )
+        self.export_btn.pack(side="left", padx=5)
+        
+        # Works register button
+        register_btn = ctk.CTkButton(
+            btn_container,
+            text="📊 Works Register",
+            command=self.process_register,
+            width=150,
+            height=35
+        )
+        register_btn.pack(side="left", padx=5)
+        
         # Clear form button
         clear_btn = ctk.CTkButton(
             btn_container,
@@ -258,47 +306,36 @@ class DelayCalculatorTool:
                 messagebox.showerror("Validation Error", "Please enter valid amounts.")
                 return
             
-            # Calculate delays
-            current_date = datetime.now()
-            
-            # Start delay
-            start_delay_days = 0
-            if actual_start:
-                start_delay_days = max(0, (actual_start - planned_start).days)
+            # Parse hindrance periods
+            hindrances, bad_lines = parse_hindrance_text(self.hindrances_text.get("1.0", "end"), "%Y-%m-%d")
+            if bad_lines:
+                messagebox.showerror(
+                    "Validation Error",
+                    "Invalid hindrance periods (use YYYY-MM-DD to YYYY-MM-DD):\n" + "\n".join(bad_lines)
+                )
+                return
             
-            # Completion delay
-            completion_delay_days = 0
-            if actual_completion:
-                # Project completed
-                completion_delay_days = max(0, (actual_completion - planned_completion).days)
-                project_status = "Completed"
+            # Calculate delays and penalty
+            delay = compute_work_delay(
+                planned_start, planned_completion, contract_amount, penalty_rate,
+                actual_start=actual_start, actual_completion=actual_completion,
+                penalty_cap_percent=self.penalty_cap_percent(),
+                hindrances=hindrances
+            )
+            start_delay_days = delay['start_delay_days']
+            completion_delay_days = delay['completion_delay_days']
+            total_delay_days = delay['total_delay_days']
+            penalty_amount = delay['penalty_amount']
+            planned_duration = delay['planned_duration']
+            actual_duration = delay['actual_duration']
+            project_status = delay['project_status']
+            if project_status == "Completed":
                 status_color = "#10B981" if completion_delay_days == 0 else "#EF4444"
             else:
-                # Project ongoing
-                completion_delay_days = max(0, (current_date - planned_completion).days)
-                project_status = "Ongoing"
                 status_color = "#F59E0B" if completion_delay_days > 0 else "#10B981"
             
-            # Total delay
-            total_delay_days = start_delay_days + completion_delay_days
-            
-            # Calculate penalties
-            penalty_amount = 0
-            if completion_delay_days > 0:
-                daily_penalty = (contract_amount * penalty_rate) / 100
-                penalty_amount = daily_penalty * completion_delay_days
-            
-            # Calculate project duration
-            planned_duration = (planned_completion - planned_start).days
-            if actual_start and actual_completion:
-                actual_duration = (actual_completion - actual_start).days
-            elif actual_start:
-                actual_duration = (current_date - actual_start).days
-            else:
-                actual_duration = 0
-            
             # Display results
-            self.display_delay_results({
+            self.current_report = {
                 'project_name': project_name,
                 'contractor_name': contractor_name,
                 'planned_start': planned_start,
@@ -311,11 +348,21 @@ class DelayCalculatorTool:
                 'completion_delay_days': completion_delay_days,
                 'total_delay_days': total_delay_days,
                 'penalty_amount': penalty_amount,
+                'penalty_capped': delay['penalty_capped'],
+                'hindrance_count': len(hindrances),
+                'hindrance_days': delay['hindrance_days'],
+                'net_delay_days': delay['net_delay_days'],
+                'se_approval': delay['se_approval'],
+                'extension_authority': (
+                    ("Superintending Engineer" if delay['se_approval'] else "This office")
+                    if completion_delay_days > 0 else "Not required"
+                ),
                 'project_status': project_status,
                 'status_color': status_color,
                 'planned_duration': planned_duration,
                 'actual_duration': actual_duration
-            })
+            }
+            self.display_delay_results(self.current_report)
             
             # Store calculation data
             self.current_calculation = {
@@ -327,11 +374,14 @@ class DelayCalculatorTool:
                 'actual_completion_date': actual_completion_str,
                 'delay_days': total_delay_days,
                 'penalty_amount': penalty_amount,
-                'delay_reason': f"Start delay: {start_delay_days} days, Completion delay: {completion_delay_days} days"
+                'delay_reason': delay_remarks(
+                    start_delay_days, completion_delay_days, delay['hindrance_days'], delay['net_delay_days']
+                )
             }
             
-            # Enable save button
+            # Enable save and export buttons
             self.save_btn.configure(state="normal")
+            self.export_btn.configure(state="normal")
             
         except Exception as e:
             messagebox.showerror("Calculation Error", f"Failed to calculate delay: {str(e)}")
@@ -386,6 +436,13 @@ class DelayCalculatorTool:
             ("Total Delay", f"{data['total_delay_days']} days"),
             ("Project Status", data['project_status'])
         ]
+        if data['hindrance_days']:
+            delay_info[3:3] = [
+                ("Hindrance", f"{data['hindrance_days']} days"),
+                ("Net Delay", f"{data['net_delay_days']} days")
+            ]
+        if data['completion_delay_days'] > 0:
+            delay_info.append(("Time Extension", data['extension_authority']))
         
         for label, value in delay_info:
             delay_detail_frame = ctk.CTkFrame(delay_frame)
@@ -396,6 +453,8 @@ class DelayCalculatorTool:
             color = "#EF4444" if "delay" in label.lower() and int(value.split()[0]) > 0 else "#10B981"
             if label == "Project Status":
                 color = data['status_color']
+            elif label == "Time Extension":
+                color = "#F59E0B" if data['se_approval'] else "#10B981"
             
             ctk.CTkLabel(delay_detail_frame, text=value, text_color=color).pack(side="right", padx=10, pady=3)
         
@@ -410,8 +469,10 @@ class DelayCalculatorTool:
             penalty_details.pack(fill="x", padx=10, pady=5)
             
             ctk.CTkLabel(penalty_details, text=f"Penalty Rate: {data['penalty_rate']}% per day").pack(anchor="w", padx=10, pady=2)
-            ctk.CTkLabel(penalty_details, text=f"Delay Days: {data['completion_delay_days']} days").pack(anchor="w", padx=10, pady=2)
+            ctk.CTkLabel(penalty_details, text=f"Delay Days: {data['net_delay_days']} days").pack(anchor="w", padx=10, pady=2)
             ctk.CTkLabel(penalty_details, text=f"Daily Penalty: ₹ {(data['contract_amount'] * data['penalty_rate']) / 100:,.2f}").pack(anchor="w", padx=10, pady=2)
+            if data.get('penalty_capped'):
+                ctk.CTkLabel(penalty_details, text=f"Capped at {self.penalty_cap_percent()}% of contract amount", text_color="#F59E0B").pack(anchor="w", padx=10, pady=2)
             
             # Total penalty (highlighted)
             penalty_total_frame = ctk.CTkFrame(penalty_frame)
@@ -436,7 +497,8 @@ class DelayCalculatorTool:
             calc = self.current_calculation
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            self.task_panel.run(
+                self.db_manager.execute_query, '''
                 INSERT INTO delay_records (
                     project_name, contractor_name, planned_start_date, actual_start_date,
                     planned_completion_date, actual_completion_date, delay_days, 
@@ -446,16 +508,113 @@ class DelayCalculatorTool:
                 calc['project_name'], calc['contractor_name'], calc['planned_start_date'],
                 calc['actual_start_date'], calc['planned_completion_date'], calc['actual_completion_date'],
                 calc['delay_days'], calc['delay_reason'], calc['penalty_amount'], current_time
-            ))
-            
-            if success:
-                messagebox.showinfo("Success", "Delay record saved successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to save delay record.")
+            ),
+                key=("save_delay_record", calc['project_name'], calc['contractor_name']),
+                description="Saving delay record",
+                on_done=self.record_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save delay record: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save delay record: {str(e)}")
     
+    def record_saved(self, success):
+        """Report a finished background save"""
+        if success:
+            messagebox.showinfo("Success", "Delay record saved successfully!")
+        else:
+            messagebox.showerror("Error", "Failed to save delay record.")
+    
+    def export_report(self):
+        """Export the delay analysis as a printable HTML report"""
+        if not hasattr(self, 'current_report'):
+            messagebox.showerror("Error", "Please calculate delay first.")
+            return
+        
+        project_name = self.current_report['project_name']
+        filename = filedialog.asksaveasfilename(
+            title="Export Delay Report",
+            defaultextension=".html",
+            initialdir="exports",
+            initialfile=f"delay_report_{re.sub(r'[^a-zA-Z0-9._-]', '_', project_name)[:50]}.html",
+            filetypes=[("HTML files", "*.html"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(self.template_engine.render('delay_report', self.current_report))
+            messagebox.showinfo("Success", f"Delay report exported to:\n{filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export delay report: {str(e)}")
+    
+    def penalty_cap_percent(self):
+        """Liquidated damages cap from settings (% of contract amount)"""
+        return self.settings.get('calculation_defaults.penalty_cap_percent', DEFAULT_PENALTY_CAP_PERCENT)
+    
+    def process_register(self):
+        """Compute and save delays for every work in a works register sheet"""
+        file_path = filedialog.askopenfilename(
+            title="Select Works Register",
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        self.task_panel.run(
+            process_works_register, file_path, self.db_manager,
+            penalty_cap_percent=self.penalty_cap_percent(),
+            key=("works_register", file_path),
+            description="Processing works register",
+            on_done=self.register_processed,
+            on_error=lambda error: messagebox.showerror("Error", f"Failed to process works register: {error}")
+        )
+    
+    def register_processed(self, outcome):
+        """Report a finished works register run and offer to export the results"""
+        results = outcome['results']
+        if results is None:
+            messagebox.showerror(
+                "Invalid File Format",
+                f"{outcome['message']}\n\nExpected columns: {', '.join(REGISTER_COLUMNS.values())}"
+            )
+            return
+        
+        summary = summarize_delays(results)
+        saved = outcome['saved']
+        lines = [
+            f"Works processed: {summary['works']}",
+            f"Delayed: {summary['delayed']} (ongoing: {summary['ongoing']})",
+            f"With hindrances: {summary['hindered']}",
+            f"Time extension by SE: {summary['se_approval']}",
+            f"Penalty capped: {summary['capped']}",
+            f"Total penalty: {format_inr(summary['total_penalty'])}",
+            f"Saved to database: {saved['succeeded']}",
+        ]
+        if summary['invalid']:
+            lines.append(f"Skipped (missing dates or amount): {summary['invalid']}")
+        if saved['errors']:
+            lines.append(f"Failed to save: {len(saved['errors'])}")
+        
+        if not messagebox.askyesno("Works Register", "\n".join(lines) + "\n\nExport the results to Excel?"):
+            return
+        filename = filedialog.asksaveasfilename(
+            title="Export Delay Results",
+            defaultextension=".xlsx",
+            initialdir="exports",
+            initialfile="delay_register_results.xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if filename:
+            self.task_panel.run(
+                results.to_excel, filename, index=False,
+                key=("export_register", filename),
+                description="Exporting delay results",
+                on_done=lambda _: messagebox.showinfo("Success", f"Delay results exported to:\n{filename}"),
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to export delay results: {error}")
+            )
+    
     def clear_form(self):
         """Clear all form fields"""
         self.project_name_entry.delete(0, "end")
@@ -467,6 +626,7 @@ class DelayCalculatorTool:
         self.contract_amount_entry.delete(0, "end")
         self.penalty_rate_entry.delete(0, "end")
         self.penalty_rate_entry.insert(0, "0.05")
+        self.hindrances_text.delete("1.0", "end")
         
         # Clear results
         for widget in self.results_display.winfo_children():
@@ -480,12 +640,15 @@ class DelayCalculatorTool:
         )
         self.no_calc_label.pack(pady=40)
         
-        # Disable save button
+        # Disable save and export buttons
         self.save_btn.configure(state="disabled")
+        self.export_btn.configure(state="disabled")
         
         # Clear calculation data
         if hasattr(self, 'current_calculation'):
             delattr(self, 'current_calculation')
+        if hasattr(self, 'current_report'):
+            delattr(self, 'current_report')
     
     def focus(self):
         """Bring window to focus"""
@@ -10,6 +10,21 @@ from datetime import datetime, timedelta
 import os
 from pathlib import Path
 from utils.pdf_generator import PDFGenerator
+from gui.task_progress import TaskProgressPanel
+from gui.data_grid import DataGrid
+from utils.indian_numbering import format_inr
+from utils.table_sources import QuerySource
+
+# Columns of the recent records table
+RECENT_COLUMNS = ['tender_number', 'contractor_name', 'emd_amount', 'refund_amount', 'refund_status', 'date_created']
+RECENT_HEADINGS = {
+    'tender_number': 'Tender No.',
+    'contractor_name': 'Contractor',
+    'emd_amount': 'EMD',
+    'refund_amount': 'Refund',
+    'refund_status': 'Status',
+    'date_created': 'Date'
+}
 
 class EMDRefundTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -61,6 +76,9 @@ class EMDRefundTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -233,12 +251,17 @@ class EMDRefundTool:
         )
         recent_title.pack(pady=(10, 5))
         
-        # Records list
-        self.records_listbox = ctk.CTkScrollableFrame(recent_frame, height=120)
-        self.records_listbox.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Load recent records
-        self.load_recent_records()
+        # Records table
+        self.records_grid = DataGrid(
+            recent_frame,
+            QuerySource(self.db_manager, 'emd_records', RECENT_COLUMNS, include_archives=True),
+            headings=RECENT_HEADINGS,
+            formatters={'emd_amount': format_inr, 'refund_amount': format_inr},
+            widths={'contractor_name': 180, 'refund_status': 200},
+            height=5,
+            empty_text="No EMD records found. Calculate and save your first EMD refund above."
+        )
+        self.records_grid.pack(fill="both", expand=True, padx=10, pady=5)
     
     def calculate_refund(self):
         """Calculate EMD refund based on validity and rules"""
@@ -377,7 +400,8 @@ class EMDRefundTool:
             calc = self.current_calculation
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            self.task_panel.run(
+                self.db_manager.execute_query, '''
                 INSERT INTO emd_records (
                     tender_number, contractor_name, emd_amount, bank_name,
                     guarantee_number, validity_date, refund_status, refund_amount, date_created
@@ -386,17 +410,24 @@ class EMDRefundTool:
                 calc['tender_number'], calc['contractor_name'], calc['emd_amount'],
                 calc['bank_name'], calc['guarantee_number'], calc['validity_date'],
                 calc['refund_status'], calc['refund_amount'], current_time
-            ))
-            
-            if success:
-                messagebox.showinfo("Success", "EMD record saved successfully!")
-                self.load_recent_records()  # Refresh the list
-            else:
-                messagebox.showerror("Error", "Failed to save EMD record.")
+            ),
+                key=("save_emd_record", calc['tender_number'], calc['contractor_name']),
+                description="Saving EMD record",
+                on_done=self.record_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save EMD record: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save EMD record: {str(e)}")
     
+    def record_saved(self, success):
+        """Report a finished background save"""
+        if success:
+            messagebox.showinfo("Success", "EMD record saved successfully!")
+            self.load_recent_records()  # Refresh the list
+        else:
+            messagebox.showerror("Error", "Failed to save EMD record.")
+    
     def generate_pdf(self):
         """Generate PDF for EMD refund"""
         if not hasattr(self, 'current_calculation'):
@@ -415,19 +446,29 @@ class EMDRefundTool:
             )
             
             if file_path:
-                # Generate PDF
-                if self.pdf_generator.create_emd_refund_pdf(calc, file_path):
-                    messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {file_path}")
-                    
-                    # Ask if user wants to open the file
-                    if messagebox.askyesno("Open File", "Would you like to open the generated PDF?"):
-                        os.startfile(file_path)
-                else:
-                    messagebox.showerror("Error", "Failed to generate PDF.")
+                # Generate PDF in the background
+                self.task_panel.run(
+                    self.pdf_generator.generate_emd_refund_pdf, file_path, calc,
+                    key=("emd_refund_pdf", file_path),
+                    description="Generating PDF",
+                    on_done=lambda success: self.pdf_generated(success, file_path),
+                    on_error=lambda error: messagebox.showerror("Error", f"Failed to generate PDF: {error}")
+                )
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
     
+    def pdf_generated(self, success, file_path):
+        """Report a finished background PDF generation"""
+        if success:
+            messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {file_path}")
+            
+            # Ask if user wants to open the file
+            if messagebox.askyesno("Open File", "Would you like to open the generated PDF?"):
+                os.startfile(file_path)
+        else:
+            messagebox.showerror("Error", "Failed to generate PDF.")
+    
     def clear_form(self):
         """Clear all form fields"""
         self.tender_number_entry.delete(0, "end")
@@ -458,54 +499,8 @@ class EMDRefundTool:
             delattr(self, 'current_calculation')
     
     def load_recent_records(self):
-        """Load and display recent EMD records"""
-        try:
-            # Clear existing items
-            for widget in self.records_listbox.winfo_children():
-                widget.destroy()
-            
-            # Fetch recent records
-            records = self.db_manager.fetch_all('''
-                SELECT tender_number, contractor_name, emd_amount, refund_amount, refund_status, date_created
-                FROM emd_records 
-                ORDER BY date_created DESC 
-                LIMIT 10
-            ''')
-            
-            if records:
-                for record in records:
-                    record_frame = ctk.CTkFrame(self.records_listbox)
-                    record_frame.pack(fill="x", padx=5, pady=2)
-                    
-                    # Record info
-                    info_text = f"Tender: {record[0]} | Contractor: {record[1]} | EMD: ₹{record[2]:,.2f} | Refund: ₹{record[3]:,.2f}"
-                    info_label = ctk.CTkLabel(
-                        record_frame,
-                        text=info_text,
-                        font=ctk.CTkFont(size=11)
-                    )
-                    info_label.pack(side="left", padx=10, pady=5)
-                    
-                    # Status
-                    status_color = "#10B981" if "Full Refund" in record[4] else "#F59E0B" if "penalty" in record[4] else "#EF4444"
-                    status_label = ctk.CTkLabel(
-                        record_frame,
-                        text=record[4][:30] + "..." if len(record[4]) > 30 else record[4],
-                        font=ctk.CTkFont(size=10),
-                        text_color=status_color
-                    )
-                    status_label.pack(side="right", padx=10, pady=5)
-            else:
-                no_records_label = ctk.CTkLabel(
-                    self.records_listbox,
-                    text="No EMD records found. Calculate and save your first EMD refund above.",
-                    font=ctk.CTkFont(size=12),
-                    text_color="#666666"
-                )
-                no_records_label.pack(pady=20)
-                
-        except Exception as e:
-            print(f"Error loading recent records: {e}")
+        """Reload the recent records table"""
+        self.records_grid.reload()
     
     def focus(self):
         """Bring window to focus"""
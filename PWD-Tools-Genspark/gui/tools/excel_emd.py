@@ -11,7 +11,34 @@ from datetime import datetime
 import os
 from pathlib import Path
 from utils.pdf_generator import PDFGenerator
+from utils.delay_engine import to_dates
 from utils.excel_handler import ExcelHandler
+from utils.indian_numbering import amounts_to_words, format_inr
+from utils.receipt_engine import ReceiptGenerationEngine, batch_chunks
+from utils.receipt_manifest import ReceiptManifest, assign_receipt_numbers, source_key
+from utils.receipt_renderer import template_signature
+from utils.template_engine import TemplateEngine
+from gui.task_progress import TaskProgressPanel
+from gui.data_grid import DataGrid
+from utils.table_sources import DataFrameSource
+
+# Rows read per step while loading an Excel file
+EXCEL_CHUNK_ROWS = 2000
+REQUIRED_COLUMNS = ['Payee Name', 'Amount', 'Work Description']
+COLUMN_DTYPES = {'Amount': 'float64'}
+# Optional column with the receipt date; rows without one are dated when first generated
+DATE_COLUMN = 'Date'
+# Receipt output choices -> receipts per page of a single batch PDF (None = one file each)
+OUTPUT_MODES = {
+    'Single PDF': 1,
+    'Single PDF (2 per page)': 2,
+    'Single PDF (4 per page)': 4,
+    'Separate PDF per receipt': None
+}
+BATCH_PDF_NAME = "emd_receipts.pdf"
+BATCH_INDEX_NAME = "emd_receipts_index.csv"
+BATCH_HTML_NAME = "emd_receipts.html"
+PROGRESS_POLL_MS = 100
 
 class ExcelEMDTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -20,6 +47,7 @@ class ExcelEMDTool:
         self.settings = settings
         self.pdf_generator = PDFGenerator(settings)
         self.excel_handler = ExcelHandler()
+        self.template_engine = TemplateEngine(settings)
         
         # Create tool window
         if parent is not None:
@@ -31,7 +59,9 @@ class ExcelEMDTool:
         
         # Data storage
         self.loaded_data = None
+        self.loading_chunks = None
         self.processed_receipts = []
+        self.receipt_engine = None
     
     def setup_window(self):
         """Configure tool window"""
@@ -68,6 +98,9 @@ class ExcelEMDTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of database saves running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -140,11 +173,18 @@ class ExcelEMDTool:
         )
         preview_title.pack(pady=(10, 5))
         
-        # Preview text widget (initially hidden)
-        self.preview_text = ctk.CTkTextbox(
+        # Preview status and table (initially hidden)
+        self.preview_status = ctk.CTkLabel(
             self.preview_frame,
-            height=200,
-            state="disabled"
+            text="",
+            font=ctk.CTkFont(size=12)
+        )
+        self.preview_grid = DataGrid(
+            self.preview_frame,
+            DataFrameSource(pd.DataFrame(columns=REQUIRED_COLUMNS)),
+            formatters={'Amount': format_inr},
+            widths={'Payee Name': 180, 'Work Description': 300},
+            height=8
         )
         
         # No data message
@@ -158,7 +198,7 @@ class ExcelEMDTool:
     
     def create_processing_section(self, parent):
         """Create processing controls section"""
-        self.processing_frame = ctk.CTkFrame(parent, height=100)
+        self.processing_frame = ctk.CTkFrame(parent, height=140)
         self.processing_frame.pack(fill="x", padx=10, pady=5)
         self.processing_frame.pack_propagate(False)
         
@@ -191,6 +231,43 @@ class ExcelEMDTool:
             width=200
         )
         self.preview_btn.pack(side="left", padx=5)
+        
+        self.output_mode_var = tk.StringVar(value='Single PDF')
+        self.output_mode_menu = ctk.CTkOptionMenu(
+            button_frame,
+            values=list(OUTPUT_MODES),
+            variable=self.output_mode_var,
+            width=200
+        )
+        self.output_mode_menu.pack(side="left", padx=5)
+        
+        self.cancel_btn = ctk.CTkButton(
+            button_frame,
+            text="Cancel",
+            command=self.cancel_processing,
+            state="disabled",
+            width=100,
+            fg_color="#DC2626",
+            hover_color="#B91C1C"
+        )
+        self.cancel_btn.pack(side="left", padx=5)
+        
+        # Progress of the running generation
+        progress_frame = ctk.CTkFrame(self.processing_frame, fg_color="transparent")
+        progress_frame.pack(fill="x", padx=20)
+        
+        self.progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        
+        self.progress_label = ctk.CTkLabel(
+            progress_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="#666666",
+            width=160
+        )
+        self.progress_label.pack(side="left")
     
     def create_results_section(self, parent):
         """Create results section"""
@@ -233,6 +310,14 @@ class ExcelEMDTool:
             width=150
         )
         self.save_to_db_btn.pack(side="left", padx=5)
+        
+        self.export_html_btn = ctk.CTkButton(
+            self.export_frame,
+            text="Export HTML",
+            command=self.export_receipts_html,
+            width=150
+        )
+        self.export_html_btn.pack(side="left", padx=5)
     
     def browse_file(self):
         """Browse and select Excel file"""
@@ -249,59 +334,118 @@ class ExcelEMDTool:
             self.load_excel_data(file_path)
     
     def load_excel_data(self, file_path):
-        """Load and validate Excel data"""
+        """Load and validate Excel data
+        
+        A file parsed before is loaded from the parse cache. Otherwise the
+        sheet is streamed in chunks; the preview appears after the first
+        chunk and the rest is read between Tk events so the window stays
+        responsive on large files.
+        """
         try:
-            # Load Excel file
-            df = pd.read_excel(file_path)
+            self.loaded_data = None
+            self.loading_chunks = None
+            self.process_btn.configure(state="disabled")
+            self.preview_btn.configure(state="disabled")
             
-            # Validate required columns
-            required_columns = ['Payee Name', 'Amount', 'Work Description']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            cached = self.excel_handler.cache.get(file_path, dtypes=COLUMN_DTYPES)
+            if cached is not None and all(col in cached.columns for col in REQUIRED_COLUMNS):
+                self.finish_loading([cached])
+                return
             
-            if missing_columns:
+            # Validate required columns from the header row only
+            valid, message, reader = self.excel_handler.validate_excel_header(file_path, REQUIRED_COLUMNS)
+            if not valid:
                 messagebox.showerror(
                     "Invalid File Format",
-                    f"Missing required columns: {', '.join(missing_columns)}\n\n"
-                    f"Expected columns: {', '.join(required_columns)}"
+                    f"{message}\n\n"
+                    f"Expected columns: {', '.join(REQUIRED_COLUMNS)}"
                 )
                 return
             
-            # Clean and validate data
-            df = df.dropna(subset=required_columns)
-            df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
-            df = df.dropna(subset=['Amount'])
-            
-            if df.empty:
-                messagebox.showerror("No Valid Data", "No valid data found in the Excel file.")
+            # The validated reader streams the data without re-opening the file
+            chunks = self.stream_chunks(reader)
+            self.loading_chunks = chunks
+            self.load_next_chunk(chunks, [], file_path)
+        except Exception as e:
+            messagebox.showerror("Error Loading File", f"Failed to load Excel file:\n{str(e)}")
+    
+    def stream_chunks(self, reader):
+        """Yield typed chunks from an open sheet reader, closing it afterwards"""
+        with reader:
+            yield from reader.chunks(EXCEL_CHUNK_ROWS, dtypes=COLUMN_DTYPES)
+    
+    def load_next_chunk(self, chunks, loaded_chunks, file_path):
+        """Read and clean one chunk, then schedule the next"""
+        if chunks is not self.loading_chunks:
+            # Another file was selected meanwhile
+            chunks.close()
+            return
+        
+        try:
+            chunk = next(chunks, None)
+            if chunk is None:
+                self.finish_loading(loaded_chunks, cache_path=file_path)
                 return
             
-            self.loaded_data = df
-            self.display_data_preview()
-            self.enable_processing_buttons()
+            loaded_chunks.append(chunk)
+            if len(loaded_chunks) == 1:
+                # Preview the first chunk while the rest loads
+                self.loaded_data = chunk.dropna(subset=REQUIRED_COLUMNS)
+            self.display_data_preview(
+                loading_count=sum(len(loaded) for loaded in loaded_chunks)
+            )
+            self.window.after(1, lambda: self.load_next_chunk(chunks, loaded_chunks, file_path))
             
         except Exception as e:
+            chunks.close()
+            self.loaded_data = None
             messagebox.showerror("Error Loading File", f"Failed to load Excel file:\n{str(e)}")
     
-    def display_data_preview(self):
-        """Display preview of loaded data"""
+    def finish_loading(self, loaded_chunks, cache_path=None):
+        """Combine the loaded chunks, clean them and enable processing
+        
+        With cache_path the parsed sheet is stored in the parse cache, so the
+        next load of the same file skips parsing.
+        """
+        if loaded_chunks:
+            df = pd.concat(loaded_chunks, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=REQUIRED_COLUMNS)
+        
+        if cache_path is not None:
+            self.excel_handler.cache.put(df, cache_path, dtypes=COLUMN_DTYPES)
+        
+        # Clean and validate data (Amount is already numeric)
+        df = df.dropna(subset=REQUIRED_COLUMNS)
+        
+        if df.empty:
+            self.loaded_data = None
+            messagebox.showerror("No Valid Data", "No valid data found in the Excel file.")
+            return
+        
+        self.loaded_data = df
+        self.display_data_preview()
+        self.enable_processing_buttons()
+    
+    def display_data_preview(self, loading_count=None):
+        """Display preview of loaded data (loading_count while still reading)"""
         if self.loaded_data is not None:
             # Hide no data message
             self.no_data_label.pack_forget()
             
             # Show preview
-            self.preview_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-            
-            # Populate preview
-            preview_content = f"Loaded {len(self.loaded_data)} records:\n\n"
-            preview_content += self.loaded_data.head(10).to_string(index=False)
+            self.preview_status.pack(pady=(0, 5))
+            self.preview_grid.pack(fill="both", expand=True, padx=10, pady=(0, 10))
             
-            if len(self.loaded_data) > 10:
-                preview_content += f"\n\n... and {len(self.loaded_data) - 10} more records"
+            # The grid only reads the rows in view, so the whole sheet can be browsed
+            if self.preview_grid.source.frame is not self.loaded_data:
+                self.preview_grid.set_source(DataFrameSource(self.loaded_data))
             
-            self.preview_text.configure(state="normal")
-            self.preview_text.delete("1.0", "end")
-            self.preview_text.insert("1.0", preview_content)
-            self.preview_text.configure(state="disabled")
+            if loading_count is not None:
+                status = f"Loading... {loading_count} records read so far"
+            else:
+                status = f"Loaded {len(self.loaded_data)} records"
+            self.preview_status.configure(text=status)
     
     def enable_processing_buttons(self):
         """Enable processing buttons when data is loaded"""
@@ -313,15 +457,15 @@ class ExcelEMDTool:
         if self.loaded_data is None or self.loaded_data.empty:
             return
         
-        # Get first record for preview
-        record = self.loaded_data.iloc[0]
-        
         try:
-            # Generate preview HTML
+            # Preview the first receipt, numbered as it will be generated
+            receipt = self.build_receipts()[0]
             html_content = self.generate_receipt_html(
-                record['Payee Name'],
-                record['Amount'],
-                record['Work Description']
+                receipt['payee'],
+                receipt['amount'],
+                receipt['work_description'],
+                receipt['receipt_number'],
+                receipt['date']
             )
             
             # Save preview file
@@ -338,205 +482,243 @@ class ExcelEMDTool:
             messagebox.showerror("Preview Error", f"Failed to generate preview:\n{str(e)}")
     
     def process_all_receipts(self):
-        """Process all receipts from loaded data"""
+        """Start generating receipts for all loaded records in worker processes
+        
+        Output goes to a folder named after the source workbook and its
+        path. Its manifest records what was rendered, so a re-run only
+        renders receipts (or, for a single PDF, parts of it) whose content
+        changed and reuses the rest.
+        """
         if self.loaded_data is None or self.loaded_data.empty:
             return
+        if self.receipt_engine is not None and self.receipt_engine.running:
+            return
         
         try:
-            # Create export directory
-            export_dir = Path("exports") / f"emd_receipts_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            # One export folder per source workbook, reused across runs
+            source_path = self.file_path_var.get()
+            source_name = Path(source_path).stem or "receipts"
+            export_dir = Path("exports") / f"emd_receipts_{self.sanitize_filename(source_name)}_{source_key(source_path)}"
             export_dir.mkdir(parents=True, exist_ok=True)
             
-            processed_count = 0
             self.processed_receipts = []
+            per_page = OUTPUT_MODES.get(self.output_mode_var.get(), 1)
+            manifest = ReceiptManifest(export_dir)
+            receipts = self.build_receipts(manifest.receipt_dates())
+            if per_page is None:
+                for receipt in receipts:
+                    receipt['pdf_file'] = str(
+                        export_dir / f"{self.sanitize_filename(receipt['payee'])}_{receipt['receipt_number']}.pdf"
+                    )
+            
+            template = template_signature(self.settings)
+            batch_file = export_dir / BATCH_PDF_NAME if per_page is not None else None
+            index_file = export_dir / BATCH_INDEX_NAME if per_page is not None else None
+            
+            # Work out which receipts are already on disk unchanged
+            reused = {}
+            part_files, reuse = None, set()
+            if per_page is None:
+                reused = {
+                    position: (pdf_file, None)
+                    for position, pdf_file in manifest.reusable_files(receipts, template).items()
+                }
+                rendering = len(receipts) - len(reused)
+            else:
+                # The batch is rebuilt from parts; only parts of changed receipts are rendered
+                chunks = batch_chunks(len(receipts), per_page)
+                part_files, reuse = manifest.batch_parts(receipts, chunks, template, per_page)
+                rendering = sum(stop - start for number, (start, stop) in enumerate(chunks) if number not in reuse)
+                pages = manifest.reusable_batch(part_files, per_page, batch_file, index_file)
+                if pages is not None:
+                    reused = {position: (str(batch_file), page) for position, page in enumerate(pages)}
+                    rendering = 0
+            reused_count = len(receipts) - rendering
+            positions = [position for position in range(len(receipts)) if position not in reused]
             
-            # Process each record
-            for index, record in self.loaded_data.iterrows():
-                try:
-                    payee = str(record['Payee Name']).strip()
-                    amount = float(record['Amount'])
-                    work_desc = str(record['Work Description']).strip()
-                    
-                    # Generate HTML receipt
-                    html_content = self.generate_receipt_html(payee, amount, work_desc)
-                    
-                    # Save HTML file
-                    safe_filename = self.sanitize_filename(payee)
-                    html_file = export_dir / f"{safe_filename}_receipt.html"
-                    
-                    with open(html_file, 'w', encoding='utf-8') as f:
-                        f.write(html_content)
-                    
-                    # Generate PDF
-                    pdf_file = export_dir / f"{safe_filename}_receipt.pdf"
-                    self.pdf_generator.html_to_pdf(str(html_file), str(pdf_file))
-                    
-                    # Track processed receipt
-                    self.processed_receipts.append({
-                        'payee': payee,
-                        'amount': amount,
-                        'work_description': work_desc,
-                        'html_file': str(html_file),
-                        'pdf_file': str(pdf_file),
-                        'date_generated': datetime.now().isoformat()
-                    })
-                    
-                    processed_count += 1
-                    
-                except Exception as e:
-                    print(f"Error processing record {index}: {e}")
-                    continue
+            run = {
+                'receipts': receipts,
+                'positions': positions,
+                'reused': reused,
+                'reused_count': reused_count,
+                'manifest': manifest,
+                'template': template,
+                'per_page': per_page,
+                'batch_file': batch_file,
+                'part_files': part_files,
+                'export_dir': export_dir
+            }
+            if not positions:
+                self.finish_processing(run, {'pdf_files': [], 'pages': [], 'cancelled': False})
+                return
+            
+            # Render the changed receipts (or batch parts) in worker processes
+            # (HTML is only used for preview)
+            self.receipt_engine = ReceiptGenerationEngine(self.settings)
+            self.receipt_engine.start(
+                [receipts[position] for position in positions],
+                per_page=per_page,
+                batch_file=batch_file,
+                index_file=index_file,
+                part_files=part_files,
+                reuse=reuse
+            )
             
-            # Update results
-            self.update_results_display(processed_count, export_dir)
+            self.process_btn.configure(state="disabled")
+            self.cancel_btn.configure(state="normal")
+            self.progress_bar.set(0)
+            self.progress_label.configure(text=f"0 / {rendering:,} receipts")
+            self.window.after(PROGRESS_POLL_MS, lambda: self.poll_receipt_progress(run))
             
         except Exception as e:
             messagebox.showerror("Processing Error", f"Failed to process receipts:\n{str(e)}")
     
-    def generate_receipt_html(self, payee, amount, work_description):
+    def build_receipts(self, dates=None):
+        """Build receipt data for all loaded records, column-wise rather than row by row
+        
+        Rows without a usable date are dated from dates ({digest: date}
+        from the export folder's manifest) or today; see
+        assign_receipt_numbers.
+        """
+        payees = self.loaded_data['Payee Name'].astype(str).str.strip()
+        amounts = pd.to_numeric(self.loaded_data['Amount'], errors='coerce')
+        work_descriptions = self.loaded_data['Work Description'].astype(str).str.strip()
+        if DATE_COLUMN in self.loaded_data.columns:
+            receipt_dates = to_dates(self.loaded_data[DATE_COLUMN]).dt.strftime('%d/%m/%Y')
+            receipt_dates = receipt_dates.astype(object).where(receipt_dates.notna(), None)
+        else:
+            receipt_dates = pd.Series([None] * len(self.loaded_data), index=self.loaded_data.index, dtype=object)
+        
+        invalid = amounts.isna()
+        if invalid.any():
+            print(f"Skipping {int(invalid.sum())} records without a valid amount")
+        
+        amounts = amounts[~invalid]
+        receipts = [
+            {
+                'date': receipt_date,
+                'payee': payee,
+                'amount': float(amount),
+                'amount_words': amount_words,
+                'work_description': work_desc
+            }
+            for payee, amount, amount_words, work_desc, receipt_date in zip(
+                payees[~invalid], amounts, amounts_to_words(amounts),
+                work_descriptions[~invalid], receipt_dates[~invalid]
+            )
+        ]
+        return assign_receipt_numbers(receipts, dates)
+    
+    def poll_receipt_progress(self, run):
+        """Update progress from the Tk main loop until generation finishes"""
+        if not self.window.winfo_exists():
+            self.receipt_engine.cancel()
+            return
+        
+        for message in self.receipt_engine.poll():
+            kind = message[0]
+            if kind == "progress":
+                done, total = message[1], message[2]
+                self.progress_bar.set(done / total if total else 1)
+                self.progress_label.configure(text=f"{done:,} / {total:,} receipts")
+            elif kind == "done":
+                self.finish_processing(run, message[1])
+                return
+            elif kind == "error":
+                self.process_btn.configure(state="normal")
+                self.cancel_btn.configure(state="disabled")
+                self.progress_label.configure(text="Failed")
+                self.results_label.configure(text="❌ Receipt generation failed", text_color="#EF4444")
+                messagebox.showerror("Processing Error", f"Failed to process receipts:\n{message[1]}")
+                return
+        
+        self.window.after(PROGRESS_POLL_MS, lambda: self.poll_receipt_progress(run))
+    
+    def finish_processing(self, run, result):
+        """Combine rendered and reused receipts and update the manifest"""
+        self.process_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+        
+        receipts = run['receipts']
+        pdf_files = [None] * len(receipts)
+        pages = [None] * len(receipts)
+        for position, (pdf_file, page) in run['reused'].items():
+            pdf_files[position] = pdf_file
+            pages[position] = page
+        for position, pdf_file, page in zip(run['positions'], result['pdf_files'], result['pages']):
+            pdf_files[position] = pdf_file
+            pages[position] = page
+        
+        run['manifest'].record_dates(receipts)
+        if run['per_page'] is None:
+            run['manifest'].record_files(receipts, pdf_files, run['template'])
+        elif run['positions'] and not result['cancelled'] and None not in pdf_files:
+            run['manifest'].record_batch(receipts, run['part_files'], run['batch_file'])
+        
+        date_generated = datetime.now().isoformat()
+        for receipt, pdf_file, page in zip(receipts, pdf_files, pages):
+            if pdf_file is None:
+                continue
+            self.processed_receipts.append({
+                'receipt_number': receipt['receipt_number'],
+                'payee': receipt['payee'],
+                'amount': receipt['amount'],
+                'work_description': receipt['work_description'],
+                'date': receipt['date'],
+                'pdf_file': pdf_file,
+                'page': page,
+                'date_generated': date_generated
+            })
+        
+        processed_count = len(self.processed_receipts)
+        reused_count = run['reused_count']
+        self.progress_bar.set(processed_count / len(receipts) if receipts else 1)
+        self.progress_label.configure(text=f"{processed_count:,} / {len(receipts):,} receipts")
+        if result['cancelled']:
+            self.results_label.configure(
+                text=f"⚠️ Cancelled after {processed_count} receipts\nExported to: {run['export_dir']}",
+                text_color="#F59E0B"
+            )
+            self.export_frame.pack(pady=10)
+            self.export_dir = run['export_dir']
+        else:
+            self.update_results_display(processed_count, run['export_dir'], reused_count)
+            failed = len(receipts) - processed_count
+            if failed:
+                messagebox.showerror(
+                    "Processing Error",
+                    f"{failed:,} of {len(receipts):,} receipts could not be generated.\n"
+                    "The other receipts were saved."
+                )
+    
+    def cancel_processing(self):
+        """Cancel the running receipt generation"""
+        if self.receipt_engine is not None and self.receipt_engine.running:
+            self.receipt_engine.cancel()
+            self.cancel_btn.configure(state="disabled")
+            self.progress_label.configure(text="Cancelling...")
+    
+    def generate_receipt_html(self, payee, amount, work_description, receipt_number, receipt_date):
         """Generate HTML content for receipt"""
-        dept_info = self.settings.get_department_info()
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Hand Receipt (RPWA 28)</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; }}
-        .container {{ max-width: 800px; margin: 0 auto; border: 2px solid #000; padding: 20px; }}
-        .header {{ text-align: center; margin-bottom: 20px; }}
-        .title {{ font-size: 24px; font-weight: bold; margin-bottom: 10px; }}
-        .subtitle {{ font-size: 18px; margin-bottom: 20px; }}
-        .content {{ margin-bottom: 20px; }}
-        .field {{ margin-bottom: 15px; }}
-        .field-label {{ font-weight: bold; display: inline-block; width: 150px; }}
-        .field-value {{ display: inline-block; border-bottom: 1px solid #000; min-width: 300px; }}
-        .amount-section {{ background-color: #f0f0f0; padding: 15px; border: 1px solid #000; margin: 20px 0; }}
-        .signature-section {{ margin-top: 40px; }}
-        .signature-box {{ border: 1px solid #000; height: 60px; width: 200px; display: inline-block; margin-right: 50px; }}
-        .footer {{ text-align: center; margin-top: 30px; font-size: 12px; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="title">{dept_info.get('name', 'Public Works Department')}</div>
-            <div class="subtitle">{dept_info.get('office', 'PWD Office, Udaipur')}</div>
-            <div class="subtitle">HAND RECEIPT (RPWA 28)</div>
-        </div>
-        
-        <div class="content">
-            <div class="field">
-                <span class="field-label">Receipt No.:</span>
-                <span class="field-value">EMD-{datetime.now().strftime('%Y%m%d')}-{abs(hash(payee)) % 10000:04d}</span>
-            </div>
-            
-            <div class="field">
-                <span class="field-label">Date:</span>
-                <span class="field-value">{datetime.now().strftime('%d/%m/%Y')}</span>
-            </div>
-            
-            <div class="field">
-                <span class="field-label">Received from:</span>
-                <span class="field-value">{payee}</span>
-            </div>
-            
-            <div class="field">
-                <span class="field-label">Work Description:</span>
-                <span class="field-value">{work_description}</span>
-            </div>
-            
-            <div class="amount-section">
-                <div class="field">
-                    <span class="field-label">Amount (₹):</span>
-                    <span class="field-value" style="font-size: 18px; font-weight: bold;">₹ {amount:,.2f}</span>
-                </div>
-                
-                <div class="field">
-                    <span class="field-label">Amount in Words:</span>
-                    <span class="field-value">{self.amount_to_words(amount)} Rupees Only</span>
-                </div>
-            </div>
-            
-            <div class="field">
-                <span class="field-label">Purpose:</span>
-                <span class="field-value">Earnest Money Deposit (EMD)</span>
-            </div>
-            
-            <div class="signature-section">
-                <div style="float: left;">
-                    <div>Received by:</div>
-                    <div class="signature-box"></div>
-                    <div>Signature & Stamp</div>
-                </div>
-                
-                <div style="float: right;">
-                    <div>Submitted by:</div>
-                    <div class="signature-box"></div>
-                    <div>Contractor Signature</div>
-                </div>
-                
-                <div style="clear: both;"></div>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>This is a computer-generated receipt | PWD Tools Desktop v1.0.0</p>
-            <p>Generated on: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}</p>
-        </div>
-    </div>
-</body>
-</html>"""
-        
-        return html_content
+        return self.template_engine.render('receipt', {
+            'payee': payee,
+            'amount': amount,
+            'work_description': work_description,
+            'receipt_number': receipt_number,
+            'date': receipt_date
+        })
     
-    def amount_to_words(self, amount):
-        """Convert amount to words (simplified version)"""
-        # This is a simplified implementation
-        # In production, you'd use a proper number-to-words library
-        
-        ones = ['', 'One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine']
-        teens = ['Ten', 'Eleven', 'Twelve', 'Thirteen', 'Fourteen', 'Fifteen', 'Sixteen', 'Seventeen', 'Eighteen', 'Nineteen']
-        tens = ['', '', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Sixty', 'Seventy', 'Eighty', 'Ninety']
-        
-        def convert_hundreds(n):
-            result = ''
-            if n >= 100:
-                result += ones[n // 100] + ' Hundred '
-                n %= 100
-            if n >= 20:
-                result += tens[n // 10] + ' '
-                n %= 10
-            elif n >= 10:
-                result += teens[n - 10] + ' '
-                n = 0
-            if n > 0:
-                result += ones[n] + ' '
-            return result.strip()
-        
-        if amount == 0:
-            return 'Zero'
-        
-        # Handle crores, lakhs, thousands, hundreds
-        crores = int(amount // 10000000)
-        lakhs = int((amount % 10000000) // 100000)
-        thousands = int((amount % 100000) // 1000)
-        hundreds = int(amount % 1000)
-        
-        result = ''
-        if crores > 0:
-            result += convert_hundreds(crores) + ' Crore '
-        if lakhs > 0:
-            result += convert_hundreds(lakhs) + ' Lakh '
-        if thousands > 0:
-            result += convert_hundreds(thousands) + ' Thousand '
-        if hundreds > 0:
-            result += convert_hundreds(hundreds)
-        
-        return result.strip()
+    def export_receipts_html(self):
+        """Write all generated receipts into one printable HTML file"""
+        if not self.processed_receipts or not hasattr(self, 'export_dir'):
+            return
+        
+        receipts = pd.DataFrame(self.processed_receipts)
+        html_file = Path(self.export_dir) / BATCH_HTML_NAME
+        if self.template_engine.write_frame('receipt', receipts, html_file):
+            messagebox.showinfo("Export Complete", f"{len(receipts)} receipts written to:\n{html_file}")
+        else:
+            messagebox.showerror("Export Error", "Failed to write the receipts HTML file.")
     
     def sanitize_filename(self, name):
         """Sanitize filename for safe file creation"""
@@ -544,10 +726,11 @@ class ExcelEMDTool:
         safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', name.strip())
         return safe_name[:50]  # Limit length
     
-    def update_results_display(self, count, export_dir):
+    def update_results_display(self, count, export_dir, reused_count=0):
         """Update results display after processing"""
+        reused_text = f" ({reused_count} unchanged, reused)" if reused_count else ""
         self.results_label.configure(
-            text=f"✅ Successfully generated {count} receipts\nExported to: {export_dir}",
+            text=f"✅ Successfully generated {count} receipts{reused_text}\nExported to: {export_dir}",
             text_color="#10B981"
         )
         
@@ -566,29 +749,54 @@ class ExcelEMDTool:
             return
         
         try:
-            for receipt in self.processed_receipts:
-                # Insert into EMD records table
-                self.db_manager.execute_query('''
-                    INSERT INTO emd_records (
-                        tender_number, contractor_name, emd_amount, bank_name,
-                        guarantee_number, validity_date, refund_status, date_created
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    f"EMD-{datetime.now().strftime('%Y%m%d')}-{abs(hash(receipt['payee'])) % 10000:04d}",
+            receipts = list(self.processed_receipts)
+            validity = datetime.now().strftime('%Y-%m-%d')
+            rows = [
+                (
+                    receipt['receipt_number'],
                     receipt['payee'],
                     receipt['amount'],
                     'Cash/DD',  # Default bank
                     '',  # No guarantee number for cash
-                    datetime.now().strftime('%Y-%m-%d'),  # Default validity
+                    validity,  # Default validity
                     'Received',
                     receipt['date_generated']
-                ))
+                )
+                for receipt in receipts
+            ]
             
-            messagebox.showinfo("Success", f"Saved {len(self.processed_receipts)} records to database!")
+            # Insert all EMD records in a single transaction, off the Tk thread
+            self.task_panel.run(
+                self.db_manager.execute_many, '''
+                INSERT INTO emd_records (
+                    tender_number, contractor_name, emd_amount, bank_name,
+                    guarantee_number, validity_date, refund_status, date_created
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows,
+                key=("save_emd_receipts", tuple(receipt['receipt_number'] for receipt in receipts)),
+                description=f"Saving {len(rows):,} records",
+                on_done=lambda result: self.database_saved(result, receipts),
+                on_error=lambda error: messagebox.showerror("Database Error", f"Failed to save to database:\n{error}")
+            )
             
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to save to database:\n{str(e)}")
     
+    def database_saved(self, result, receipts):
+        """Report a finished background save"""
+        if result['errors']:
+            failed = "\n".join(
+                f"{receipts[index]['payee']}: {error}"
+                for index, error in result['errors'][:10]
+            )
+            messagebox.showwarning(
+                "Partially Saved",
+                f"Saved {result['succeeded']} of {len(receipts)} records to database.\n\n"
+                f"Failed records:\n{failed}"
+            )
+        else:
+            messagebox.showinfo("Success", f"Saved {result['succeeded']} records to database!")
+    
     def focus(self):
         """Bring window to focus"""
         self.window.lift()
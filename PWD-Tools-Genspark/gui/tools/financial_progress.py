@@ -8,6 +8,7 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from datetime import datetime, timedelta
 import json
+from gui.task_progress import TaskProgressPanel
 
 class FinancialProgressTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -61,6 +62,9 @@ class FinancialProgressTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -317,7 +321,16 @@ class FinancialProgressTool:
             # Save to database
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            project = {
+                'name': project_name,
+                'contract_value': contract_value,
+                'start_date': start_date,
+                'completion_date': completion_date,
+                'contractor': contractor_name,
+                'ld_rate': ld_rate
+            }
+            self.task_panel.run(
+                self.db_manager.execute_query, '''
                 INSERT INTO financial_progress (
                     project_name, contract_value, start_date, completion_date,
                     contractor_name, ld_rate, date_created
@@ -325,26 +338,26 @@ class FinancialProgressTool:
             ''', (
                 project_name, contract_value, start_date_str, completion_date_str,
                 contractor_name, ld_rate, current_time
-            ))
-            
-            if success:
-                messagebox.showinfo("Success", "Project information saved successfully!")
-                
-                # Store project data for current session
-                self.current_project = {
-                    'name': project_name,
-                    'contract_value': contract_value,
-                    'start_date': start_date,
-                    'completion_date': completion_date,
-                    'contractor': contractor_name,
-                    'ld_rate': ld_rate
-                }
-            else:
-                messagebox.showerror("Error", "Failed to save project information.")
+            ),
+                key=("save_project", project_name),
+                description="Saving project",
+                on_done=lambda success: self.project_saved(success, project),
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save project: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save project: {str(e)}")
     
+    def project_saved(self, success, project):
+        """Report a finished background save"""
+        if success:
+            messagebox.showinfo("Success", "Project information saved successfully!")
+            
+            # Store project data for current session
+            self.current_project = project
+        else:
+            messagebox.showerror("Error", "Failed to save project information.")
+    
     def add_progress_record(self):
         """Add progress record"""
         try:
@@ -586,14 +599,25 @@ class FinancialProgressTool:
             
             filename = f"Financial_Progress_Report_{self.current_project['name'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
             
-            if pdf_gen.generate_financial_progress_report(report_data, filename):
-                messagebox.showinfo("Success", f"Progress report generated: {filename}")
-            else:
-                messagebox.showerror("Error", "Failed to generate progress report.")
+            # Generate the report in the background
+            self.task_panel.run(
+                pdf_gen.generate_financial_progress_report, report_data, filename,
+                key=("financial_progress_report", filename),
+                description="Generating report",
+                on_done=lambda success: self.report_generated(success, filename),
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to generate report: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
     
+    def report_generated(self, success, filename):
+        """Report a finished background report generation"""
+        if success:
+            messagebox.showinfo("Success", f"Progress report generated: {filename}")
+        else:
+            messagebox.showerror("Error", "Failed to generate progress report.")
+    
     def focus(self):
         """Bring window to focus"""
         self.window.lift()
@@ -7,6 +7,7 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from datetime import datetime, timedelta
+from gui.task_progress import TaskProgressPanel
 
 class SecurityRefundTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -57,6 +58,9 @@ class SecurityRefundTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -459,7 +463,8 @@ class SecurityRefundTool:
             calc = self.current_calculation
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            self.task_panel.run(
+                self.db_manager.execute_query, '''
                 INSERT INTO security_deposits (
                     work_order_number, contractor_name, deposit_amount, deposit_type,
                     bank_name, validity_date, refund_status, date_created
@@ -468,16 +473,23 @@ class SecurityRefundTool:
                 calc['work_order_number'], calc['contractor_name'], calc['deposit_amount'],
                 calc['deposit_type'], calc['bank_name'], calc['validity_date'],
                 calc['refund_status'], current_time
-            ))
-            
-            if success:
-                messagebox.showinfo("Success", "Security deposit record saved successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to save security deposit record.")
+            ),
+                key=("save_security_record", calc['work_order_number'], calc['contractor_name']),
+                description="Saving security deposit record",
+                on_done=self.record_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save security deposit record: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save security deposit record: {str(e)}")
     
+    def record_saved(self, success):
+        """Report a finished background save"""
+        if success:
+            messagebox.showinfo("Success", "Security deposit record saved successfully!")
+        else:
+            messagebox.showerror("Error", "Failed to save security deposit record.")
+    
     def clear_form(self):
         """Clear all form fields"""
         self.work_order_entry.delete(0, "end")
@@ -7,6 +7,7 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
+from gui.task_progress import TaskProgressPanel
 
 class StampDutyTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -67,6 +68,9 @@ class StampDutyTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -402,7 +406,8 @@ class StampDutyTool:
             calc = self.current_calculation
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            success = self.db_manager.execute_query('''
+            self.task_panel.run(
+                self.db_manager.execute_query, '''
                 INSERT INTO stamp_duty (
                     work_order_number, work_description, contract_value, state,
                     stamp_duty_rate, stamp_duty_amount, order_date, date_created
@@ -411,16 +416,23 @@ class StampDutyTool:
                 calc['work_order_number'], calc['work_description'], calc['contract_value'],
                 calc['state'], calc['stamp_duty_rate'], calc['stamp_duty_amount'],
                 calc['order_date'], current_time
-            ))
-            
-            if success:
-                messagebox.showinfo("Success", "Stamp duty record saved successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to save stamp duty record.")
+            ),
+                key=("save_stamp_duty", calc['work_order_number']),
+                description="Saving stamp duty record",
+                on_done=self.record_saved,
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to save stamp duty record: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save stamp duty record: {str(e)}")
     
+    def record_saved(self, success):
+        """Report a finished background save"""
+        if success:
+            messagebox.showinfo("Success", "Stamp duty record saved successfully!")
+        else:
+            messagebox.showerror("Error", "Failed to save stamp duty record.")
+    
     def clear_form(self):
         """Clear all form fields"""
         self.work_order_entry.delete(0, "end")
@@ -8,6 +8,7 @@ import tkinter as tk
 from tkinter import messagebox, filedialog
 from datetime import datetime
 import json
+from gui.task_progress import TaskProgressPanel
 
 class TenderProcessingTool:
     def __init__(self, db_manager, settings, parent=None):
@@ -58,6 +59,9 @@ class TenderProcessingTool:
         )
         title_label.pack(pady=15)
         
+        # Progress of saves and PDF generation running in the background
+        self.task_panel = TaskProgressPanel(self.window)
+        
         # Main content
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -430,14 +434,25 @@ class TenderProcessingTool:
             
             filename = f"Tender_Document_{self.current_tender['tender_number'].replace('/', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
             
-            if pdf_gen.generate_tender_document(doc_data, filename):
-                messagebox.showinfo("Success", f"Tender document generated: {filename}")
-            else:
-                messagebox.showerror("Error", "Failed to generate tender document.")
+            # Generate the document in the background
+            self.task_panel.run(
+                pdf_gen.generate_tender_document, doc_data, filename,
+                key=("tender_document", filename),
+                description="Generating tender document",
+                on_done=lambda success: self.documents_generated(success, filename),
+                on_error=lambda error: messagebox.showerror("Error", f"Failed to generate documents: {error}")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate documents: {str(e)}")
     
+    def documents_generated(self, success, filename):
+        """Report a finished background document generation"""
+        if success:
+            messagebox.showinfo("Success", f"Tender document generated: {filename}")
+        else:
+            messagebox.showerror("Error", "Failed to generate tender document.")
+    
     def save_tender(self):
         """Save tender to database"""
         if not hasattr(self, 'current_tender'):
@@ -9,7 +9,14 @@ from tkinter import messagebox, filedialog
 from tkinter import ttk
 from datetime import datetime
 import os
-import sqlite3
+import tempfile
+import webbrowser
+
+from config.database import DatabaseManager
+from config.settings import AppSettings
+from utils.delay_engine import compute_work_delay
+from utils.hindrance_engine import parse_hindrance_text
+from utils.template_engine import TemplateEngine
 
 class CalendarWidget:
     """Simple calendar widget for date selection"""
@@ -128,33 +135,15 @@ class HindiBillNoteTool:
         # Simple database
         self.init_database()
         
+        # Note sheet template with the department details from settings
+        self.template_engine = TemplateEngine(AppSettings())
+        
         # Create interface
         self.create_interface()
     
     def init_database(self):
-        """Initialize simple database"""
-        self.conn = sqlite3.connect('hindi_bills.db')
-        self.cursor = self.conn.cursor()
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS hindi_bills (
-                id INTEGER PRIMARY KEY,
-                bill_type TEXT,
-                work_order_amount REAL,
-                upto_date_amount REAL,
-                extra_items TEXT,
-                extra_amount REAL,
-                start_date TEXT,
-                completion_date TEXT,
-                actual_completion TEXT,
-                repair_work TEXT,
-                excess_quantity TEXT,
-                delay_comment TEXT,
-                generated_note TEXT,
-                date_created TEXT
-            )
-        ''')
-        self.conn.commit()
+        """Use the shared PWD Tools database (pooled connection, managed schema)"""
+        self.db_manager = DatabaseManager()
     
     def create_interface(self):
         """Create Hindi interface"""
@@ -279,6 +268,11 @@ class HindiBillNoteTool:
         actual_cal_btn = ctk.CTkButton(actual_input_frame, text="📅", command=self.show_actual_calendar, width=30)
         actual_cal_btn.pack(side="left", padx=5)
         
+        # Hindrance periods from the hindrance register, one per line
+        ctk.CTkLabel(self.final_fields_frame, text="बाधा अवधि (DD/MM/YYYY - DD/MM/YYYY, प्रति पंक्ति एक):", font=ctk.CTkFont(size=12, weight="bold")).pack(pady=3)
+        self.hindrances_text = ctk.CTkTextbox(self.final_fields_frame, width=300, height=70, font=ctk.CTkFont(size=12))
+        self.hindrances_text.pack(pady=3)
+        
         # Repair Work
         ctk.CTkLabel(self.final_fields_frame, text="मरम्मत कार्य:", font=ctk.CTkFont(size=12, weight="bold")).pack(pady=3)
         self.repair_work_var = tk.StringVar(value="No")
@@ -489,13 +483,26 @@ class HindiBillNoteTool:
                         schedule_dt = datetime.strptime(schedule_completion, "%d/%m/%Y")
                         actual_dt = datetime.strptime(actual_completion, "%d/%m/%Y")
                         
-                        delay_days = (actual_dt - schedule_dt).days
+                        hindrances, bad_lines = parse_hindrance_text(self.hindrances_text.get("1.0", "end"))
+                        if bad_lines:
+                            messagebox.showerror("Error", "बाधा अवधि का प्रारूप गलत है:\n" + "\n".join(bad_lines))
+                            return
+                        
+                        # Overlapping hindrances are merged; the approval rule uses the net delay
+                        delay = compute_work_delay(
+                            start_dt, schedule_dt, 0,
+                            actual_completion=actual_dt, hindrances=hindrances
+                        )
+                        delay_days = delay['completion_variance_days']
                         if actual_dt > schedule_dt:
                             note += f"{serial_number}. कार्य में {delay_days} दिन की देरी हुई है।\n"
                             serial_number += 1
                             
-                            schedule_duration = (schedule_dt - start_dt).days
-                            if delay_days > (schedule_duration / 2 + 1):
+                            if delay['hindrance_days']:
+                                note += f"{serial_number}. हिंड्रेंस रजिस्टर की {len(hindrances)} बाधा अवधियों (परस्पर व्याप्त अवधियाँ एक साथ गिनकर) में कुल {delay['hindrance_days']} दिन की बाधा दर्ज है, अतः ठेकेदार के कारण शुद्ध देरी {delay['net_delay_days']} दिन है।\n"
+                                serial_number += 1
+                            
+                            if delay['se_approval']:
                                 note += f"{serial_number}. Time Extension केस Superintending Engineer, Electric Circle, Udaipur कार्यालय द्वारा अनुमोदित किया जाना है।\n"
                             else:
                                 note += f"{serial_number}. Time Extension केस इस कार्यालय द्वारा अनुमोदित किया जाना है।\n"
@@ -545,6 +552,14 @@ class HindiBillNoteTool:
             
             # Store generated note
             self.generated_note = note
+            self.note_details = {
+                'bill_type': "रनिंग बिल" if bill_type == "running" else "फाइनल बिल",
+                'work_order_amount': work_order_amount,
+                'upto_date_amount': upto_date_amount,
+                'extra_amount': extra_amount if extra_items == "Yes" else 0,
+                'percentage_work_done': f"{percentage_work_done:.2f}",
+                'note': note
+            }
             
         except ValueError:
             messagebox.showerror("Error", "कृपया सभी राशि फ़ील्ड में मान्य संख्या दर्ज करें")
@@ -558,7 +573,7 @@ class HindiBillNoteTool:
             return
         
         try:
-            self.cursor.execute('''
+            success = self.db_manager.execute_query('''
                 INSERT INTO hindi_bills (
                     bill_type, work_order_amount, upto_date_amount, extra_items, extra_amount,
                     start_date, completion_date, actual_completion, repair_work, excess_quantity,
@@ -580,8 +595,10 @@ class HindiBillNoteTool:
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ))
             
-            self.conn.commit()
-            messagebox.showinfo("Success", "नोट सफलतापूर्वक सेव हो गया!")
+            if success:
+                messagebox.showinfo("Success", "नोट सफलतापूर्वक सेव हो गया!")
+            else:
+                messagebox.showerror("Error", "नोट सेव नहीं हो सका")
             
         except Exception as e:
             messagebox.showerror("Error", f"सेव करने में त्रुटि: {str(e)}")
@@ -595,6 +612,7 @@ class HindiBillNoteTool:
         self.start_date_entry.delete(0, "end")
         self.schedule_completion_entry.delete(0, "end")
         self.actual_completion_entry.delete(0, "end")
+        self.hindrances_text.delete("1.0", "end")
         
         self.bill_type_var.set("running")
         self.extra_items_var.set("No")
@@ -665,15 +683,18 @@ class HindiBillNoteTool:
             messagebox.showerror("Error", f"प्रिंट करने में त्रुटि: {str(e)}")
     
     def actual_print(self, text):
-        """Actually print the text"""
+        """Open the note as a printable note sheet in the browser"""
         try:
-            # Simple print to console (in real app, you'd use proper printing)
-            print("=" * 50)
-            print("HINDI BILL NOTE")
-            print("=" * 50)
-            print(text)
-            print("=" * 50)
-            messagebox.showinfo("Success", "नोट प्रिंट किया गया! (कंसोल में देखें)")
+            details = dict(getattr(self, 'note_details', {}))
+            details['note'] = text
+            html_content = self.template_engine.render('bill_note', details)
+            
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
+                f.write(html_content)
+                temp_file = f.name
+            
+            webbrowser.open(f'file://{temp_file}')
+            messagebox.showinfo("Success", "नोट शीट ब्राउज़र में खोली गई, वहीं से प्रिंट करें।")
         except Exception as e:
             messagebox.showerror("Error", f"प्रिंट करने में त्रुटि: {str(e)}")
     
@@ -8,7 +8,8 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 from datetime import datetime
 import os
-import sqlite3
+
+from config.database import DatabaseManager
 
 class SimpleCalendarWidget:
     """Professional one-liner calendar widget"""
@@ -131,29 +132,8 @@ class SimpleHindiBillNoteTool:
         self.create_interface()
     
     def init_database(self):
-        """Initialize simple database"""
-        self.conn = sqlite3.connect('simple_hindi_bills.db')
-        self.cursor = self.conn.cursor()
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS hindi_bills (
-                id INTEGER PRIMARY KEY,
-                bill_type TEXT,
-                work_order_amount REAL,
-                upto_date_amount REAL,
-                extra_items TEXT,
-                extra_amount REAL,
-                start_date TEXT,
-                completion_date TEXT,
-                actual_completion TEXT,
-                repair_work TEXT,
-                excess_quantity TEXT,
-                delay_comment TEXT,
-                generated_note TEXT,
-                date_created TEXT
-            )
-        ''')
-        self.conn.commit()
+        """Use the shared PWD Tools database (pooled connection, managed schema)"""
+        self.db_manager = DatabaseManager()
     
     def create_interface(self):
         """Create Hindi interface"""
@@ -574,7 +554,7 @@ class SimpleHindiBillNoteTool:
             return
         
         try:
-            self.cursor.execute('''
+            success = self.db_manager.execute_query('''
                 INSERT INTO hindi_bills (
                     bill_type, work_order_amount, upto_date_amount, extra_items, extra_amount,
                     start_date, completion_date, actual_completion, repair_work, excess_quantity,
@@ -596,8 +576,10 @@ class SimpleHindiBillNoteTool:
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ))
             
-            self.conn.commit()
-            messagebox.showinfo("Success", "नोट सफलतापूर्वक सेव हो गया!")
+            if success:
+                messagebox.showinfo("Success", "नोट सफलतापूर्वक सेव हो गया!")
+            else:
+                messagebox.showerror("Error", "नोट सेव नहीं हो सका")
             
         except Exception as e:
             messagebox.showerror("Error", f"सेव करने में त्रुटि: {str(e)}")
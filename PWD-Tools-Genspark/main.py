@@ -4,11 +4,17 @@ Inspired by the brilliant layouts from genspark.html
 Complete standalone solution with zero web dependencies
 """
 
+import sys
+
+# --profile-startup: time every import below, so it must be installed first
+from utils.startup_profiler import StartupProfiler
+STARTUP_PROFILER = StartupProfiler.from_argv() if __name__ == "__main__" else None
+
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
+import multiprocessing
 import os
-import sys
 from pathlib import Path
 
 # Add project root to path
@@ -19,9 +25,14 @@ from config.database import DatabaseManager
 from config.settings import AppSettings
 from gui.main_window import PWDToolsMainWindow
 
+if STARTUP_PROFILER is not None:
+    STARTUP_PROFILER.mark("module imports")
+
 class PWDToolsApp:
-    def __init__(self):
+    def __init__(self, profiler=None):
         """Initialize the PWD Tools Desktop Application"""
+        self.profiler = profiler
+        
         # Set appearance mode and color theme
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("blue")
@@ -29,6 +40,7 @@ class PWDToolsApp:
         # Initialize settings and database
         self.settings = AppSettings()
         self.db_manager = DatabaseManager()
+        self.mark_startup("settings and database")
         
         # Create and configure main window
         self.root = ctk.CTk()
@@ -36,9 +48,16 @@ class PWDToolsApp:
         
         # Create splash screen
         self.create_splash_screen()
+        self.mark_startup("splash screen")
         
-        # Initialize main application after splash
-        self.root.after(2000, self.initialize_main_app)
+        # Replace the splash as soon as it has been drawn; tool modules are
+        # loaded on demand, so there is nothing left to wait for
+        self.root.after_idle(self.initialize_main_app)
+    
+    def mark_startup(self, label):
+        """Record a startup phase when profiling"""
+        if self.profiler is not None:
+            self.profiler.mark(label)
     
     def setup_main_window(self):
         """Configure main window properties"""
@@ -228,14 +247,6 @@ class PWDToolsApp:
         )
         loading_title.pack(pady=(20, 5))
         
-        # Progress bar
-        self.progress_bar = ctk.CTkProgressBar(loading_frame, width=400)
-        self.progress_bar.pack(pady=10)
-        self.progress_bar.set(0)
-        
-        # Animate progress bar
-        self.animate_progress()
-        
         # Footer
         footer_frame = ctk.CTkFrame(splash_frame, height=60, fg_color="#374151")
         footer_frame.pack(fill="x", side="bottom")
@@ -249,20 +260,6 @@ class PWDToolsApp:
         )
         footer_text.pack(pady=15)
     
-    def animate_progress(self):
-        """Animate the progress bar"""
-        try:
-            current_progress = self.progress_bar.get()
-            if current_progress < 1.0:
-                new_progress = current_progress + 0.1
-                self.progress_bar.set(new_progress)
-                self.root.after(200, self.animate_progress)
-            else:
-                self.progress_bar.set(1.0)
-        except:
-            # Progress bar was destroyed, stop animation
-            pass
-    
     def initialize_main_app(self):
         """Initialize the main application after splash screen"""
         try:
@@ -272,6 +269,9 @@ class PWDToolsApp:
             
             # Create main window
             self.main_window = PWDToolsMainWindow(self.db_manager, self.settings, self.root)
+            self.mark_startup("main window")
+            if self.profiler is not None:
+                self.root.after_idle(self.profiler.finish)
             
             # Don't call run() as it will start another mainloop
             # The main window is already created and will be managed by the main loop
@@ -282,7 +282,10 @@ class PWDToolsApp:
     
     def run(self):
         """Start the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.db_manager.close()
 
 def main():
     """Main entry point"""
@@ -293,11 +296,13 @@ def main():
             return
         
         # Create and run application
-        app = PWDToolsApp()
+        app = PWDToolsApp(STARTUP_PROFILER)
         app.run()
         
     except Exception as e:
         messagebox.showerror("Application Error", f"Failed to start application:\n{str(e)}")
 
 if __name__ == "__main__":
+    # Receipt generation uses worker processes; needed for frozen Windows builds
+    multiprocessing.freeze_support()
     main()
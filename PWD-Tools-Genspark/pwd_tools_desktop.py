@@ -2,7 +2,6 @@
 # Converted from Streamlit web app to standalone desktop application
 
 import customtkinter as ctk
-import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
 import tkinter as tk
@@ -17,6 +16,8 @@ from io import BytesIO
 import zipfile
 import re
 
+from config.database import DatabaseManager
+
 class PWDToolsApp:
     def __init__(self):
         # Initialize main window
@@ -35,38 +36,9 @@ class PWDToolsApp:
         self.create_main_interface()
         
     def init_database(self):
-        """Initialize SQLite database for local storage"""
-        self.conn = sqlite3.connect('pwd_tools.db')
-        self.cursor = self.conn.cursor()
-        
-        # Create tables for different tools
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bills (
-                id INTEGER PRIMARY KEY,
-                bill_number TEXT,
-                contractor_name TEXT,
-                work_description TEXT,
-                bill_amount REAL,
-                date_created TEXT,
-                status TEXT
-            )
-        ''')
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS emd_records (
-                id INTEGER PRIMARY KEY,
-                tender_number TEXT,
-                contractor_name TEXT,
-                emd_amount REAL,
-                bank_name TEXT,
-                guarantee_number TEXT,
-                validity_date TEXT,
-                refund_status TEXT
-            )
-        ''')
-        
-        self.conn.commit()
-        
+        """Use the shared PWD Tools database (pooled connection, managed schema)"""
+        self.db_manager = DatabaseManager()
+    
     def create_main_interface(self):
         """Create the main application interface"""
         # Header Frame
@@ -416,14 +388,16 @@ class PWDToolsApp:
                 "Active"
             )
             
-            self.cursor.execute('''
+            success = self.db_manager.execute_query('''
                 INSERT INTO bills (bill_number, contractor_name, work_description, 
                                  bill_amount, date_created, status)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', bill_data)
             
-            self.conn.commit()
-            messagebox.showinfo("Success", "Bill note saved successfully!")
+            if success:
+                messagebox.showinfo("Success", "Bill note saved successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to save bill note")
             
         except ValueError:
             messagebox.showerror("Error", "Please enter valid bill amount")
@@ -0,0 +1,329 @@
+"""
+Delay Engine for PWD Tools Desktop Application
+Vectorized start/completion delay and liquidated damages for a whole works register
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.hindrance_engine import hindrance_days, needs_se_approval, periods_frame, read_hindrance_register
+
+# Penalty per day of completion delay, as % of the contract amount
+DEFAULT_PENALTY_RATE = 0.05
+# Liquidated damages never exceed this % of the contract amount (None = no cap)
+DEFAULT_PENALTY_CAP_PERCENT = 10.0
+
+# Engine field -> column heading in a works register sheet
+REGISTER_COLUMNS = {
+    'work_name': 'Work Name',
+    'contractor_name': 'Contractor',
+    'planned_start': 'Planned Start',
+    'actual_start': 'Actual Start',
+    'planned_completion': 'Planned Completion',
+    'actual_completion': 'Actual Completion',
+    'contract_amount': 'Contract Amount',
+    'penalty_rate': 'Penalty Rate',
+}
+REQUIRED_FIELDS = ['work_name', 'planned_start', 'planned_completion', 'contract_amount']
+DATE_FIELDS = ['planned_start', 'actual_start', 'planned_completion', 'actual_completion']
+
+# Columns added by compute_delays
+RESULT_COLUMNS = [
+    'start_variance_days', 'completion_variance_days',
+    'start_delay_days', 'completion_delay_days', 'total_delay_days',
+    'planned_duration', 'actual_duration',
+    'hindrance_days', 'excusable_delay_days', 'net_delay_days', 'se_approval',
+    'daily_penalty', 'penalty_amount', 'penalty_capped',
+    'project_status', 'valid'
+]
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+
+def to_dates(values, date_format=None):
+    """Parse a column of dates to datetime64 at midnight; blanks and bad dates give NaT
+
+    Strings are read with date_format when given. Otherwise ISO dates
+    (YYYY-MM-DD) are read as such and only the strings that are not ISO
+    are read day-first (DD/MM/YYYY) as written in the registers; reading
+    everything day-first would swap month and day in ISO text. Date cells
+    from Excel are used as they are.
+
+    >>> to_dates(['2024-03-01', '01/03/2024', '']).dt.strftime('%d %b %Y').tolist()
+    ['01 Mar 2024', '01 Mar 2024', nan]
+    """
+    values = pd.Series(values)
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = values.where(values.astype(str).str.strip() != "")
+        if date_format:
+            values = pd.to_datetime(values, format=date_format, errors="coerce")
+        else:
+            parsed = pd.to_datetime(values, format="ISO8601", errors="coerce")
+            day_first = parsed.isna() & values.notna()
+            if day_first.any():
+                parsed[day_first] = pd.to_datetime(values[day_first], dayfirst=True, errors="coerce", format="mixed")
+            values = parsed
+    if values.dt.tz is not None:
+        values = values.dt.tz_localize(None)
+    return values.dt.normalize()
+
+
+def _days(later, earlier):
+    """Whole days between two datetime64 columns as float (NaN where either is missing)"""
+    return (later - earlier) / ONE_DAY
+
+
+def compute_delays(frame, as_of=None, penalty_cap_percent=DEFAULT_PENALTY_CAP_PERCENT,
+                   date_format=None, default_penalty_rate=DEFAULT_PENALTY_RATE, hindrances=None):
+    """Compute delays and penalties for every work in a DataFrame at once
+
+    frame has one row per work with the engine field names as columns
+    (see REGISTER_COLUMNS); only the REQUIRED_FIELDS must be present.
+    Works not completed yet are measured up to as_of (today by default).
+    Returns a copy of frame with RESULT_COLUMNS added. Rows without a valid
+    planned start, planned completion and contract amount get valid=False
+    and zero delays.
+
+    hindrances lists hindrance periods by work_name (see
+    utils.hindrance_engine). The merged hindrance days between the
+    planned start and completion excuse that much of the completion
+    delay; the rest is the net delay, which the penalty is charged on
+    and the half-schedule approval rule is applied to.
+    """
+    result = frame.copy()
+    count = len(result)
+    today = pd.Timestamp(as_of if as_of is not None else date.today()).normalize()
+
+    dates = {}
+    for field in DATE_FIELDS:
+        if field in result.columns:
+            dates[field] = to_dates(result[field], date_format).to_numpy(dtype='datetime64[ns]')
+        else:
+            dates[field] = np.full(count, np.datetime64('NaT'), dtype='datetime64[ns]')
+    planned_start = dates['planned_start']
+    actual_start = dates['actual_start']
+    planned_completion = dates['planned_completion']
+    actual_completion = dates['actual_completion']
+
+    amount = pd.to_numeric(result['contract_amount'], errors="coerce").to_numpy(dtype=float)
+    if 'penalty_rate' in result.columns:
+        rate = pd.to_numeric(result['penalty_rate'], errors="coerce").to_numpy(dtype=float)
+        rate = np.where(np.isnan(rate), default_penalty_rate, rate)
+    else:
+        rate = np.full(count, default_penalty_rate, dtype=float)
+
+    started = ~np.isnat(actual_start)
+    completed = ~np.isnat(actual_completion)
+    valid = ~np.isnat(planned_start) & ~np.isnat(planned_completion) & ~np.isnan(amount)
+    today64 = np.datetime64(today.to_datetime64(), 'ns')
+
+    start_variance = _days(actual_start, planned_start)
+    completion_variance = _days(actual_completion, planned_completion)
+    # Ongoing works are late by the days past the planned completion so far
+    completion_delay = np.where(completed, completion_variance, _days(today64, planned_completion))
+    completion_delay = np.where(valid, np.clip(np.nan_to_num(completion_delay), 0, None), 0)
+    start_delay = np.where(valid, np.clip(np.nan_to_num(start_variance), 0, None), 0)
+
+    planned_duration = np.where(valid, np.nan_to_num(_days(planned_completion, planned_start)), 0)
+
+    if hindrances is not None and len(hindrances):
+        windows = pd.DataFrame({
+            'window_start': planned_start,
+            'window_end': np.where(completed, actual_completion, today64),
+        }, index=pd.Index(result['work_name'] if 'work_name' in result.columns else np.arange(count)))
+        hindered = np.where(valid, hindrance_days(hindrances, windows), 0)
+    else:
+        hindered = np.zeros(count, dtype=np.int64)
+    excusable = np.minimum(completion_delay, hindered)
+    net_delay = completion_delay - excusable
+    actual_duration = np.select(
+        [started & completed, started],
+        [_days(actual_completion, actual_start), _days(today64, actual_start)],
+        0
+    )
+
+    daily_penalty = np.where(valid, amount * rate / 100, 0.0)
+    penalty = daily_penalty * net_delay
+    if penalty_cap_percent is not None:
+        cap = np.where(valid, amount * penalty_cap_percent / 100, 0.0)
+        capped = penalty > cap
+        penalty = np.minimum(penalty, cap)
+    else:
+        capped = np.zeros(count, dtype=bool)
+
+    result['start_variance_days'] = pd.array(np.round(start_variance), dtype="Int64")
+    result['completion_variance_days'] = pd.array(np.round(completion_variance), dtype="Int64")
+    result['start_delay_days'] = start_delay.astype(np.int64)
+    result['completion_delay_days'] = completion_delay.astype(np.int64)
+    result['total_delay_days'] = result['start_delay_days'] + result['completion_delay_days']
+    result['planned_duration'] = planned_duration.astype(np.int64)
+    result['hindrance_days'] = hindered.astype(np.int64)
+    result['excusable_delay_days'] = excusable.astype(np.int64)
+    result['net_delay_days'] = net_delay.astype(np.int64)
+    result['se_approval'] = (completion_delay > 0) & needs_se_approval(net_delay, planned_duration)
+    result['actual_duration'] = np.nan_to_num(actual_duration).astype(np.int64)
+    result['daily_penalty'] = daily_penalty
+    result['penalty_amount'] = penalty
+    result['penalty_capped'] = capped
+    result['project_status'] = np.where(completed, "Completed", "Ongoing")
+    result['valid'] = valid
+    return result
+
+
+def compute_work_delay(planned_start, planned_completion, contract_amount, penalty_rate=DEFAULT_PENALTY_RATE,
+                       actual_start=None, actual_completion=None, as_of=None,
+                       penalty_cap_percent=DEFAULT_PENALTY_CAP_PERCENT, hindrances=None):
+    """compute_delays for a single work; dates are datetime/date objects or None
+
+    hindrances is a list of (start, end) dates. Returns a dict of the
+    RESULT_COLUMNS as plain Python values.
+    """
+    frame = pd.DataFrame([{
+        'work_name': 0,
+        'planned_start': planned_start,
+        'actual_start': actual_start,
+        'planned_completion': planned_completion,
+        'actual_completion': actual_completion,
+        'contract_amount': contract_amount,
+        'penalty_rate': penalty_rate,
+    }])
+    for field in DATE_FIELDS:
+        frame[field] = pd.to_datetime(frame[field])
+    row = compute_delays(
+        frame, as_of=as_of, penalty_cap_percent=penalty_cap_percent,
+        hindrances=periods_frame(hindrances) if hindrances else None
+    ).iloc[0]
+
+    values = {}
+    for column in RESULT_COLUMNS:
+        value = row[column]
+        if pd.isna(value):
+            value = None
+        elif isinstance(value, (np.integer, np.floating, np.bool_)):
+            value = value.item()
+        values[column] = value
+    return values
+
+
+def read_works_register(file_path, sheet_name=None, columns=None, excel_handler=None):
+    """Read a works register sheet into engine field names
+
+    columns maps engine fields to sheet headings (REGISTER_COLUMNS by
+    default). Returns (frame, message); frame is None when a required
+    column is missing or the file cannot be read.
+    """
+    columns = columns or REGISTER_COLUMNS
+    try:
+        if excel_handler is None:
+            from utils.excel_handler import ExcelHandler
+            excel_handler = ExcelHandler()
+        sheet = excel_handler.read_sheet(file_path, sheet_name)
+    except Exception as e:
+        print(f"Error reading works register: {e}")
+        return None, f"Could not read the file: {e}"
+
+    missing = [columns[field] for field in REQUIRED_FIELDS if columns[field] not in sheet.columns]
+    if missing:
+        return None, f"Missing columns: {', '.join(missing)}"
+
+    frame = pd.DataFrame({
+        field: sheet[heading] for field, heading in columns.items() if heading in sheet.columns
+    })
+    return frame, f"{len(frame)} works read"
+
+
+def delay_remarks(start_delay_days, completion_delay_days, hindrance_days=0, net_delay_days=None):
+    """Remarks text stored with a delay record"""
+    remarks = f"Start delay: {start_delay_days} days, Completion delay: {completion_delay_days} days"
+    if hindrance_days:
+        remarks += f", Hindrance: {hindrance_days} days, Net delay: {net_delay_days} days"
+    return remarks
+
+
+def save_delay_calculations(db_manager, results):
+    """Insert the valid rows of compute_delays output into delay_calculations
+
+    Returns the execute_many result dict (succeeded, errors, row_ids).
+    """
+    rows = results[results['valid']]
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def date_text(values):
+        return to_dates(values).dt.strftime('%Y-%m-%d')
+
+    # Completed works are recorded with their actual completion date
+    completion_text = date_text(rows['planned_completion'])
+    if 'actual_completion' in rows.columns:
+        completion_text = date_text(rows['actual_completion']).fillna(completion_text)
+
+    remarks = [
+        delay_remarks(*days)
+        for days in zip(
+            rows['start_delay_days'].tolist(), rows['completion_delay_days'].tolist(),
+            rows['hindrance_days'].tolist(), rows['net_delay_days'].tolist()
+        )
+    ]
+    if 'contractor_name' in rows.columns:
+        contractors = rows['contractor_name'].fillna("").astype(str).tolist()
+        remarks = [
+            f"Contractor: {contractor}; {remark}" if contractor else remark
+            for contractor, remark in zip(contractors, remarks)
+        ]
+
+    params = list(zip(
+        rows['work_name'].astype(str).tolist(),
+        date_text(rows['planned_start']).tolist(),
+        completion_text.tolist(),
+        rows['planned_duration'].tolist(),
+        rows['total_delay_days'].tolist(),
+        rows['penalty_amount'].round(2).tolist(),
+        rows['project_status'].tolist(),
+        remarks,
+        [now] * len(rows)
+    ))
+    return db_manager.execute_many('''
+        INSERT INTO delay_calculations (
+            work_name, start_date, completion_date, total_days, delay_days,
+            penalty_amount, status, remarks, date_created
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', params)
+
+
+def process_works_register(file_path, db_manager=None, sheet_name=None, as_of=None,
+                           penalty_cap_percent=DEFAULT_PENALTY_CAP_PERCENT):
+    """Read a works register, compute every work's delay and save the results
+
+    Hindrance periods are taken from the workbook's Hindrances sheet when
+    it has one. Returns a dict with 'results' (DataFrame or None),
+    'message' and, when db_manager is given, 'saved' (the execute_many
+    result).
+    """
+    frame, message = read_works_register(file_path, sheet_name)
+    if frame is None:
+        return {'results': None, 'message': message, 'saved': None}
+
+    # Optional second sheet of hindrance periods per work
+    hindrances = read_hindrance_register(file_path)
+    if hindrances is not None:
+        message += f", {len(hindrances)} hindrance periods"
+
+    results = compute_delays(frame, as_of=as_of, penalty_cap_percent=penalty_cap_percent, hindrances=hindrances)
+    saved = save_delay_calculations(db_manager, results) if db_manager is not None else None
+    return {'results': results, 'message': message, 'saved': saved}
+
+
+def summarize_delays(results):
+    """Totals shown after a register run"""
+    valid = results[results['valid']]
+    return {
+        'works': len(results),
+        'invalid': int((~results['valid']).sum()),
+        'delayed': int((valid['completion_delay_days'] > 0).sum()),
+        'hindered': int((valid['hindrance_days'] > 0).sum()),
+        'se_approval': int(valid['se_approval'].sum()),
+        'ongoing': int((valid['project_status'] == "Ongoing").sum()),
+        'capped': int(valid['penalty_capped'].sum()),
+        'total_penalty': float(valid['penalty_amount'].sum()),
+    }
@@ -4,31 +4,413 @@ Handles Excel file operations and data processing
 """
 
 import pandas as pd
+import numpy as np
 import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
 from datetime import datetime
+import hashlib
+import itertools
+import json
 import os
+import threading
+import time
 from pathlib import Path
 
+# Rows parsed per chunk when streaming a sheet
+DEFAULT_CHUNK_ROWS = 5000
+
+# Size limit of the parsed-workbook cache before old entries are evicted
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Shared named styles and auto-fit limit used when writing workbooks
+TITLE_STYLE = "pwd_title"
+HEADER_STYLE = "pwd_header"
+CELL_STYLE = "pwd_cell"
+MAX_COLUMN_WIDTH = 50
+DATETIME_DISPLAY_WIDTH = 19
+
+# Column type checks understood by validate_excel_header
+COLUMN_TYPE_CHECKS = ("numeric", "date", "text")
+
+
+def _select_positions(columns, usecols):
+    """Resolve usecols (names or positions) to column positions in file order"""
+    if usecols is None:
+        return list(range(len(columns)))
+    
+    positions = set()
+    for column in usecols:
+        if isinstance(column, int):
+            if not 0 <= column < len(columns):
+                raise ValueError(f"Column position out of range: {column}")
+            positions.add(column)
+        elif column in columns:
+            positions.add(columns.index(column))
+        else:
+            raise ValueError(f"Column not found: {column}")
+    return sorted(positions)
+
+
+def _apply_dtypes(frame, dtypes):
+    """Convert columns to the requested dtypes; unparseable values become missing"""
+    for column, dtype in (dtypes or {}).items():
+        if column not in frame.columns:
+            continue
+        kind = np.dtype(dtype).kind if dtype not in (str, "str", "string") else "U"
+        if kind in "iuf":
+            values = pd.to_numeric(frame[column], errors='coerce')
+            # Integer columns with missing values stay float
+            frame[column] = values if kind != "f" and values.isna().any() else values.astype(dtype)
+        elif kind == "M":
+            frame[column] = pd.to_datetime(frame[column], errors='coerce')
+        elif kind == "b":
+            frame[column] = frame[column].astype(bool)
+        else:
+            frame[column] = frame[column].where(frame[column].isna(), frame[column].astype(str))
+    return frame
+
+
+def _parquet_available():
+    """Check whether pyarrow is installed for Parquet cache files"""
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+
+class ExcelSheetReader:
+    """An open, read-only view of one worksheet, parsed a row at a time
+    
+    Opening reads only the header row (and sample_rows rows if asked), so it
+    is cheap to validate a file with. The same reader then streams the data
+    from where validation stopped; the sampled rows are not parsed again.
+    Rows can be consumed once; close() the reader (or use it in a with
+    block) when done.
+    """
+    
+    def __init__(self, file_path, sheet_name=None, sample_rows=0):
+        self.file_path = Path(file_path)
+        self._workbook = None
+        
+        if self.file_path.suffix.lower() == '.xls':
+            # Legacy .xls cannot be streamed; read it whole once
+            frame = pd.read_excel(self.file_path, sheet_name=sheet_name or 0)
+            self.sheet_name = sheet_name
+            header = list(frame.columns)
+            self._rows = frame.itertuples(index=False, name=None)
+        else:
+            self._workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+            ws = self._workbook[sheet_name] if sheet_name else self._workbook.worksheets[0]
+            self.sheet_name = ws.title
+            self._rows = ws.iter_rows(values_only=True)
+            header = next(self._rows, None) or ()
+        
+        self.columns = [
+            str(name).strip() if name is not None else f"Unnamed: {index}"
+            for index, name in enumerate(header)
+        ]
+        self._width = len(self.columns)
+        self._consumed = False
+        
+        # Rows read ahead for type checks; handed out again by chunks()
+        self._sample_rows = list(itertools.islice(self._data_rows(), sample_rows))
+    
+    def _data_rows(self):
+        """Yield non-empty rows padded to the header width"""
+        for row in self._rows:
+            if row is None or all(value is None for value in row):
+                continue
+            if len(row) < self._width:
+                row = tuple(row) + (None,) * (self._width - len(row))
+            yield row
+    
+    @property
+    def sample(self):
+        """The sampled rows as a DataFrame"""
+        return pd.DataFrame.from_records(
+            [row[:self._width] for row in self._sample_rows], columns=self.columns
+        )
+    
+    def chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS, usecols=None, dtypes=None, output="pandas"):
+        """Yield the data rows as DataFrame (or NumPy record array) chunks"""
+        if output not in ("pandas", "numpy"):
+            raise ValueError(f"Unknown output format: {output}")
+        if self._consumed:
+            raise RuntimeError("Sheet rows have already been read")
+        self._consumed = True
+        
+        positions = _select_positions(self.columns, usecols)
+        columns = [self.columns[position] for position in positions]
+        
+        buffer = []
+        for row in itertools.chain(self._sample_rows, self._data_rows()):
+            buffer.append([row[position] for position in positions])
+            if len(buffer) >= chunk_rows:
+                yield self._build_chunk(buffer, columns, dtypes, output)
+                buffer = []
+        if buffer:
+            yield self._build_chunk(buffer, columns, dtypes, output)
+        self._sample_rows = []
+    
+    def read(self, usecols=None, dtypes=None):
+        """Read all remaining rows into one DataFrame"""
+        frames = list(self.chunks(usecols=usecols, dtypes=dtypes))
+        if not frames:
+            columns = [self.columns[position] for position in _select_positions(self.columns, usecols)]
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+    
+    def _build_chunk(self, rows, columns, dtypes, output):
+        """Turn buffered row values into a typed DataFrame or record array"""
+        chunk = _apply_dtypes(pd.DataFrame.from_records(rows, columns=columns), dtypes)
+        return chunk if output == "pandas" else chunk.to_records(index=False)
+    
+    def close(self):
+        """Release the workbook file"""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ExcelCache:
+    """Local cache of parsed sheets, so re-opening a workbook skips parsing
+    
+    Entries are keyed by the file's content hash and modification time plus
+    the sheet, usecols and dtypes requested and the reader that parsed it
+    ("stream" for ExcelSheetReader, "pandas" for pd.read_excel, which type
+    some columns differently), and stored in a columnar format:
+    Parquet when pyarrow is installed, otherwise NumPy .npz. When the cache
+    grows beyond max_bytes the least recently used entries are removed.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_BYTES):
+        if cache_dir is None:
+            self.cache_dir = Path(__file__).parent.parent / "data" / "cache" / "excel"
+        else:
+            self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None
+    
+    def _load_index(self):
+        """Read the entry index from disk on first use"""
+        if self._index is None:
+            try:
+                with open(self.cache_dir / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            self._index.setdefault("entries", {})
+            self._index.setdefault("hashes", {})
+        return self._index
+    
+    def _save_index(self):
+        """Write the entry index atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_dir / f"{self.INDEX_FILE}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        temp_path.replace(self.cache_dir / self.INDEX_FILE)
+    
+    def _content_hash(self, file_path, stat):
+        """Hash the file contents, reusing the last hash while size and mtime match"""
+        index = self._load_index()
+        path_key = str(Path(file_path).resolve())
+        known = index["hashes"].get(path_key)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+        
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+        index["hashes"][path_key] = [stat.st_mtime_ns, stat.st_size, content_hash]
+        return content_hash
+    
+    def cache_key(self, file_path, sheet_name=None, usecols=None, dtypes=None, reader="stream"):
+        """Return the cache key for a parse of file_path with these options"""
+        stat = os.stat(file_path)
+        parts = [
+            self._content_hash(file_path, stat),
+            stat.st_mtime_ns,
+            reader,
+            sheet_name,
+            list(usecols) if usecols is not None else None,
+            sorted((str(column), str(dtype)) for column, dtype in (dtypes or {}).items()),
+        ]
+        return hashlib.blake2b(json.dumps(parts, default=str).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get(self, file_path, sheet_name=None, usecols=None, dtypes=None, reader="stream"):
+        """Return the cached DataFrame, or None when it is not cached"""
+        try:
+            with self._lock:
+                key = self.cache_key(file_path, sheet_name, usecols, dtypes, reader)
+                entry = self._load_index()["entries"].get(key)
+                if entry is None:
+                    return None
+                entry_path = self.cache_dir / entry["file"]
+                if not entry_path.exists():
+                    del self._index["entries"][key]
+                    return None
+                entry["last_used"] = time.time()
+                self._save_index()
+            return self._read_entry(entry_path)
+        except Exception as e:
+            print(f"Error reading Excel cache: {e}")
+            return None
+    
+    def put(self, frame, file_path, sheet_name=None, usecols=None, dtypes=None, reader="stream"):
+        """Store a parsed DataFrame; returns success status"""
+        try:
+            with self._lock:
+                key = self.cache_key(file_path, sheet_name, usecols, dtypes, reader)
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                entry_path = self._write_entry(frame, key)
+                self._load_index()["entries"][key] = {
+                    "file": entry_path.name,
+                    "source": str(file_path),
+                    "bytes": entry_path.stat().st_size,
+                    "last_used": time.time(),
+                }
+                self._evict()
+                self._save_index()
+            return True
+        except Exception as e:
+            print(f"Error writing Excel cache: {e}")
+            return False
+    
+    def _evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = self._index["entries"]
+        total = sum(entry["bytes"] for entry in entries.values())
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+            total -= entry["bytes"]
+            del entries[key]
+    
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for entry in self._load_index()["entries"].values():
+                (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+            self._index = {"entries": {}, "hashes": {}}
+            if self.cache_dir.exists():
+                self._save_index()
+    
+    def _write_entry(self, frame, key):
+        """Write a DataFrame as Parquet (pyarrow) or .npz and return its path"""
+        if _parquet_available():
+            entry_path = self.cache_dir / f"{key}.parquet"
+            temp_path = self.cache_dir / f"{key}.parquet.tmp"
+            frame.to_parquet(temp_path, index=False)
+        else:
+            entry_path = self.cache_dir / f"{key}.npz"
+            temp_path = self.cache_dir / f"{key}.tmp.npz"
+            arrays = {}
+            for position, column in enumerate(frame.columns):
+                values = frame[column]
+                if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufmM":
+                    arrays[f"c{position}"] = values.to_numpy()
+                else:
+                    arrays[f"c{position}"] = values.astype(object).to_numpy()
+            arrays["__columns__"] = np.array(json.dumps([str(column) for column in frame.columns]))
+            np.savez(temp_path, **arrays)
+        temp_path.replace(entry_path)
+        return entry_path
+    
+    def _read_entry(self, entry_path):
+        """Load a cached DataFrame written by _write_entry"""
+        if entry_path.suffix == ".parquet":
+            return pd.read_parquet(entry_path)
+        with np.load(entry_path, allow_pickle=True) as arrays:
+            columns = json.loads(str(arrays["__columns__"]))
+            return pd.DataFrame({
+                column: arrays[f"c{position}"] for position, column in enumerate(columns)
+            })
+
+
 class ExcelHandler:
     """Utility class for Excel file operations"""
     
-    def __init__(self):
+    def __init__(self, cache=None):
         self.supported_formats = ['.xlsx', '.xls']
+        self.cache = cache if cache is not None else ExcelCache()
     
-    def read_excel(self, file_path, sheet_name=None):
-        """Read Excel file and return DataFrame"""
+    def read_excel(self, file_path, sheet_name=None, use_cache=True):
+        """Read Excel file and return DataFrame (from the parse cache when possible)"""
         try:
+            if use_cache:
+                df = self.cache.get(file_path, sheet_name, reader="pandas")
+                if df is not None:
+                    return df
+            
             if sheet_name:
                 df = pd.read_excel(file_path, sheet_name=sheet_name)
             else:
                 df = pd.read_excel(file_path)
+            
+            if use_cache:
+                self.cache.put(df, file_path, sheet_name, reader="pandas")
             return df
         except Exception as e:
             print(f"Error reading Excel file: {e}")
             return None
     
+    def read_sheet(self, file_path, sheet_name=None, usecols=None, dtypes=None, use_cache=True):
+        """Read a whole sheet through the streaming reader, cached by content
+        
+        Same column and dtype options as read_excel_chunks. A sheet already
+        parsed with the same options is loaded from the cache instead.
+        """
+        if use_cache:
+            df = self.cache.get(file_path, sheet_name, usecols, dtypes)
+            if df is not None:
+                return df
+        
+        with self.open_sheet(file_path, sheet_name) as reader:
+            df = reader.read(usecols=usecols, dtypes=dtypes)
+        
+        if use_cache:
+            self.cache.put(df, file_path, sheet_name, usecols, dtypes)
+        return df
+    
+    def open_sheet(self, file_path, sheet_name=None, sample_rows=0):
+        """Open a worksheet for header inspection and streaming (see ExcelSheetReader)"""
+        return ExcelSheetReader(file_path, sheet_name=sheet_name, sample_rows=sample_rows)
+    
+    def read_excel_chunks(self, file_path, sheet_name=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                          usecols=None, dtypes=None, output="pandas"):
+        """Stream a sheet in chunks of chunk_rows rows
+        
+        The workbook is opened read-only and rows are pulled one at a time,
+        so memory stays bounded by the chunk size and the first chunk is
+        available before the rest of the file has been parsed.
+        
+        sheet_name - sheet to read (first sheet if None)
+        usecols    - column names or 0-based positions to keep (all if None)
+        dtypes     - {column: dtype} conversions applied to every chunk
+        output     - "pandas" for DataFrames, "numpy" for NumPy record arrays
+        
+        The first row is the header. Empty rows are skipped. Legacy .xls files
+        cannot be streamed, so they are read whole and then split into chunks.
+        """
+        with self.open_sheet(file_path, sheet_name) as reader:
+            yield from reader.chunks(chunk_rows, usecols=usecols, dtypes=dtypes, output=output)
+    
     def write_excel(self, data, file_path, sheet_name='Sheet1'):
         """Write data to Excel file"""
         try:
@@ -43,69 +425,105 @@ class ExcelHandler:
             print(f"Error writing Excel file: {e}")
             return False
     
+    def _register_styles(self, wb):
+        """Add the shared named styles to a workbook, once per workbook"""
+        thin = Side(style='thin')
+        border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        
+        title_style = NamedStyle(name=TITLE_STYLE)
+        title_style.font = Font(size=16, bold=True)
+        title_style.alignment = Alignment(horizontal='center')
+        
+        header_style = NamedStyle(name=HEADER_STYLE)
+        header_style.font = Font(bold=True)
+        header_style.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        header_style.alignment = Alignment(horizontal='center')
+        header_style.border = border
+        
+        cell_style = NamedStyle(name=CELL_STYLE)
+        cell_style.border = border
+        
+        for style in (title_style, header_style, cell_style):
+            wb.add_named_style(style)
+    
+    def _column_widths(self, df):
+        """Auto-fit widths for every column in one vectorized pass
+        
+        Width is the longest of the header and the values' string forms,
+        plus padding, capped at MAX_COLUMN_WIDTH.
+        """
+        widths = []
+        for column in df.columns:
+            values = df[column]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                # Written with Excel's "yyyy-mm-dd h:mm:ss" format
+                longest = DATETIME_DISPLAY_WIDTH
+            else:
+                longest = values.astype(str).str.len().max() if len(values) else 0
+            longest = max(int(longest) if pd.notna(longest) else 0, len(str(column)))
+            widths.append(min(longest + 2, MAX_COLUMN_WIDTH))
+        return widths
+    
+    def _write_frame(self, ws, df, title=None, bordered=False):
+        """Stream a DataFrame into a write-only worksheet
+        
+        Column widths are set before any row is written (write-only sheets
+        cannot be changed afterwards). Cells reference the shared named
+        styles instead of carrying their own Font/Fill/Border objects.
+        """
+        for index, width in enumerate(self._column_widths(df), 1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+        
+        if title:
+            title_cell = WriteOnlyCell(ws, value=title)
+            title_cell.style = TITLE_STYLE
+            ws.append([title_cell])
+            ws.merged_cells.add(f"A1:{get_column_letter(max(len(df.columns), 4))}1")
+            ws.row_dimensions[1].height = 30
+            ws.append([])
+        
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(ws, value=str(column))
+            cell.style = HEADER_STYLE
+            header.append(cell)
+        ws.append(header)
+        
+        if bordered:
+            for row in self._frame_rows(df):
+                cells = []
+                for value in row:
+                    # Style first: assigning the value then adds a date format if needed
+                    cell = WriteOnlyCell(ws)
+                    cell.style = CELL_STYLE
+                    cell.value = value
+                    cells.append(cell)
+                ws.append(cells)
+        else:
+            for row in self._frame_rows(df):
+                ws.append(row)
+    
+    def _frame_rows(self, df, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield a DataFrame's rows as tuples, missing values as None
+        
+        Rows are converted one slice of chunk_rows at a time, so only one
+        slice is ever held as Python objects next to the frame.
+        """
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            values = chunk.astype(object).where(chunk.notna(), None)
+            yield from values.itertuples(index=False, name=None)
+    
     def create_formatted_excel(self, data, file_path, sheet_name='Sheet1', title=None):
         """Create formatted Excel file with styling"""
         try:
-            # Create workbook and worksheet
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = sheet_name
-            
-            # Add title if provided
-            if title:
-                ws['A1'] = title
-                ws['A1'].font = Font(size=16, bold=True)
-                ws.merge_cells('A1:D1')
-                ws['A1'].alignment = Alignment(horizontal='center')
-                ws.row_dimensions[1].height = 30
-                
-                # Start data from row 3
-                start_row = 3
-            else:
-                start_row = 1
+            df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
             
-            # Convert data to rows
-            if isinstance(data, pd.DataFrame):
-                rows = dataframe_to_rows(data, index=False, header=True)
-            else:
-                df = pd.DataFrame(data)
-                rows = dataframe_to_rows(df, index=False, header=True)
-            
-            # Add data to worksheet
-            for r_idx, row in enumerate(rows, start_row):
-                for c_idx, value in enumerate(row, 1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                    
-                    # Style header row
-                    if r_idx == start_row:
-                        cell.font = Font(bold=True)
-                        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                        cell.alignment = Alignment(horizontal='center')
-            
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Add borders
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            for row in ws.iter_rows(min_row=start_row):
-                for cell in row:
-                    cell.border = thin_border
+            # Write-only workbook: rows go straight to disk as they are added
+            wb = openpyxl.Workbook(write_only=True)
+            self._register_styles(wb)
+            ws = wb.create_sheet(sheet_name)
+            self._write_frame(ws, df, title=title, bordered=True)
             
             # Save workbook
             wb.save(file_path)
@@ -117,19 +535,66 @@ class ExcelHandler:
     
     def validate_excel_structure(self, file_path, required_columns):
         """Validate Excel file has required columns"""
+        valid, message, reader = self.validate_excel_header(file_path, required_columns)
+        if reader is not None:
+            reader.close()
+        return valid, message
+    
+    def validate_excel_header(self, file_path, required_columns, sheet_name=None,
+                              sample_rows=0, column_types=None):
+        """Validate a sheet from its header row without parsing the data
+        
+        column_types optionally maps columns to "numeric", "date" or "text";
+        the first sample_rows rows are then checked against them.
+        Returns (valid, message, reader). When valid, reader is an open
+        ExcelSheetReader positioned at the data, so the caller can process the
+        file without reading it again; close it when done. reader is None
+        when the file is invalid.
+        """
         try:
-            df = self.read_excel(file_path)
-            if df is None:
-                return False, "Could not read Excel file"
-            
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            reader = self.open_sheet(file_path, sheet_name=sheet_name, sample_rows=sample_rows)
+        except Exception as e:
+            return False, f"Error validating file: {str(e)}", None
+        
+        try:
+            missing_columns = [col for col in required_columns if col not in reader.columns]
             if missing_columns:
-                return False, f"Missing required columns: {', '.join(missing_columns)}"
+                reader.close()
+                return False, f"Missing required columns: {', '.join(missing_columns)}", None
+            
+            problems = self._check_column_types(reader.sample, column_types or {})
+            if problems:
+                reader.close()
+                return False, "; ".join(problems), None
             
-            return True, "File structure is valid"
+            return True, "File structure is valid", reader
             
         except Exception as e:
-            return False, f"Error validating file: {str(e)}"
+            reader.close()
+            return False, f"Error validating file: {str(e)}", None
+    
+    def _check_column_types(self, sample, column_types):
+        """Describe sampled columns whose values do not match the expected type"""
+        problems = []
+        for column, expected in column_types.items():
+            if expected not in COLUMN_TYPE_CHECKS:
+                raise ValueError(f"Unknown column type check: {expected}")
+            if column not in sample.columns:
+                continue
+            values = sample[column].dropna()
+            if expected == "numeric":
+                bad = values[pd.to_numeric(values, errors='coerce').isna()]
+            elif expected == "date":
+                # Parsed one by one: sheets often mix ISO and DD/MM/YYYY dates
+                bad = values[[
+                    pd.isna(pd.to_datetime(value, errors='coerce', dayfirst=isinstance(value, str) and '/' in value))
+                    for value in values
+                ]]
+            else:
+                bad = values.iloc[0:0]
+            if not bad.empty:
+                problems.append(f"Column '{column}' has {len(bad)} invalid {expected} value(s), e.g. {bad.iloc[0]!r}")
+        return problems
     
     def get_sheet_names(self, file_path):
         """Get list of sheet names from Excel file"""
@@ -143,25 +608,24 @@ class ExcelHandler:
     def create_summary_sheet(self, data, file_path, summary_title="Summary"):
         """Create Excel file with summary sheet"""
         try:
-            wb = openpyxl.Workbook()
+            wb = openpyxl.Workbook(write_only=True)
+            self._register_styles(wb)
             
             # Summary sheet
-            summary_ws = wb.active
-            summary_ws.title = "Summary"
+            summary_ws = wb.create_sheet("Summary")
             
             # Add summary information
-            summary_ws['A1'] = summary_title
-            summary_ws['A1'].font = Font(size=16, bold=True)
-            
-            summary_ws['A3'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            summary_ws['A4'] = f"Total Records: {len(data) if isinstance(data, (list, pd.DataFrame)) else 'N/A'}"
+            title_cell = WriteOnlyCell(summary_ws, value=summary_title)
+            title_cell.style = TITLE_STYLE
+            summary_ws.append([title_cell])
+            summary_ws.append([])
+            summary_ws.append([f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+            summary_ws.append([f"Total Records: {len(data) if isinstance(data, (list, pd.DataFrame)) else 'N/A'}"])
             
             # Data sheet
             if isinstance(data, pd.DataFrame):
                 data_ws = wb.create_sheet("Data")
-                for r_idx, row in enumerate(dataframe_to_rows(data, index=False, header=True), 1):
-                    for c_idx, value in enumerate(row, 1):
-                        data_ws.cell(row=r_idx, column=c_idx, value=value)
+                self._write_frame(data_ws, data)
             
             wb.save(file_path)
             return True
@@ -173,28 +637,19 @@ class ExcelHandler:
     def export_to_multiple_sheets(self, data_dict, file_path):
         """Export multiple datasets to different sheets in one Excel file"""
         try:
-            wb = openpyxl.Workbook()
-            
-            # Remove default sheet
-            wb.remove(wb.active)
+            wb = openpyxl.Workbook(write_only=True)
+            self._register_styles(wb)
             
             for sheet_name, data in data_dict.items():
                 ws = wb.create_sheet(sheet_name)
                 
-                if isinstance(data, pd.DataFrame):
-                    for r_idx, row in enumerate(dataframe_to_rows(data, index=False, header=True), 1):
-                        for c_idx, value in enumerate(row, 1):
-                            ws.cell(row=r_idx, column=c_idx, value=value)
-                else:
-                    # Handle list/dict data
-                    df = pd.DataFrame(data)
-                    for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), 1):
-                        for c_idx, value in enumerate(row, 1):
-                            ws.cell(row=r_idx, column=c_idx, value=value)
+                # Handle list/dict data as well as DataFrames
+                df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+                self._write_frame(ws, df)
             
             wb.save(file_path)
             return True
             
         except Exception as e:
             print(f"Error exporting to multiple sheets: {e}")
-            return False
\ No newline at end of file
+            return False
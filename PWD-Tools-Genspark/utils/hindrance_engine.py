@@ -0,0 +1,178 @@
+"""
+Hindrance Engine for PWD Tools Desktop Application
+Merges hindrance-register periods and measures the delay they excuse, for any number of works
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Hindrance sheet column headings -> engine fields
+HINDRANCE_COLUMNS = {
+    'work_name': 'Work Name',
+    'start': 'From',
+    'end': 'To',
+}
+HINDRANCE_SHEET = "Hindrances"
+# Time extension goes to the Superintending Engineer when the delay exceeds
+# half the scheduled duration by more than this many days
+HALF_SCHEDULE_MARGIN_DAYS = 1
+
+# "from - to" / "from to to" on one line of a hindrance list
+PERIOD_SEPARATOR = re.compile(r"\s+to\s+|\s+-\s+|\s*–\s*", re.IGNORECASE)
+
+
+def needs_se_approval(delay_days, schedule_days):
+    """The half-schedule rule, for scalars or whole arrays of works"""
+    return np.asarray(delay_days) > np.asarray(schedule_days) / 2 + HALF_SCHEDULE_MARGIN_DAYS
+
+
+def _day_numbers(values):
+    """Dates as int64 days since the epoch; missing dates give -1 and a False mask
+
+    Text dates are parsed like the works register's (see delay_engine.to_dates).
+    """
+    # Imported here: delay_engine imports this module
+    from utils.delay_engine import to_dates
+
+    dates = to_dates(values).to_numpy(dtype='datetime64[D]')
+    present = ~np.isnat(dates)
+    return np.where(present, dates.astype(np.int64), -1), present
+
+
+def _sweep(codes, starts, stops):
+    """Merge half-open [start, stop) day intervals per code by sort-and-sweep
+
+    Intervals are sorted by (code, start) once. A running maximum of the
+    stops, kept per code by offsetting each code's values above the
+    previous one's, marks where a new merged period begins: wherever the
+    code changes or a start lies beyond every stop seen so far. Returns
+    (codes, starts, stops) of the merged periods.
+    """
+    if not len(codes):
+        return codes, starts, stops
+
+    order = np.lexsort((starts, codes))
+    codes, starts, stops = codes[order], starts[order], stops[order]
+
+    base = starts.min()
+    span = int(stops.max() - base) + 1
+    offset = codes.astype(np.int64) * span - base
+    reach = np.maximum.accumulate(stops + offset) - offset
+
+    new_period = np.ones(len(codes), dtype=bool)
+    new_period[1:] = (codes[1:] != codes[:-1]) | (starts[1:] > reach[:-1])
+    firsts = np.flatnonzero(new_period)
+    return codes[firsts], starts[firsts], np.maximum.reduceat(stops, firsts)
+
+
+def merge_hindrances(hindrances, windows=None, key='work_name'):
+    """Merge overlapping hindrance periods of every work at once
+
+    hindrances has one row per register entry with key, 'start' and 'end'
+    columns (dates, both days included). windows, when given, is a
+    DataFrame indexed by key with 'window_start' and 'window_end'; the
+    parts of a hindrance outside its work's window are dropped, and
+    hindrances of works not in windows are ignored.
+    Returns a DataFrame of merged periods: key, start, end, days.
+    """
+    empty = pd.DataFrame({key: [], 'start': pd.to_datetime([]), 'end': pd.to_datetime([]), 'days': []})
+    if hindrances is None or not len(hindrances):
+        return empty
+
+    starts, has_start = _day_numbers(hindrances['start'])
+    ends, has_end = _day_numbers(hindrances['end'])
+    stops = ends + 1
+    keep = has_start & has_end
+
+    if windows is not None:
+        position = windows.index.get_indexer(hindrances[key])
+        known = position >= 0
+        window_start, has_window_start = _day_numbers(windows['window_start'])
+        window_end, has_window_end = _day_numbers(windows['window_end'])
+        position = np.where(known, position, 0)
+        keep &= known & has_window_start[position] & has_window_end[position]
+        starts = np.maximum(starts, window_start[position])
+        stops = np.minimum(stops, window_end[position] + 1)
+        codes = position
+        labels = windows.index
+    else:
+        codes, labels = pd.factorize(hindrances[key])
+        keep &= codes >= 0
+
+    keep &= stops > starts
+    codes, starts, stops = _sweep(codes[keep], starts[keep], stops[keep])
+    if not len(codes):
+        return empty
+    return pd.DataFrame({
+        key: np.asarray(labels)[codes],
+        'start': starts.astype('datetime64[D]').astype('datetime64[ns]'),
+        'end': (stops - 1).astype('datetime64[D]').astype('datetime64[ns]'),
+        'days': stops - starts,
+    })
+
+
+def hindrance_days(hindrances, windows, key='work_name'):
+    """Days covered by each work's merged hindrances inside its window
+
+    Returns an int64 array aligned with windows' rows. A key repeated in
+    windows is measured against the window of its first row.
+    """
+    merged = merge_hindrances(hindrances, windows[~windows.index.duplicated()], key)
+    totals = merged.groupby(key, sort=False)['days'].sum()
+    return totals.reindex(windows.index).fillna(0).to_numpy(dtype=np.int64)
+
+
+def parse_hindrance_text(text, date_format="%d/%m/%Y"):
+    """Parse one hindrance period per line, e.g. '01/02/2024 - 15/02/2024'
+
+    A line with a single date is a one-day hindrance. Returns
+    (periods, bad_lines); periods is a list of (start, end) datetimes.
+    """
+    periods = []
+    bad_lines = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        parts = [part.strip() for part in PERIOD_SEPARATOR.split(line) if part.strip()]
+        try:
+            if len(parts) not in (1, 2):
+                raise ValueError(line)
+            start = pd.to_datetime(parts[0], format=date_format).to_pydatetime()
+            end = pd.to_datetime(parts[-1], format=date_format).to_pydatetime()
+            if end < start:
+                raise ValueError(line)
+            periods.append((start, end))
+        except ValueError:
+            bad_lines.append(line)
+    return periods, bad_lines
+
+
+def periods_frame(periods, key_value=0, key='work_name'):
+    """Hindrance rows for one work from a list of (start, end) dates"""
+    return pd.DataFrame({
+        key: [key_value] * len(periods),
+        'start': pd.to_datetime([start for start, _ in periods]),
+        'end': pd.to_datetime([end for _, end in periods]),
+    })
+
+
+def read_hindrance_register(file_path, sheet_name=HINDRANCE_SHEET, excel_handler=None):
+    """Read the hindrance sheet of a works register; None when the workbook has none"""
+    try:
+        if excel_handler is None:
+            from utils.excel_handler import ExcelHandler
+            excel_handler = ExcelHandler()
+        if sheet_name not in excel_handler.get_sheet_names(file_path):
+            return None
+        sheet = excel_handler.read_sheet(file_path, sheet_name)
+    except Exception as e:
+        print(f"Error reading hindrance register: {e}")
+        return None
+
+    if not all(heading in sheet.columns for heading in HINDRANCE_COLUMNS.values()):
+        print(f"Hindrance sheet needs columns: {', '.join(HINDRANCE_COLUMNS.values())}")
+        return None
+    return pd.DataFrame({field: sheet[heading] for field, heading in HINDRANCE_COLUMNS.items()})
@@ -0,0 +1,195 @@
+"""
+Indian Numbering Utilities for PWD Tools Desktop Application
+Amounts in words (English and Hindi) and rupee formatting with lakh grouping
+"""
+
+from functools import lru_cache
+
+WORDS_CACHE_SIZE = 65536
+
+_ENGLISH_ONES = [
+    "", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine",
+    "Ten", "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen",
+    "Seventeen", "Eighteen", "Nineteen"
+]
+_ENGLISH_TENS = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
+
+# Hindi numbers below one hundred are individual words, not tens + ones
+_HINDI_BELOW_HUNDRED = [
+    "", "एक", "दो", "तीन", "चार", "पाँच", "छह", "सात", "आठ", "नौ",
+    "दस", "ग्यारह", "बारह", "तेरह", "चौदह", "पंद्रह", "सोलह", "सत्रह", "अठारह", "उन्नीस",
+    "बीस", "इक्कीस", "बाईस", "तेईस", "चौबीस", "पच्चीस", "छब्बीस", "सत्ताईस", "अट्ठाईस", "उनतीस",
+    "तीस", "इकतीस", "बत्तीस", "तैंतीस", "चौंतीस", "पैंतीस", "छत्तीस", "सैंतीस", "अड़तीस", "उनतालीस",
+    "चालीस", "इकतालीस", "बयालीस", "तैंतालीस", "चवालीस", "पैंतालीस", "छियालीस", "सैंतालीस", "अड़तालीस", "उनचास",
+    "पचास", "इक्यावन", "बावन", "तिरेपन", "चौवन", "पचपन", "छप्पन", "सत्तावन", "अट्ठावन", "उनसठ",
+    "साठ", "इकसठ", "बासठ", "तिरेसठ", "चौंसठ", "पैंसठ", "छियासठ", "सड़सठ", "अड़सठ", "उनहत्तर",
+    "सत्तर", "इकहत्तर", "बहत्तर", "तिहत्तर", "चौहत्तर", "पचहत्तर", "छिहत्तर", "सतहत्तर", "अठहत्तर", "उन्यासी",
+    "अस्सी", "इक्यासी", "बयासी", "तिरासी", "चौरासी", "पचासी", "छियासी", "सत्तासी", "अट्ठासी", "नवासी",
+    "नब्बे", "इक्यानवे", "बानवे", "तिरानवे", "चौरानवे", "पचानवे", "छियानवे", "सत्तानवे", "अट्ठानवे", "निन्यानवे",
+]
+
+# Scale words and special cases per language
+LANGUAGES = {
+    "en": {
+        "hundred": "Hundred", "thousand": "Thousand", "lakh": "Lakh", "crore": "Crore",
+        "zero": "Zero", "minus": "Minus",
+    },
+    "hi": {
+        "hundred": "सौ", "thousand": "हज़ार", "lakh": "लाख", "crore": "करोड़",
+        "zero": "शून्य", "minus": "ऋण",
+    },
+}
+
+
+def _english_below_hundred(n):
+    if n < 20:
+        return _ENGLISH_ONES[n]
+    return f"{_ENGLISH_TENS[n // 10]} {_ENGLISH_ONES[n % 10]}".strip()
+
+
+def _build_below_thousand(below_hundred, hundred):
+    """Return the words for 0-999 as a lookup table"""
+    table = []
+    for n in range(1000):
+        words = below_hundred(n % 100)
+        if n >= 100:
+            words = f"{below_hundred(n // 100)} {hundred} {words}".strip()
+        table.append(words)
+    return table
+
+
+_BELOW_THOUSAND = {
+    "en": _build_below_thousand(_english_below_hundred, LANGUAGES["en"]["hundred"]),
+    "hi": _build_below_thousand(_HINDI_BELOW_HUNDRED.__getitem__, LANGUAGES["hi"]["hundred"]),
+}
+
+
+def _integer_words(n, language):
+    """Words for a non-negative integer using crore/lakh/thousand grouping"""
+    table = _BELOW_THOUSAND[language]
+    scale = LANGUAGES[language]
+    parts = []
+    crores, n = divmod(n, 10000000)
+    if crores:
+        # Amounts of 100 crore and more repeat the grouping for the crores
+        parts.append(f"{_integer_words(crores, language)} {scale['crore']}")
+    lakhs, n = divmod(n, 100000)
+    if lakhs:
+        parts.append(f"{table[lakhs]} {scale['lakh']}")
+    thousands, n = divmod(n, 1000)
+    if thousands:
+        parts.append(f"{table[thousands]} {scale['thousand']}")
+    if n:
+        parts.append(table[n])
+    return " ".join(parts)
+
+
+@lru_cache(maxsize=WORDS_CACHE_SIZE)
+def number_to_words(number, language="en"):
+    """Return an integer in words, e.g. 123456 -> One Lakh Twenty Three Thousand Four Hundred Fifty Six"""
+    number = int(number)
+    scale = LANGUAGES[language]
+    if number == 0:
+        return scale["zero"]
+    if number < 0:
+        return f"{scale['minus']} {_integer_words(-number, language)}"
+    return _integer_words(number, language)
+
+
+@lru_cache(maxsize=WORDS_CACHE_SIZE)
+def _paise_words(total_paise, language):
+    """Full amount phrase for an amount given in paise"""
+    negative = total_paise < 0
+    rupees, paise = divmod(abs(total_paise), 100)
+    if language == "hi":
+        parts = []
+        if rupees or not paise:
+            parts.append(f"{number_to_words(rupees, 'hi')} {'रुपया' if rupees == 1 else 'रुपये'}")
+        if paise:
+            parts.append(f"{number_to_words(paise, 'hi')} {'पैसा' if paise == 1 else 'पैसे'}")
+        words = " और ".join(parts) + " मात्र"
+        return f"ऋण {words}" if negative else words
+
+    if rupees or not paise:
+        words = f"Rupees {number_to_words(rupees)}"
+        if paise:
+            words += f" and {number_to_words(paise)} {'Paisa' if paise == 1 else 'Paise'}"
+    else:
+        words = f"{number_to_words(paise)} {'Paisa' if paise == 1 else 'Paise'}"
+    words += " Only"
+    return f"Minus {words}" if negative else words
+
+
+def to_paise(amount):
+    """Round an amount in rupees to whole paise"""
+    return int(round(float(amount) * 100))
+
+
+def amount_to_words(amount, language="en"):
+    """Return a rupee amount as it is written on receipts
+
+    English: Rupees One Lakh Twenty Three Thousand Four Hundred Fifty Six and Fifty Paise Only
+    Hindi:   एक लाख तेईस हज़ार चार सौ छप्पन रुपये और पचास पैसे मात्र
+    """
+    return _paise_words(to_paise(amount), language)
+
+
+def _map_unique(values, convert, empty=""):
+    """Apply convert once per distinct amount of an array or Series"""
+    # numpy/pandas are only needed for bulk conversion; keep them off the startup path
+    import numpy as np
+    import pandas as pd
+
+    index = values.index if isinstance(values, pd.Series) else None
+    amounts = pd.to_numeric(pd.Series(np.asarray(values).ravel()), errors="coerce").to_numpy(dtype="float64")
+    valid = np.isfinite(amounts)
+    result = np.full(len(amounts), empty, dtype=object)
+    if valid.any():
+        paise = np.rint(amounts[valid] * 100).astype(np.int64)
+        unique_paise, inverse = np.unique(paise, return_inverse=True)
+        converted = np.array([convert(int(value)) for value in unique_paise], dtype=object)
+        result[valid] = converted[inverse]
+    if index is not None:
+        return pd.Series(result, index=index, dtype=object)
+    return result.reshape(np.shape(values))
+
+
+def amounts_to_words(values, language="en"):
+    """amount_to_words for a whole Series or array; missing amounts give ''
+
+    Each distinct amount is converted once, so repeated values cost a
+    single lookup. Returns a Series for Series input, otherwise an array.
+    """
+    return _map_unique(values, lambda paise: _paise_words(paise, language))
+
+
+def format_indian_number(amount, decimals=2):
+    """Format a number with lakh/crore digit grouping, e.g. 12,34,567.50"""
+    text = f"{abs(float(amount)):.{decimals}f}"
+    whole, _, fraction = text.partition(".")
+    if len(whole) > 3:
+        head, tail = whole[:-3], whole[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        whole = ",".join(groups + [tail])
+    sign = "-" if float(amount) < 0 and float(text) != 0 else ""
+    return f"{sign}{whole}.{fraction}" if fraction else f"{sign}{whole}"
+
+
+def format_inr(amount, decimals=2, symbol="₹"):
+    """Format a rupee amount, e.g. ₹12,34,567.50"""
+    text = format_indian_number(amount, decimals)
+    if text.startswith("-"):
+        return f"-{symbol}{text[1:]}"
+    return f"{symbol}{text}"
+
+
+def format_inr_many(values, decimals=2, symbol="₹"):
+    """format_inr for a whole Series or array; missing amounts give ''"""
+    if decimals > 2:
+        raise ValueError("format_inr_many supports at most 2 decimals")
+    return _map_unique(values, lambda paise: format_inr(paise / 100, decimals, symbol))
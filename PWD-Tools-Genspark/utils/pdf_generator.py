@@ -2,7 +2,6 @@
 PDF Generation Utilities for PWD Tools Desktop Application
 """
 
-from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from reportlab.lib import colors
@@ -10,6 +9,7 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from datetime import datetime
 import os
+from utils.receipt_renderer import ReceiptRenderer
 
 class PDFGenerator:
     """Utility class for generating PDF reports"""
@@ -18,6 +18,7 @@ class PDFGenerator:
         self.settings = settings
         self.styles = getSampleStyleSheet()
         self.page_width, self.page_height = A4
+        self.receipt_renderer = None
         
     def generate_bill_note_pdf(self, filename, bill_data):
         """Generate PDF for bill note sheet"""
@@ -70,23 +71,17 @@ class PDFGenerator:
         """Create bill note PDF (wrapper method)"""
         return self.generate_bill_note_pdf(file_path, bill_data)
     
-    def html_to_pdf(self, html_file, pdf_file):
-        """Convert HTML file to PDF (placeholder implementation)"""
-        try:
-            # This is a simplified implementation
-            # In production, you'd use weasyprint or similar
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import A4
-            
-            c = canvas.Canvas(pdf_file, pagesize=A4)
-            c.drawString(100, 750, "HTML to PDF conversion")
-            c.drawString(100, 700, f"Source: {html_file}")
-            c.drawString(100, 650, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            c.save()
-            return True
-        except Exception as e:
-            print(f"Error converting HTML to PDF: {e}")
-            return False
+    def generate_receipt_pdf(self, filename, receipt_data):
+        """Generate PDF for an RPWA 28 hand receipt"""
+        if self.receipt_renderer is None:
+            self.receipt_renderer = ReceiptRenderer(self.settings)
+        return self.receipt_renderer.render(filename, receipt_data)
+    
+    def generate_receipt_batch_pdf(self, filename, receipts, per_page=1, index_file=None):
+        """Generate one multi-page PDF of RPWA 28 hand receipts"""
+        if self.receipt_renderer is None:
+            self.receipt_renderer = ReceiptRenderer(self.settings)
+        return self.receipt_renderer.render_batch(filename, receipts, per_page, index_file)
     
     def generate_emd_refund_pdf(self, filename, emd_data):
         """Generate PDF for EMD refund calculation"""
@@ -183,25 +178,3 @@ class PDFGenerator:
         except Exception as e:
             print(f"Error generating PDF: {e}")
             return False
-    
-    def create_bill_note_pdf(self, bill_data, file_path):
-        """Create bill note PDF (wrapper method)"""
-        return self.generate_bill_note_pdf(file_path, bill_data)
-    
-    def html_to_pdf(self, html_file, pdf_file):
-        """Convert HTML file to PDF (placeholder implementation)"""
-        try:
-            # This is a simplified implementation
-            # In production, you'd use weasyprint or similar
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import A4
-            
-            c = canvas.Canvas(pdf_file, pagesize=A4)
-            c.drawString(100, 750, "HTML to PDF conversion")
-            c.drawString(100, 700, f"Source: {html_file}")
-            c.drawString(100, 650, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            c.save()
-            return True
-        except Exception as e:
-            print(f"Error converting HTML to PDF: {e}")
-            return False
@@ -0,0 +1,321 @@
+"""
+Receipt Generation Engine for PWD Tools Desktop Application
+Renders receipt PDFs in worker processes and reports progress to the GUI
+"""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+from utils.receipt_renderer import ReceiptRenderer, concatenate_pdfs, write_batch_index
+
+# Receipts handed to a worker per task; small enough for smooth progress
+DEFAULT_CHUNK_RECEIPTS = 200
+# Workers report progress after this many receipts
+PROGRESS_EVERY = 25
+
+# Per-process state set up once by _init_worker
+_renderer = None
+_messages = None
+_cancel_event = None
+
+
+def _init_worker(settings, messages, cancel_event):
+    """Load fonts and compile the receipt layout once per worker process"""
+    global _renderer, _messages, _cancel_event
+    _renderer = ReceiptRenderer(settings)
+    _messages = messages
+    _cancel_event = cancel_event
+
+
+def _tracked(receipts):
+    """Yield receipts until cancelled, reporting progress as they are consumed"""
+    pending = 0
+    for receipt in receipts:
+        if _cancel_event.is_set():
+            break
+        yield receipt
+        pending += 1
+        if pending == PROGRESS_EVERY:
+            _messages.put(("progress", pending))
+            pending = 0
+    if pending:
+        _messages.put(("progress", pending))
+
+
+def _render_files(start, receipts):
+    """Worker task: render each receipt of a chunk to its own PDF file
+
+    Returns (start, [pdf file or None for each receipt]).
+    """
+    pdf_files = [None] * len(receipts)
+    for offset, receipt in enumerate(_tracked(receipts)):
+        if _renderer.render(receipt['pdf_file'], receipt):
+            pdf_files[offset] = receipt['pdf_file']
+    return start, pdf_files
+
+
+def _render_part(start, receipts, part_file, per_page):
+    """Worker task: render one chunk of a batch into its own part PDF
+
+    Every chunk starts on a new sheet, so the parts concatenated in order
+    give the same pages as one canvas would. The part only appears under
+    its name once complete, since part files may be kept and reused.
+    Returns (start, rendered); a failed or cancelled part is removed.
+    """
+    temp_file = f"{part_file}.tmp"
+    entries = _renderer.render_batch(temp_file, _tracked(receipts), per_page)
+    if entries is None or len(entries) < len(receipts):
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        return start, False
+    os.replace(temp_file, part_file)
+    return start, True
+
+
+def _merge_parts(part_files, filename):
+    """Worker task: concatenate the part PDFs of a batch in page order"""
+    return concatenate_pdfs(part_files, filename)
+
+
+def _render_batch(receipts, filename, per_page, index_file):
+    """Worker task: render all receipts into one multi-page PDF
+
+    Used for a batch of one chunk and when part PDFs cannot be joined: a
+    single canvas cannot be shared between processes, so the whole batch
+    is written by one worker. Returns index entries, or None when
+    rendering failed or was cancelled (the partial file is removed).
+    """
+    entries = _renderer.render_batch(filename, _tracked(receipts), per_page)
+    if entries is None or _cancel_event.is_set():
+        if os.path.exists(filename):
+            os.remove(filename)
+        return None
+    if index_file is not None:
+        write_batch_index(index_file, entries)
+    return entries
+
+
+def batch_chunks(count, per_page, chunk_size=DEFAULT_CHUNK_RECEIPTS):
+    """Split a batch of count receipts into (start, stop) chunks of whole sheets"""
+    size = max(per_page, chunk_size - chunk_size % per_page)
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def batch_index_entries(receipts, per_page):
+    """Index entries of a batch PDF; receipts fill the sheets in order"""
+    return [
+        {
+            'receipt_number': receipt.get('receipt_number', ''),
+            'payee': receipt.get('payee', ''),
+            'amount': receipt.get('amount', 0),
+            'page': position // per_page + 1,
+            'position': position % per_page + 1
+        }
+        for position, receipt in enumerate(receipts)
+    ]
+
+
+class ReceiptGenerationEngine:
+    """Generates receipt PDFs in a process pool without blocking Tk
+
+    start() returns immediately. Workers are started with the renderer
+    (fonts and compiled layout) already loaded and receive the receipts
+    in chunks. Progress and the final result arrive on self.messages,
+    which the GUI drains from an after() callback with poll():
+
+        ("progress", done, total)
+        ("done", {"pdf_files": [...], "pages": [...], "cancelled": bool})
+        ("error", message)
+
+    A batch that could not be rendered, other than by cancelling, ends
+    with "error"; separate files that failed are None in pdf_files.
+    """
+
+    def __init__(self, settings=None, max_workers=None, chunk_size=DEFAULT_CHUNK_RECEIPTS):
+        self.settings = settings
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.messages = queue.Queue()
+        self.running = False
+        self._executor = None
+        self._worker_messages = None
+        self._cancel_event = None
+        self._part_dir = None
+        self._done = 0
+        self._total = 0
+
+    def start(self, receipts, per_page=None, batch_file=None, index_file=None, part_files=None, reuse=()):
+        """Start rendering in the background
+
+        With per_page None every receipt is written to its own
+        receipt['pdf_file'], spread over all workers in chunks. Otherwise
+        all receipts go into batch_file with per_page receipts per sheet:
+        each chunk of whole sheets is rendered to a part PDF by the
+        workers and one worker then joins the parts in order. A batch of
+        one chunk, or one whose parts cannot be joined, is drawn on a
+        single canvas by one worker instead.
+
+        part_files, when given, names the part PDF of every chunk of
+        batch_chunks() and the parts are kept after joining; the chunks
+        numbered in reuse already have an up-to-date part and are only
+        joined, not rendered again.
+        """
+        if self.running:
+            raise RuntimeError("Receipt generation is already running")
+        receipts = list(receipts)
+        self._done = 0
+        self._total = len(receipts)
+        self._part_dir = None
+        reuse = set(reuse)
+        if per_page is None:
+            chunks = [
+                (start, receipts[start:start + self.chunk_size])
+                for start in range(0, len(receipts), self.chunk_size)
+            ]
+        else:
+            chunks = [
+                (start, receipts[start:stop])
+                for start, stop in batch_chunks(len(receipts), per_page, self.chunk_size)
+            ]
+            if part_files is not None:
+                if len(part_files) != len(chunks):
+                    raise ValueError("One part file is needed per chunk of the batch")
+                part_files = [str(part_file) for part_file in part_files]
+            elif len(chunks) > 1:
+                self._part_dir = tempfile.mkdtemp(prefix="parts_", dir=os.path.dirname(os.path.abspath(batch_file)))
+                part_files = [os.path.join(self._part_dir, f"part_{number:05d}.pdf") for number in range(len(chunks))]
+            self._total = sum(len(chunk) for number, (_, chunk) in enumerate(chunks) if number not in reuse)
+        workers = max(1, min(self.max_workers, len(chunks) - len(reuse)))
+
+        context = multiprocessing.get_context("spawn")
+        self._worker_messages = context.Queue()
+        self._cancel_event = context.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.settings, self._worker_messages, self._cancel_event)
+        )
+        self.running = True
+
+        if per_page is None:
+            futures = [self._executor.submit(_render_files, start, chunk) for start, chunk in chunks]
+            gather, args = self._gather_files, (futures, len(receipts))
+        elif part_files is not None:
+            futures = [
+                self._executor.submit(_render_part, start, chunk, part_file, per_page)
+                for number, ((start, chunk), part_file) in enumerate(zip(chunks, part_files))
+                if number not in reuse
+            ]
+            gather, args = self._gather_parts, (futures, receipts, per_page, part_files, batch_file, index_file)
+        else:
+            futures = [self._executor.submit(
+                _render_batch, receipts, str(batch_file), per_page,
+                str(index_file) if index_file is not None else None
+            )]
+            gather, args = self._gather_batch, (futures, len(receipts), batch_file)
+        threading.Thread(
+            target=self._collect, args=(gather,) + args,
+            name="receipt-engine", daemon=True
+        ).start()
+
+    def _collect(self, gather, *args):
+        """Wait for all tasks and post the combined result"""
+        try:
+            message = ("done", gather(*args))
+        except Exception as e:
+            message = ("error", str(e))
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            if self._part_dir is not None:
+                shutil.rmtree(self._part_dir, ignore_errors=True)
+            self.running = False
+        self.messages.put(message)
+
+    def _results(self, futures):
+        """Yield the results of the tasks that were not cancelled"""
+        for future in futures:
+            try:
+                yield future.result()
+            except CancelledError:
+                continue
+
+    def _gather_files(self, futures, count):
+        """Separate files: place each chunk's files at its receipts' positions"""
+        pdf_files = [None] * count
+        for start, chunk_files in self._results(futures):
+            pdf_files[start:start + len(chunk_files)] = chunk_files
+        return {"pdf_files": pdf_files, "pages": [None] * count, "cancelled": self._cancel_event.is_set()}
+
+    def _gather_parts(self, futures, receipts, per_page, part_files, batch_file, index_file):
+        """Batch from parts: wait for every part, then join them on one worker"""
+        count = len(receipts)
+        rendered = sum(1 for _, done in self._results(futures) if done)
+        if self._cancel_event.is_set():
+            return {"pdf_files": [None] * count, "pages": [None] * count, "cancelled": True}
+        if rendered < len(futures):
+            raise RuntimeError(f"{len(futures) - rendered} of {len(futures)} parts of the batch PDF could not be rendered")
+
+        try:
+            merged = self._executor.submit(_merge_parts, part_files, str(batch_file)).result()
+            if not merged:
+                # Draw the whole batch on one canvas instead
+                futures = [self._executor.submit(
+                    _render_batch, receipts, str(batch_file), per_page,
+                    str(index_file) if index_file is not None else None
+                )]
+        except (CancelledError, RuntimeError):
+            # Cancelled while the last parts were finishing
+            return {"pdf_files": [None] * count, "pages": [None] * count, "cancelled": True}
+        if not merged:
+            return self._gather_batch(futures, count, batch_file)
+
+        entries = batch_index_entries(receipts, per_page)
+        if index_file is not None:
+            write_batch_index(index_file, entries)
+        pages = [entry['page'] for entry in entries]
+        return {"pdf_files": [str(batch_file)] * count, "pages": pages, "cancelled": False}
+
+    def _gather_batch(self, futures, count, batch_file):
+        """Single canvas: take the pages from the worker's index entries"""
+        pdf_files = [None] * count
+        pages = [None] * count
+        for result in self._results(futures):
+            if result is None:
+                continue
+            for index, entry in enumerate(result):
+                pdf_files[index] = str(batch_file)
+                pages[index] = entry['page']
+        cancelled = self._cancel_event.is_set()
+        if not cancelled and None in pdf_files:
+            raise RuntimeError("The batch PDF could not be rendered")
+        return {"pdf_files": pdf_files, "pages": pages, "cancelled": cancelled}
+
+    def poll(self):
+        """Return the messages waiting for the GUI, newest progress merged in"""
+        try:
+            while True:
+                _, count = self._worker_messages.get_nowait()
+                self._done += count
+        except (queue.Empty, AttributeError, OSError):
+            pass
+
+        messages = [("progress", min(self._done, self._total), self._total)]
+        try:
+            while True:
+                messages.append(self.messages.get_nowait())
+        except queue.Empty:
+            pass
+        return messages
+
+    def cancel(self):
+        """Stop after the receipts the workers are currently rendering"""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,214 @@
+"""
+Receipt Manifest for PWD Tools Desktop Application
+Content-addressed record of generated receipts for incremental re-runs
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+# Subfolder holding the rendered parts a batch PDF is joined from
+PARTS_DIR = "parts"
+
+
+def receipt_digest(payee, amount, work_description, receipt_date, occurrence=0):
+    """Return a stable digest of the receipt content
+
+    occurrence tells identical rows of one sheet apart (0 for the first).
+    Unlike hash(), the digest is the same in every process and session.
+    """
+    parts = (
+        str(payee).strip(),
+        f"{float(amount):.2f}",
+        str(work_description).strip(),
+        str(receipt_date),
+        str(occurrence),
+    )
+    return hashlib.blake2b("\x1f".join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def receipt_number(digest, receipt_date):
+    """Return the receipt number for a digest, e.g. EMD-20240115-3FA2C19B"""
+    day, month, year = receipt_date.split('/')
+    return f"EMD-{year}{month}{day}-{digest[:8].upper()}"
+
+
+def source_key(file_path):
+    """Return a short digest of a workbook's full path
+
+    Output folders carry it next to the workbook name, so workbooks with
+    the same file name in different folders never share (and clean up)
+    each other's receipts.
+    """
+    path = str(Path(file_path).resolve()).lower()
+    return hashlib.blake2b(path.encode('utf-8'), digest_size=4).hexdigest()
+
+
+def part_name(receipts, template, per_page):
+    """Return the file name of the batch part holding these receipts
+
+    The name changes with the content or date of any of the receipts,
+    their order, the template and the receipts per sheet, so an existing
+    part file is always up to date.
+    """
+    parts = [template, per_page, [[receipt['digest'], receipt['date']] for receipt in receipts]]
+    digest = hashlib.blake2b(json.dumps(parts).encode('utf-8'), digest_size=16).hexdigest()
+    return f"part_{digest}.pdf"
+
+
+def assign_receipt_numbers(receipts, dates=None, default_date=None):
+    """Set 'digest' and 'receipt_number' on each receipt dict in place
+
+    A receipt whose 'date' is None has no date of its own: it is left out
+    of the digest, so the digest does not change from day to day, and the
+    receipt is dated from dates ({digest: date}, see
+    ReceiptManifest.receipt_dates) or, when first seen, with default_date
+    (today). Such receipts are marked 'date_defaulted'.
+    """
+    dates = dates or {}
+    default_date = default_date or datetime.now().strftime('%d/%m/%Y')
+    seen = {}
+    for receipt in receipts:
+        content = (receipt['payee'], f"{float(receipt['amount']):.2f}",
+                   receipt['work_description'], receipt['date'] or '')
+        occurrence = seen.get(content, 0)
+        seen[content] = occurrence + 1
+        receipt['digest'] = receipt_digest(*content, occurrence=occurrence)
+        if receipt['date'] is None:
+            receipt['date'] = dates.get(receipt['digest'], default_date)
+            receipt['date_defaulted'] = True
+        receipt['receipt_number'] = receipt_number(receipt['digest'], receipt['date'])
+    return receipts
+
+
+class ReceiptManifest:
+    """Tracks which receipts an output folder already holds
+
+    Separate-file output is recorded per receipt digest, so a re-run only
+    renders rows whose content changed and removes files of rows that
+    are gone. Every entry carries the template signature it was rendered
+    with. A batch PDF is joined from parts of whole sheets kept in the
+    parts folder under content-derived names (see part_name): a re-run
+    renders only the parts whose receipts changed and joins them with
+    the rest, and reuses the batch PDF itself when no part changed.
+    Receipts without a date of their own keep the date they were first
+    generated with, so their numbers do not change between runs.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILE
+        self.data = self.load()
+
+    def load(self):
+        """Read the manifest, starting empty when missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+        data["version"] = MANIFEST_VERSION
+        data.setdefault("receipts", {})
+        data.setdefault("batch", None)
+        data.setdefault("dates", {})
+        return data
+
+    def save(self):
+        """Write the manifest atomically"""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{MANIFEST_FILE}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=1, ensure_ascii=False)
+            temp_path.replace(self.path)
+            return True
+        except Exception as e:
+            print(f"Error saving receipt manifest: {e}")
+            return False
+
+    def receipt_dates(self):
+        """Return {digest: date} of the receipts that were dated when first generated"""
+        return dict(self.data["dates"])
+
+    def record_dates(self, receipts):
+        """Keep the dates given to receipts without a date of their own"""
+        self.data["dates"] = {
+            receipt['digest']: receipt['date'] for receipt in receipts if receipt.get('date_defaulted')
+        }
+        return self.save()
+
+    def reusable_files(self, receipts, template):
+        """Return {position: pdf file} for receipts already rendered unchanged"""
+        entries = self.data["receipts"]
+        reusable = {}
+        for position, receipt in enumerate(receipts):
+            entry = entries.get(receipt['digest'])
+            if (entry is None or entry["template"] != template
+                    or entry["receipt_number"] != receipt['receipt_number']):
+                continue
+            pdf_file = self.output_dir / entry["file"]
+            if pdf_file.exists():
+                reusable[position] = str(pdf_file)
+        return reusable
+
+    def record_files(self, receipts, pdf_files, template):
+        """Record separate-file output and delete files of receipts no longer present"""
+        entries = self.data["receipts"]
+        current = {}
+        for receipt, pdf_file in zip(receipts, pdf_files):
+            if pdf_file is None:
+                continue
+            current[receipt['digest']] = {
+                "file": Path(pdf_file).name,
+                "receipt_number": receipt['receipt_number'],
+                "payee": receipt['payee'],
+                "amount": receipt['amount'],
+                "template": template,
+            }
+
+        kept_files = {entry["file"] for entry in current.values()}
+        for digest, entry in entries.items():
+            if digest not in current and entry["file"] not in kept_files:
+                (self.output_dir / entry["file"]).unlink(missing_ok=True)
+        self.data["receipts"] = current
+        return self.save()
+
+    def batch_parts(self, receipts, chunks, template, per_page):
+        """Return (part file per chunk, chunk numbers whose part is already rendered)
+
+        chunks are the (start, stop) receipt ranges the batch is rendered in.
+        """
+        parts_dir = self.output_dir / PARTS_DIR
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        part_files = [parts_dir / part_name(receipts[start:stop], template, per_page) for start, stop in chunks]
+        reuse = {number for number, part_file in enumerate(part_files) if part_file.exists()}
+        return part_files, reuse
+
+    def reusable_batch(self, part_files, per_page, batch_file, index_file=None):
+        """Return the page of each receipt when the existing batch PDF can be reused"""
+        batch = self.data["batch"]
+        if (batch is None or batch["file"] != Path(batch_file).name
+                or batch["parts"] != [Path(part_file).name for part_file in part_files]):
+            return None
+        if not Path(batch_file).exists() or (index_file is not None and not Path(index_file).exists()):
+            return None
+        return [position // per_page + 1 for position in range(batch["count"])]
+
+    def record_batch(self, receipts, part_files, batch_file):
+        """Record a freshly joined batch PDF and delete parts it no longer uses"""
+        names = [Path(part_file).name for part_file in part_files]
+        self.data["batch"] = {
+            "file": Path(batch_file).name,
+            "count": len(receipts),
+            "parts": names,
+        }
+        kept = set(names)
+        for part_file in (self.output_dir / PARTS_DIR).glob("part_*.pdf"):
+            if part_file.name not in kept:
+                part_file.unlink(missing_ok=True)
+        return self.save()
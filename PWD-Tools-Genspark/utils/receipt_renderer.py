@@ -0,0 +1,510 @@
+"""
+Receipt Renderer for PWD Tools Desktop Application
+Draws the RPWA 28 hand receipt directly with ReportLab canvas primitives
+"""
+
+import csv
+import hashlib
+import inspect
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from utils.indian_numbering import amount_to_words, format_indian_number
+
+# Names the Devanagari fonts are registered under with ReportLab
+DEVANAGARI_FONT = "PWD-Devanagari"
+DEVANAGARI_BOLD_FONT = "PWD-Devanagari-Bold"
+
+# (regular, bold) font files tried in order when no font is configured
+DEVANAGARI_FONT_CANDIDATES = (
+    (Path(__file__).parent.parent / "fonts" / "NotoSansDevanagari-Regular.ttf",
+     Path(__file__).parent.parent / "fonts" / "NotoSansDevanagari-Bold.ttf"),
+    (Path("C:/Windows/Fonts/Nirmala.ttf"), Path("C:/Windows/Fonts/NirmalaB.ttf")),
+    (Path("C:/Windows/Fonts/mangal.ttf"), Path("C:/Windows/Fonts/mangalb.ttf")),
+    (Path("/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf"),
+     Path("/usr/share/fonts/truetype/noto/NotoSansDevanagari-Bold.ttf")),
+    (Path("/usr/share/fonts/truetype/lohit-devanagari/Lohit-Devanagari.ttf"), None),
+    (Path("/usr/share/fonts/truetype/freefont/FreeSans.ttf"),
+     Path("/usr/share/fonts/truetype/freefont/FreeSansBold.ttf")),
+)
+
+# A character every usable Devanagari font must contain (KA)
+DEVANAGARI_PROBE = 0x0915
+RUPEE_SIGN = 0x20B9
+FORM_NAME = "rpwa28"
+
+# Older ReportLab releases have no complex-script shaping support
+SHAPING_SUPPORTED = "shaping" in inspect.signature(canvas.Canvas.drawString).parameters
+
+# Bump when the way fields are formatted changes, so stored receipts are re-rendered
+TEMPLATE_VERSION = 2
+
+# Page layout of the hand receipt in points on A4 (origin bottom left).
+# Static elements are drawn once per document into a reusable form,
+# "field" elements are filled in from each receipt. Text may refer to
+# {department}/{office}; "hindi" elements are only drawn when a
+# Devanagari font is available.
+RPWA28_LAYOUT = (
+    ("rect", 36, 300, 523, 506, 1.5),
+    ("text", 297.5, 776, "{department}", "bold", 18, "centre"),
+    ("text", 297.5, 756, "{office}", "regular", 13, "centre"),
+    ("hindi", 297.5, 734, "हस्त रसीद", "bold", 14, "centre"),
+    ("text", 297.5, 714, "HAND RECEIPT (RPWA 28)", "bold", 13, "centre"),
+    ("line", 56, 704, 539, 704, 0.75),
+    ("text", 56, 676, "Receipt No.:", "bold", 11, "left"),
+    ("line", 166, 673, 539, 673, 0.5),
+    ("text", 56, 650, "Date:", "bold", 11, "left"),
+    ("line", 166, 647, 539, 647, 0.5),
+    ("text", 56, 624, "Received from:", "bold", 11, "left"),
+    ("line", 166, 621, 539, 621, 0.5),
+    ("text", 56, 598, "Work Description:", "bold", 11, "left"),
+    ("line", 166, 595, 539, 595, 0.5),
+    ("line", 166, 581, 539, 581, 0.5),
+    ("line", 166, 567, 539, 567, 0.5),
+    ("fill", 56, 490, 483, 60, 0.94),
+    ("rect", 56, 490, 483, 60, 0.75),
+    ("text", 66, 530, "Amount:", "bold", 11, "left"),
+    ("text", 66, 504, "Amount in Words:", "bold", 11, "left"),
+    ("text", 56, 466, "Purpose:", "bold", 11, "left"),
+    ("text", 166, 466, "Earnest Money Deposit (EMD)", "regular", 11, "left"),
+    ("line", 166, 463, 539, 463, 0.5),
+    ("text", 56, 428, "Received by:", "regular", 10, "left"),
+    ("rect", 56, 362, 200, 60, 0.75),
+    ("text", 56, 350, "Signature & Stamp", "regular", 10, "left"),
+    ("text", 339, 428, "Submitted by:", "regular", 10, "left"),
+    ("rect", 339, 362, 200, 60, 0.75),
+    ("text", 339, 350, "Contractor Signature", "regular", 10, "left"),
+    ("text", 297.5, 322, "This is a computer-generated receipt | PWD Tools Desktop v1.0.0",
+     "regular", 8, "centre"),
+    ("field", 170, 676, "receipt_number", "text", 11, "left", 365, 1),
+    ("field", 170, 650, "date", "text", 11, "left", 365, 1),
+    ("field", 170, 624, "payee", "text", 11, "left", 365, 1),
+    ("field", 170, 598, "work_description", "text", 10, "left", 365, 3),
+    ("field", 166, 530, "amount", "text_bold", 13, "left", 365, 1),
+    ("field", 166, 504, "amount_words", "text", 10, "left", 365, 2),
+    ("field", 297.5, 310, "generated_on", "regular", 8, "centre", 483, 1),
+)
+
+# Area of the page the receipt occupies (x, y, width, height); used to
+# shrink receipts onto one sheet for 2-up/4-up printing
+RPWA28_BOX = (36, 300, 523, 506)
+
+# Receipts per sheet -> (columns, rows) on a portrait A4 sheet
+IMPOSITIONS = {1: (1, 1), 2: (1, 2), 4: (2, 2)}
+SHEET_MARGIN = 18
+SLOT_PADDING = 9
+
+INDEX_COLUMNS = ['receipt_number', 'payee', 'amount', 'page', 'position']
+
+# "N 0 R" object reference inside a PDF dictionary
+PDF_REFERENCE = re.compile(rb"(\d+) 0 R\b")
+
+_registered_fonts = {}
+
+
+def register_devanagari_fonts(font_path=None, bold_font_path=None):
+    """Register a Devanagari-capable TrueType font with ReportLab
+
+    Uses font_path/bold_font_path when given, otherwise the first
+    candidate font found on this machine. Returns (regular, bold) font
+    names, or None when no usable font exists.
+    """
+    candidates = [(Path(font_path), Path(bold_font_path) if bold_font_path else None)] \
+        if font_path else DEVANAGARI_FONT_CANDIDATES
+    for regular_path, bold_path in candidates:
+        key = (str(regular_path), str(bold_path))
+        if key in _registered_fonts:
+            return _registered_fonts[key]
+        if not regular_path.exists():
+            continue
+        try:
+            regular = TTFont(DEVANAGARI_FONT, str(regular_path))
+            if DEVANAGARI_PROBE not in regular.face.charToGlyph:
+                print(f"Font has no Devanagari glyphs: {regular_path}")
+                continue
+            pdfmetrics.registerFont(regular)
+            bold_name = DEVANAGARI_FONT
+            if bold_path is not None and bold_path.exists():
+                pdfmetrics.registerFont(TTFont(DEVANAGARI_BOLD_FONT, str(bold_path)))
+                bold_name = DEVANAGARI_BOLD_FONT
+            _registered_fonts[key] = (DEVANAGARI_FONT, bold_name)
+            return _registered_fonts[key]
+        except Exception as e:
+            print(f"Error registering font {regular_path}: {e}")
+    return None
+
+
+def template_signature(settings=None, layout=RPWA28_LAYOUT):
+    """Return a digest of everything besides the receipt data that shapes a receipt
+
+    Receipts rendered under a different signature (layout, department,
+    office or font changed) must be rendered again.
+    """
+    dept_info = settings.get_department_info() if settings is not None else {}
+    font_path = settings.get('export_settings.devanagari_font', '') if settings is not None else ''
+    parts = [TEMPLATE_VERSION, layout, dept_info.get('name'), dept_info.get('office'), font_path]
+    return hashlib.blake2b(json.dumps(parts, default=str).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ReceiptRenderer:
+    """Renders RPWA 28 hand receipts straight onto a ReportLab canvas
+
+    The layout is compiled once: static text, lines and boxes become a
+    PDF form that every page reuses, and the variable fields become a
+    flat list of draw instructions with their fonts resolved. Rendering
+    a receipt is then a handful of drawString calls.
+    """
+
+    def __init__(self, settings=None, layout=RPWA28_LAYOUT, font_path=None, bold_font_path=None):
+        self.settings = settings
+        self.page_size = A4
+        dept_info = settings.get_department_info() if settings is not None else {}
+        self.department = dept_info.get('name', 'Public Works Department')
+        self.office = dept_info.get('office', 'PWD Office, Udaipur')
+
+        if font_path is None and settings is not None:
+            font_path = settings.get('export_settings.devanagari_font') or None
+        devanagari = register_devanagari_fonts(font_path, bold_font_path)
+        self.has_devanagari = devanagari is not None
+        self.fonts = {
+            "regular": "Helvetica",
+            "bold": "Helvetica-Bold",
+            "text": devanagari[0] if devanagari else "Helvetica",
+            "text_bold": devanagari[1] if devanagari else "Helvetica-Bold",
+        }
+        self.hindi_font = devanagari[1] if devanagari else None
+        # Conjuncts and matras only join up when ReportLab can shape the font (uharfbuzz)
+        self.shaping = (self.has_devanagari and SHAPING_SUPPORTED
+                        and bool(getattr(pdfmetrics.getFont(devanagari[0]), 'shapable', False)))
+        self.currency = "Rs."
+        if devanagari and RUPEE_SIGN in pdfmetrics.getFont(devanagari[1]).face.charToGlyph:
+            self.currency = "\u20b9"
+
+        self.static_ops, self.field_ops = self.compile_layout(layout)
+
+    def compile_layout(self, layout):
+        """Split a layout into static draw operations and field instructions"""
+        static_ops = []
+        field_ops = []
+        draw_methods = {"left": "drawString", "right": "drawRightString", "centre": "drawCentredString"}
+        for element in layout:
+            kind = element[0]
+            if kind in ("rect", "line", "fill"):
+                static_ops.append(element)
+            elif kind in ("text", "hindi"):
+                x, y, text, role, size, align = element[1:]
+                if kind == "hindi":
+                    if self.hindi_font is None:
+                        continue
+                    font = self.hindi_font
+                else:
+                    font = self.fonts[role]
+                text = text.format(department=self.department, office=self.office)
+                shaping = self.shaping and font.startswith(DEVANAGARI_FONT)
+                static_ops.append(("text", x, y, text, font, size, draw_methods[align], shaping))
+            elif kind == "field":
+                x, y, key, role, size, align, max_width, max_lines = element[1:]
+                font = self.fonts[role]
+                shaping = self.shaping and font.startswith(DEVANAGARI_FONT)
+                field_ops.append((key, x, y, font, size, draw_methods[align],
+                                  max_width, max_lines, size * 1.4, shaping))
+            else:
+                raise ValueError(f"Unknown layout element: {kind}")
+        return static_ops, field_ops
+
+    def new_canvas(self, filename):
+        """Create a canvas with the static receipt form defined on it"""
+        c = canvas.Canvas(str(filename), pagesize=self.page_size)
+        c.setTitle("Hand Receipt (RPWA 28)")
+        c.setAuthor(self.department)
+        c.beginForm(FORM_NAME)
+        for op in self.static_ops:
+            kind = op[0]
+            if kind == "rect":
+                c.setLineWidth(op[5])
+                c.rect(op[1], op[2], op[3], op[4])
+            elif kind == "line":
+                c.setLineWidth(op[5])
+                c.line(op[1], op[2], op[3], op[4])
+            elif kind == "fill":
+                c.setFillGray(op[5])
+                c.rect(op[1], op[2], op[3], op[4], stroke=0, fill=1)
+                c.setFillGray(0)
+            else:
+                c.setFont(op[4], op[5])
+                if op[7]:
+                    getattr(c, op[6])(op[1], op[2], op[3], shaping=True)
+                else:
+                    getattr(c, op[6])(op[1], op[2], op[3])
+        c.endForm()
+        return c
+
+    def field_values(self, receipt, generated_on=None):
+        """Return the display text of every field for one receipt"""
+        amount = float(receipt.get('amount', 0) or 0)
+        amount_words = receipt.get('amount_words') or amount_to_words(amount)
+        if generated_on is None:
+            generated_on = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        return {
+            "receipt_number": receipt.get('receipt_number', ''),
+            "date": receipt.get('date') or datetime.now().strftime('%d/%m/%Y'),
+            "payee": receipt.get('payee', ''),
+            "work_description": receipt.get('work_description', ''),
+            "amount": f"{self.currency} {format_indian_number(amount)}",
+            "amount_words": amount_words,
+            "generated_on": f"Generated on: {generated_on}",
+        }
+
+    def draw_fields(self, c, receipt, generated_on=None):
+        """Draw the form and one receipt's fields at the current origin"""
+        c.doForm(FORM_NAME)
+        values = self.field_values(receipt, generated_on)
+        current_font = None
+        for key, x, y, font, size, method, max_width, max_lines, leading, shaping in self.field_ops:
+            text = str(values.get(key, '') or '')
+            if not text:
+                continue
+            if (font, size) != current_font:
+                c.setFont(font, size)
+                current_font = (font, size)
+            draw = getattr(c, method)
+            lines = [text]
+            if pdfmetrics.stringWidth(text, font, size) > max_width:
+                lines = simpleSplit(text, font, size, max_width)
+                if len(lines) > max_lines:
+                    lines = lines[:max_lines]
+                    lines[-1] = lines[-1].rstrip() + "..."
+            for line in lines:
+                if shaping:
+                    draw(x, y, line, shaping=True)
+                else:
+                    draw(x, y, line)
+                y -= leading
+
+    def draw_receipt(self, c, receipt):
+        """Draw one receipt as the current page of canvas c"""
+        self.draw_fields(c, receipt)
+        c.showPage()
+
+    def slot_transforms(self, per_page):
+        """Return (x offset, y offset, scale) for each receipt slot on a sheet"""
+        if per_page not in IMPOSITIONS:
+            raise ValueError(f"Unsupported receipts per page: {per_page}")
+        if per_page == 1:
+            return [(0, 0, 1)]
+        columns, rows = IMPOSITIONS[per_page]
+        page_width, page_height = self.page_size
+        box_x, box_y, box_width, box_height = RPWA28_BOX
+        cell_width = (page_width - 2 * SHEET_MARGIN) / columns
+        cell_height = (page_height - 2 * SHEET_MARGIN) / rows
+        scale = min((cell_width - 2 * SLOT_PADDING) / box_width,
+                    (cell_height - 2 * SLOT_PADDING) / box_height, 1)
+        transforms = []
+        for row in range(rows):
+            cell_bottom = page_height - SHEET_MARGIN - (row + 1) * cell_height
+            for column in range(columns):
+                cell_left = SHEET_MARGIN + column * cell_width
+                transforms.append((
+                    cell_left + (cell_width - box_width * scale) / 2 - box_x * scale,
+                    cell_bottom + (cell_height - box_height * scale) / 2 - box_y * scale,
+                    scale
+                ))
+        return transforms
+
+    def draw_cut_guides(self, c, per_page):
+        """Draw dashed cutting lines between the receipts on a sheet"""
+        columns, rows = IMPOSITIONS[per_page]
+        page_width, page_height = self.page_size
+        cell_width = (page_width - 2 * SHEET_MARGIN) / columns
+        cell_height = (page_height - 2 * SHEET_MARGIN) / rows
+        c.saveState()
+        c.setDash(4, 4)
+        c.setLineWidth(0.25)
+        c.setStrokeGray(0.6)
+        for column in range(1, columns):
+            x = SHEET_MARGIN + column * cell_width
+            c.line(x, SHEET_MARGIN, x, page_height - SHEET_MARGIN)
+        for row in range(1, rows):
+            y = SHEET_MARGIN + row * cell_height
+            c.line(SHEET_MARGIN, y, page_width - SHEET_MARGIN, y)
+        c.restoreState()
+
+    def render(self, filename, receipt):
+        """Render a single receipt to a PDF file"""
+        try:
+            c = self.new_canvas(filename)
+            self.draw_receipt(c, receipt)
+            c.save()
+            return True
+        except Exception as e:
+            print(f"Error rendering receipt PDF: {e}")
+            return False
+
+    def render_batch(self, filename, receipts, per_page=1, index_file=None):
+        """Render many receipts into one multi-page PDF
+
+        receipts may be any iterable and is consumed once. per_page is 1,
+        2 or 4 receipts per A4 sheet. Returns a list of index entries
+        (receipt number, payee, amount, page, position), also written to
+        index_file as CSV when given, or None on failure.
+        """
+        try:
+            transforms = self.slot_transforms(per_page)
+            generated_on = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+            c = self.new_canvas(filename)
+            entries = []
+            page = 1
+            slot = 0
+            for receipt in receipts:
+                if slot == len(transforms):
+                    c.showPage()
+                    page += 1
+                    slot = 0
+                if slot == 0 and per_page > 1:
+                    self.draw_cut_guides(c, per_page)
+                x, y, scale = transforms[slot]
+                if scale == 1:
+                    self.draw_fields(c, receipt, generated_on)
+                else:
+                    c.saveState()
+                    c.translate(x, y)
+                    c.scale(scale, scale)
+                    self.draw_fields(c, receipt, generated_on)
+                    c.restoreState()
+                slot += 1
+                entries.append({
+                    'receipt_number': receipt.get('receipt_number', ''),
+                    'payee': receipt.get('payee', ''),
+                    'amount': receipt.get('amount', 0),
+                    'page': page,
+                    'position': slot
+                })
+            if entries:
+                c.showPage()
+            c.save()
+            if index_file is not None:
+                write_batch_index(index_file, entries)
+            return entries
+        except Exception as e:
+            print(f"Error rendering receipt batch PDF: {e}")
+            return None
+
+
+def _pdf_objects(data):
+    """Split a PDF written by ReportLab into {number: object body} and its trailer
+
+    Relies on what ReportLab writes: one classic xref table listing every
+    object in order, each object written as "N 0 obj ... endobj".
+    """
+    xref_offset = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    header, trailer = data[xref_offset:].split(b"trailer", 1)
+    lines = header.split(b"\n")
+    count = int(lines[1].split()[1])
+    offsets = [int(line[:10]) for line in lines[3:2 + count]]
+    ends = offsets[1:] + [xref_offset]
+    objects = {}
+    for number, (start, end) in enumerate(zip(offsets, ends), start=1):
+        body = data[start:end]
+        body = body[body.index(b"obj") + 3:body.rindex(b"endobj")].strip(b"\r\n")
+        objects[number] = body
+    return objects, trailer
+
+
+def _pdf_reference(text, name):
+    """Object number referenced by /name in a dictionary, or None"""
+    match = re.search(rb"/" + name + rb" (\d+) 0 R", text)
+    return int(match.group(1)) if match else None
+
+
+def concatenate_pdfs(part_files, filename):
+    """Join PDF files written by ReceiptRenderer into one, pages in order
+
+    Every object of every part is copied as it is, renumbered so the
+    parts do not collide; only the object references in dictionaries
+    are rewritten, never stream data. One new page tree lists the pages
+    of all parts and the first part's document info is kept. This is far
+    cheaper than a general PDF library, which parses every page.
+    Returns True on success.
+    """
+    try:
+        parts = []
+        next_number = 1
+        for part_file in part_files:
+            objects, trailer = _pdf_objects(Path(part_file).read_bytes())
+            root = _pdf_reference(trailer, b"Root")
+            pages = _pdf_reference(objects[root], b"Pages")
+            # Each part's catalog and page tree are replaced, everything else copied
+            copied = [number for number in objects if number not in (root, pages)]
+            numbers = {number: next_number + index for index, number in enumerate(copied)}
+            next_number += len(copied)
+            parts.append((objects, copied, numbers, pages, trailer))
+        pages_number, catalog_number = next_number, next_number + 1
+
+        output = [b"%PDF-1.3\n%\x93\x8c\x8b\x9e ReportLab Generated PDF document\n"]
+        position = len(output[0])
+        offsets = []
+        kids = []
+        page_count = 0
+        info = None
+
+        def write(number, body):
+            nonlocal position
+            chunk = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+            offsets.append(position)
+            output.append(chunk)
+            position += len(chunk)
+
+        for objects, copied, numbers, pages, trailer in parts:
+            # The pages' /Parent references move to the new page tree
+            numbers[pages] = pages_number
+            renumber = lambda match: b"%d 0 R" % numbers.get(int(match.group(1)), int(match.group(1)))
+
+            page_tree = objects[pages]
+            page_count += int(re.search(rb"/Count (\d+)", page_tree).group(1))
+            kids_text = re.search(rb"/Kids \[(.*?)\]", page_tree, re.S).group(1)
+            kids.extend(numbers[int(number)] for number in PDF_REFERENCE.findall(kids_text))
+            info_number = _pdf_reference(trailer, b"Info")
+            if info is None and info_number is not None:
+                info = numbers[info_number]
+
+            for number in copied:
+                dictionary, stream, data = objects[number].partition(b"\nstream\n")
+                write(numbers[number], PDF_REFERENCE.sub(renumber, dictionary) + stream + data)
+
+        kids_text = b" ".join(b"%d 0 R" % kid for kid in kids)
+        write(pages_number, b"<<\n/Count %d /Kids [ %s ] /Type /Pages\n>>" % (page_count, kids_text))
+        write(catalog_number, b"<<\n/PageMode /UseNone /Pages %d 0 R /Type /Catalog\n>>" % pages_number)
+
+        # Objects were written in number order, so the offsets are the xref entries
+        output.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        output.extend(b"%010d 00000 n \n" % offset for offset in offsets)
+        trailer = b"/Root %d 0 R /Size %d" % (catalog_number, len(offsets) + 1)
+        if info is not None:
+            trailer += b" /Info %d 0 R" % info
+        output.append(b"trailer\n<<\n%s\n>>\nstartxref\n%d\n%%%%EOF\n" % (trailer, position))
+
+        # Written beside the target first so a failed join leaves no half file
+        temp_file = Path(f"{filename}.tmp")
+        temp_file.write_bytes(b"".join(output))
+        temp_file.replace(filename)
+        return True
+    except Exception as e:
+        print(f"Error joining receipt PDFs: {e}")
+        return False
+
+
+def write_batch_index(index_file, entries):
+    """Write receipt number to page mapping of a batch PDF as CSV"""
+    # utf-8-sig so Excel shows Hindi payee names correctly
+    with open(index_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=INDEX_COLUMNS)
+        writer.writeheader()
+        writer.writerows(entries)
@@ -0,0 +1,408 @@
+"""
+Report Templates for PWD Tools Desktop Application
+HTML sources for the receipt, EMD refund, bill note and delay report documents
+
+Each document is split into a head and tail written once and an item
+repeated per record. Fields are written {{ field }} or {{ field|filter }}
+(see utils.template_engine.FILTERS); dept.* fields come from the
+department settings. CSS braces need no escaping.
+"""
+
+RECEIPT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Hand Receipt (RPWA 28)</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
+        .container { max-width: 800px; margin: 0 auto; border: 2px solid #000; padding: 20px; }
+        .container + .container { margin-top: 20px; page-break-before: always; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .title { font-size: 24px; font-weight: bold; margin-bottom: 10px; }
+        .subtitle { font-size: 18px; margin-bottom: 20px; }
+        .content { margin-bottom: 20px; }
+        .field { margin-bottom: 15px; }
+        .field-label { font-weight: bold; display: inline-block; width: 150px; }
+        .field-value { display: inline-block; border-bottom: 1px solid #000; min-width: 300px; }
+        .amount-section { background-color: #f0f0f0; padding: 15px; border: 1px solid #000; margin: 20px 0; }
+        .signature-section { margin-top: 40px; }
+        .signature-box { border: 1px solid #000; height: 60px; width: 200px; display: inline-block; margin-right: 50px; }
+        .footer { text-align: center; margin-top: 30px; font-size: 12px; }
+    </style>
+</head>
+<body>
+"""
+
+RECEIPT_ITEM = """    <div class="container">
+        <div class="header">
+            <div class="title">{{dept.name}}</div>
+            <div class="subtitle">{{dept.office}}</div>
+            <div class="subtitle">HAND RECEIPT (RPWA 28)</div>
+        </div>
+
+        <div class="content">
+            <div class="field">
+                <span class="field-label">Receipt No.:</span>
+                <span class="field-value">{{receipt_number}}</span>
+            </div>
+
+            <div class="field">
+                <span class="field-label">Date:</span>
+                <span class="field-value">{{date|date}}</span>
+            </div>
+
+            <div class="field">
+                <span class="field-label">Received from:</span>
+                <span class="field-value">{{payee}}</span>
+            </div>
+
+            <div class="field">
+                <span class="field-label">Work Description:</span>
+                <span class="field-value">{{work_description}}</span>
+            </div>
+
+            <div class="amount-section">
+                <div class="field">
+                    <span class="field-label">Amount (₹):</span>
+                    <span class="field-value" style="font-size: 18px; font-weight: bold;">{{amount|inr}}</span>
+                </div>
+
+                <div class="field">
+                    <span class="field-label">Amount in Words:</span>
+                    <span class="field-value">{{amount|words}}</span>
+                </div>
+            </div>
+
+            <div class="field">
+                <span class="field-label">Purpose:</span>
+                <span class="field-value">Earnest Money Deposit (EMD)</span>
+            </div>
+
+            <div class="signature-section">
+                <div style="float: left;">
+                    <div>Received by:</div>
+                    <div class="signature-box"></div>
+                    <div>Signature &amp; Stamp</div>
+                </div>
+
+                <div style="float: right;">
+                    <div>Submitted by:</div>
+                    <div class="signature-box"></div>
+                    <div>Contractor Signature</div>
+                </div>
+
+                <div style="clear: both;"></div>
+            </div>
+        </div>
+
+        <div class="footer">
+            <p>This is a computer-generated receipt | PWD Tools Desktop v1.0.0</p>
+            <p>Generated on: {{generated_on}}</p>
+        </div>
+    </div>
+"""
+
+DOCUMENT_TAIL = """</body>
+</html>
+"""
+
+EMD_REFUND_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=210mm, height: 297mm">
+    <title>Hand Receipt (RPWA 28)</title>
+    <style>
+        body {
+            font-family: 'Times New Roman', serif;
+            margin: 0;
+            padding: 0;
+            background: white;
+        }
+        @page {
+            size: A4 portrait;
+            margin: 10mm;
+        }
+        .container {
+            width: 210mm;
+            min-height: 297mm;
+            margin: 0;
+            padding: 20mm;
+            box-sizing: border-box;
+            position: relative;
+            border: 2px solid #000;
+            background: white;
+        }
+        .container + .container {
+            page-break-before: always;
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 20px;
+            color: #000;
+        }
+        .header h2 {
+            margin: 5px 0;
+            font-size: 18px;
+            font-weight: bold;
+        }
+        .header p {
+            margin: 3px 0;
+            font-size: 14px;
+        }
+        .details {
+            margin-bottom: 15px;
+            line-height: 1.6;
+        }
+        .details p {
+            margin: 8px 0;
+            font-size: 14px;
+        }
+        .amount-words {
+            font-style: italic;
+            font-weight: bold;
+        }
+        .signature-area {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 30px;
+            margin-bottom: 20px;
+        }
+        .signature-area td, .signature-area th {
+            border: 1px solid #000;
+            padding: 8px;
+            text-align: left;
+            font-size: 12px;
+        }
+        .offices {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 20px;
+        }
+        .offices td, .offices th {
+            border: 1px solid #000;
+            padding: 8px;
+            text-align: left;
+            font-size: 12px;
+        }
+        .input-field {
+            border-bottom: 1px dotted #000;
+            padding: 2px;
+            min-width: 200px;
+            display: inline-block;
+        }
+        .bottom-left-box {
+            position: absolute;
+            bottom: 20mm;
+            left: 20mm;
+            border: 2px solid #000;
+            padding: 10px;
+            width: 120mm;
+            text-align: left;
+            height: 40mm;
+            font-size: 12px;
+        }
+        .bottom-left-box p {
+            margin: 2px 0;
+        }
+        .seal-area {
+            position: absolute;
+            bottom: 20mm;
+            right: 20mm;
+            width: 50mm;
+            height: 30mm;
+            border: 1px solid #000;
+            text-align: center;
+            padding: 5px;
+        }
+        .seal-area p {
+            margin: 5px 0;
+            font-size: 10px;
+        }
+        @media print {
+            .container {
+                border: 2px solid #000;
+                width: 210mm;
+                min-height: 297mm;
+                margin: 0;
+                padding: 20mm;
+            }
+        }
+    </style>
+</head>
+<body>
+"""
+
+EMD_REFUND_ITEM = """    <div class="container">
+        <div class="header">
+            <h2>Payable to: - {{payee}} (Electric Contractor)</h2>
+            <h2>HAND RECEIPT (RPWA 28)</h2>
+            <p>(Referred to in PWF&amp;A Rules 418,424,436 &amp; 438)</p>
+            <p>Division - PWD Electric Division, Udaipur</p>
+        </div>
+        <div class="details">
+            <p>(1) Cash Book Voucher No. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Date &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</p>
+            <p>(2) Cheque No. and Date &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</p>
+            <p>(3) Pay for ECS Rs.{{amount|number0}}/- (Rupees <span class="amount-words">{{amount|rupee_words}} Only</span>)</p>
+            <p>(4) Paid by me</p>
+            <p>(5) Received from The Executive Engineer PWD Electric Division, Udaipur the sum of Rs. {{amount|number0}}/- (Rupees <span class="amount-words">{{amount|rupee_words}} Only</span>)</p>
+            <p>Name of work for which payment is made: <span class="input-field">{{work_description}}</span></p>
+            <p>Chargeable to Head:- 8443 [EMD-Refund]</p>
+            <table class="signature-area">
+                <tr>
+                    <td>Witness</td>
+                    <td>Stamp</td>
+                    <td>Signature of payee</td>
+                </tr>
+                <tr>
+                    <td>Cash Book No. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;Page No. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</td>
+                    <td></td>
+                    <td></td>
+                </tr>
+            </table>
+            <table class="offices">
+                <tr>
+                    <td>For use in the Divisional Office</td>
+                    <td>For use in the Accountant General's office</td>
+                </tr>
+                <tr>
+                    <td>Checked</td>
+                    <td>Audited/Reviewed</td>
+                </tr>
+                <tr>
+                    <td>Accounts Clerk</td>
+                    <td>DA &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Auditor &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Supdt. &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; G.O.</td>
+                </tr>
+            </table>
+        </div>
+        <div class="seal-area">
+            <p>SEAL</p>
+            <p></p>
+            <p></p>
+            <p></p>
+        </div>
+        <div class="bottom-left-box">
+            <p></p>
+            <p></p>
+            <p></p>
+            <p>Passed for Rs. {{amount|number0}}</p>
+            <p>In Words Rupees: {{amount|rupee_words}} Only</p>
+            <p>Chargeable to Head:- 8443 [EMD-Refund]</p>
+            <div style="margin-top: 10px;">
+                <p>Ar.&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;D.A.&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;E.E.</p>
+            </div>
+        </div>
+    </div>
+"""
+
+BILL_NOTE_HEAD = """<!DOCTYPE html>
+<html lang="hi">
+<head>
+    <meta charset="UTF-8">
+    <title>बिल नोट शीट</title>
+    <style>
+        body { font-family: 'Nirmala UI', 'Mangal', 'Noto Sans Devanagari', Arial, sans-serif; margin: 0; padding: 20px; }
+        @page { size: A4 portrait; margin: 15mm; }
+        .sheet { max-width: 800px; margin: 0 auto; border: 2px solid #000; padding: 20px; }
+        .sheet + .sheet { margin-top: 20px; page-break-before: always; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .title { font-size: 22px; font-weight: bold; }
+        .subtitle { font-size: 16px; margin-top: 5px; }
+        .details { width: 100%; border-collapse: collapse; margin-bottom: 20px; }
+        .details td { border: 1px solid #000; padding: 6px 10px; font-size: 14px; }
+        .details td:first-child { font-weight: bold; width: 40%; }
+        .note { font-size: 15px; line-height: 1.8; }
+        .signature { margin-top: 60px; text-align: right; font-size: 14px; }
+        .footer { text-align: center; margin-top: 30px; font-size: 11px; color: #555; }
+    </style>
+</head>
+<body>
+"""
+
+BILL_NOTE_ITEM = """    <div class="sheet">
+        <div class="header">
+            <div class="title">{{dept.name}}</div>
+            <div class="subtitle">{{dept.office}}</div>
+            <div class="subtitle">नोट शीट - {{bill_type}}</div>
+        </div>
+        <table class="details">
+            <tr><td>वर्क ऑर्डर राशि</td><td>{{work_order_amount|inr}}</td></tr>
+            <tr><td>अब तक का बिल (Upto Date)</td><td>{{upto_date_amount|inr}}</td></tr>
+            <tr><td>Extra Items राशि</td><td>{{extra_amount|inr}}</td></tr>
+            <tr><td>कार्य प्रगति</td><td>{{percentage_work_done}}%</td></tr>
+        </table>
+        <div class="note">{{note|lines}}</div>
+        <div class="signature">सहायक लेखाधिकारी / लेखाकार</div>
+        <div class="footer">Generated on: {{generated_on}} | PWD Tools Desktop v1.0.0</div>
+    </div>
+"""
+
+DELAY_REPORT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Project Delay Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
+        .report { max-width: 800px; margin: 0 auto; border: 2px solid #000; padding: 20px; }
+        .report + .report { margin-top: 20px; page-break-before: always; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .title { font-size: 22px; font-weight: bold; }
+        .subtitle { font-size: 16px; margin-top: 5px; }
+        h3 { font-size: 15px; border-bottom: 1px solid #000; padding-bottom: 4px; margin: 20px 0 8px; }
+        table { width: 100%; border-collapse: collapse; }
+        td { border: 1px solid #999; padding: 6px 10px; font-size: 13px; }
+        td.label { font-weight: bold; width: 40%; background-color: #f5f5f5; }
+        .status { font-weight: bold; }
+        .penalty { font-size: 16px; font-weight: bold; }
+        .footer { text-align: center; margin-top: 30px; font-size: 11px; color: #555; }
+    </style>
+</head>
+<body>
+"""
+
+DELAY_REPORT_ITEM = """    <div class="report">
+        <div class="header">
+            <div class="title">{{dept.name}}</div>
+            <div class="subtitle">{{dept.office}}</div>
+            <div class="subtitle">PROJECT DELAY REPORT</div>
+        </div>
+        <h3>Project</h3>
+        <table>
+            <tr><td class="label">Project Name</td><td>{{project_name}}</td></tr>
+            <tr><td class="label">Contractor</td><td>{{contractor_name}}</td></tr>
+            <tr><td class="label">Contract Amount</td><td>{{contract_amount|inr}}</td></tr>
+            <tr><td class="label">Status</td><td class="status" style="color: {{status_color}};">{{project_status}}</td></tr>
+        </table>
+        <h3>Timeline</h3>
+        <table>
+            <tr><td class="label">Planned Start</td><td>{{planned_start|date}}</td></tr>
+            <tr><td class="label">Actual Start</td><td>{{actual_start|date}}</td></tr>
+            <tr><td class="label">Planned Completion</td><td>{{planned_completion|date}}</td></tr>
+            <tr><td class="label">Actual Completion</td><td>{{actual_completion|date}}</td></tr>
+            <tr><td class="label">Planned Duration (days)</td><td>{{planned_duration}}</td></tr>
+            <tr><td class="label">Actual Duration (days)</td><td>{{actual_duration}}</td></tr>
+        </table>
+        <h3>Delay and Penalty</h3>
+        <table>
+            <tr><td class="label">Start Delay (days)</td><td>{{start_delay_days}}</td></tr>
+            <tr><td class="label">Completion Delay (days)</td><td>{{completion_delay_days}}</td></tr>
+            <tr><td class="label">Total Delay (days)</td><td>{{total_delay_days}}</td></tr>
+            <tr><td class="label">Hindrance (days, merged)</td><td>{{hindrance_days}}</td></tr>
+            <tr><td class="label">Net Delay (days)</td><td>{{net_delay_days}}</td></tr>
+            <tr><td class="label">Time Extension By</td><td>{{extension_authority}}</td></tr>
+            <tr><td class="label">Penalty Rate (% per day)</td><td>{{penalty_rate}}</td></tr>
+            <tr><td class="label">Penalty Amount</td><td class="penalty">{{penalty_amount|inr}}</td></tr>
+        </table>
+        <div class="footer">Generated on: {{generated_on}} | PWD Tools Desktop v1.0.0</div>
+    </div>
+"""
+
+# Template name -> document parts, compiled once by utils.template_engine
+REPORT_TEMPLATES = {
+    "receipt": {"head": RECEIPT_HEAD, "item": RECEIPT_ITEM, "tail": DOCUMENT_TAIL},
+    "emd_refund": {"head": EMD_REFUND_HEAD, "item": EMD_REFUND_ITEM, "tail": DOCUMENT_TAIL},
+    "bill_note": {"head": BILL_NOTE_HEAD, "item": BILL_NOTE_ITEM, "tail": DOCUMENT_TAIL},
+    "delay_report": {"head": DELAY_REPORT_HEAD, "item": DELAY_REPORT_ITEM, "tail": DOCUMENT_TAIL},
+}
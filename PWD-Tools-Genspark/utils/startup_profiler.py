@@ -0,0 +1,103 @@
+"""
+Startup Profiler for PWD Tools Desktop Application
+Import-time and startup phase breakdown printed with --profile-startup
+"""
+
+import builtins
+import sys
+import threading
+import time
+
+PROFILE_FLAG = "--profile-startup"
+# Packages and modules listed in the report, slowest first
+REPORT_TOP_PACKAGES = 10
+REPORT_TOP_IMPORTS = 25
+
+
+class StartupProfiler:
+    """Times first-time imports and named startup phases
+
+    While installed, every import of a module that is not loaded yet on
+    the main thread is timed. Each module gets its inclusive time
+    (including the modules it pulled in) and its own time, so the report
+    shows both which top-level imports are expensive and where the time
+    actually goes. Only stdlib modules are used here, so the profiler can
+    be installed before anything else is imported.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = {}
+        self.phases = []
+        self._stack = []
+        self._original_import = None
+        self._last_mark = self.started
+
+    @classmethod
+    def from_argv(cls, argv=None):
+        """Return an installed profiler when the flag is given, else None"""
+        argv = sys.argv if argv is None else argv
+        if PROFILE_FLAG not in argv:
+            return None
+        profiler = cls()
+        profiler.install()
+        return profiler
+
+    def install(self):
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return original(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports.setdefault(name, (elapsed, elapsed - children))
+
+    def mark(self, label):
+        """Record the time since the previous mark as a named phase"""
+        now = time.perf_counter()
+        self.phases.append((label, now - self._last_mark))
+        self._last_mark = now
+
+    def report(self, limit=REPORT_TOP_IMPORTS):
+        """Return the startup breakdown as text"""
+        total = time.perf_counter() - self.started
+        lines = [f"Startup profile: {total * 1000:.0f} ms to first idle", "", "Phases:"]
+        for label, elapsed in self.phases:
+            lines.append(f"  {elapsed * 1000:8.1f} ms  {label}")
+
+        packages = {}
+        for name, (_, own) in self.imports.items():
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0.0) + own
+        lines += ["", "Import time by package (own time):"]
+        for package, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:REPORT_TOP_PACKAGES]:
+            lines.append(f"  {own * 1000:8.1f} ms  {package}")
+
+        lines += ["", f"Slowest imports (inclusive / own, {len(self.imports)} modules loaded):"]
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        for name, (inclusive, own) in slowest:
+            lines.append(f"  {inclusive * 1000:8.1f} / {own * 1000:7.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def finish(self, label="first idle"):
+        """Stop timing imports and print the report"""
+        self.mark(label)
+        self.uninstall()
+        print(self.report())
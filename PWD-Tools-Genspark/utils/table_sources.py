@@ -0,0 +1,196 @@
+"""
+Table Sources for PWD Tools Desktop Application
+Paged row sources behind the data grid, with sorting and filtering done in pandas or SQL
+"""
+
+# Escape character for LIKE patterns built from filter text
+LIKE_ESCAPE = "\\"
+
+
+class DataFrameSource:
+    """Rows of a pandas DataFrame in display order
+
+    Filtering and sorting produce an array of row positions into the
+    frame; rows() only converts the requested slice to tuples, so a view
+    over a large sheet never copies or formats the whole frame.
+    """
+
+    def __init__(self, frame, columns=None):
+        self.frame = frame
+        self.columns = list(columns) if columns is not None else [str(column) for column in frame.columns]
+        self._frame_columns = list(columns) if columns is not None else list(frame.columns)
+        self.filter_text = ""
+        self.sort_column = None
+        self.descending = False
+        self._lowered = {}
+        self.positions = None
+        self.refresh()
+
+    @property
+    def total(self):
+        return len(self.frame)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def refresh(self):
+        """Re-apply the filter and sort, e.g. after the frame changed"""
+        self._lowered = {}
+        self._apply()
+
+    def _apply(self):
+        import numpy as np
+
+        positions = np.arange(len(self.frame))
+        if self.filter_text:
+            positions = positions[self._filter_mask()]
+        if self.sort_column is not None:
+            positions = positions[self._sort_order(positions)]
+        self.positions = positions
+
+    def filter(self, text):
+        """Keep rows where any column contains text (case-insensitive)"""
+        self.filter_text = (text or "").strip().lower()
+        self._apply()
+
+    def sort(self, column, descending=False):
+        """Order rows by one column; None restores the frame order"""
+        self.sort_column = column
+        self.descending = descending
+        self._apply()
+
+    def _lowered_column(self, column):
+        """Return (codes, lowered distinct texts) for a column, computed once"""
+        cached = self._lowered.get(column)
+        if cached is None:
+            import pandas as pd
+
+            codes, uniques = pd.factorize(self.frame[column], use_na_sentinel=True)
+            lowered = pd.Series([str(value).lower() for value in uniques], dtype=object)
+            cached = (codes, lowered)
+            self._lowered[column] = cached
+        return cached
+
+    def _filter_mask(self):
+        import numpy as np
+
+        mask = np.zeros(len(self.frame), dtype=bool)
+        for column in self._frame_columns:
+            codes, lowered = self._lowered_column(column)
+            # Match each distinct value once; the NA code -1 picks the trailing False
+            matches = np.append(lowered.str.contains(self.filter_text, regex=False).to_numpy(dtype=bool), False)
+            mask |= matches[codes]
+        return mask
+
+    def _sort_order(self, positions):
+        import pandas as pd
+
+        column = self._frame_columns[self.columns.index(self.sort_column)]
+        values = pd.Series(self.frame[column].to_numpy()[positions])
+        try:
+            ordered = values.sort_values(ascending=not self.descending, kind="mergesort", na_position="last")
+        except TypeError:
+            # Mixed types in an object column; compare as text
+            ordered = values.astype(str).sort_values(ascending=not self.descending, kind="mergesort")
+        return ordered.index.to_numpy()
+
+    def rows(self, start, stop):
+        """Return [(row position, values tuple)] for display rows start..stop"""
+        positions = self.positions[start:stop]
+        if not len(positions):
+            return []
+        block = self.frame.iloc[positions][self._frame_columns]
+        return list(zip(positions.tolist(), block.itertuples(index=False, name=None)))
+
+
+class QuerySource:
+    """Rows of a database table in display order
+
+    The filter and sort are pushed down to SQLite: one query returns the
+    ids of the matching rows in order, and rows() fetches only the
+    requested slice by primary key. Scrolling therefore costs one small
+    indexed lookup per screenful, however deep the position. With
+    include_archives the rows of archived financial years are shown too.
+    """
+
+    def __init__(self, db_manager, table_name, columns, where=None, params=None,
+                 order_by="id", descending=True, include_archives=False):
+        self.db_manager = db_manager
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.where = where
+        self.params = list(params or [])
+        self.include_archives = include_archives
+        self.filter_text = ""
+        self.default_order = (order_by, descending)
+        self.sort_column = None
+        self.descending = descending
+        self.ids = []
+        self.total = 0
+        self.refresh()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def refresh(self):
+        """Re-run the id query, e.g. after rows were saved"""
+        conditions = []
+        params = []
+        if self.where:
+            conditions.append(f"({self.where})")
+            params.extend(self.params)
+        base_count = len(conditions)
+        if self.filter_text:
+            pattern = "%" + self._escape_like(self.filter_text) + "%"
+            conditions.append("(" + " OR ".join(
+                f"CAST({column} AS TEXT) LIKE ? ESCAPE '{LIKE_ESCAPE}'" for column in self.columns
+            ) + ")")
+            params.extend([pattern] * len(self.columns))
+
+        order_by, descending = self.default_order
+        if self.sort_column is not None:
+            order_by, descending = self.sort_column, self.descending
+        where = " AND ".join(conditions) or None
+        try:
+            self.ids = self.db_manager.fetch_ids(
+                self.table_name, order_by, descending, where, params, self.include_archives
+            )
+        except ValueError as e:
+            print(f"Error loading table rows: {e}")
+            self.ids = []
+
+        if len(conditions) == base_count:
+            self.total = len(self.ids)
+        elif self.include_archives:
+            self.total = len(self.db_manager.fetch_ids(
+                self.table_name, where=self.where, params=self.params, include_archives=True
+            ))
+        else:
+            query = f"SELECT COUNT(*) FROM {self.table_name}"
+            if self.where:
+                query += f" WHERE {self.where}"
+            row = self.db_manager.fetch_one(query, self.params or None)
+            self.total = row[0] if row else len(self.ids)
+
+    def _escape_like(self, text):
+        for special in (LIKE_ESCAPE, "%", "_"):
+            text = text.replace(special, LIKE_ESCAPE + special)
+        return text
+
+    def filter(self, text):
+        """Keep rows where any column contains text (LIKE is case-insensitive for ASCII)"""
+        self.filter_text = (text or "").strip()
+        self.refresh()
+
+    def sort(self, column, descending=False):
+        """Order rows by one column; None restores the default order"""
+        self.sort_column = column
+        self.descending = descending
+        self.refresh()
+
+    def rows(self, start, stop):
+        """Return [(row id, values tuple)] for display rows start..stop"""
+        rows = self.db_manager.fetch_by_ids(
+            self.table_name, self.columns, self.ids[start:stop], self.include_archives
+        )
+        return [(row[0], tuple(row[1:])) for row in rows]
@@ -0,0 +1,231 @@
+"""
+Task Runner for PWD Tools Desktop Application
+Runs long operations off the Tk main thread and reports back through root.after
+"""
+
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+DEFAULT_TASK_WORKERS = 4
+TASK_POLL_MS = 100
+
+# One runner per Tk root, shared by the main window and every tool window
+_runners = {}
+
+
+def task_runner_for(widget):
+    """Return the shared TaskRunner of the Tk root a widget belongs to"""
+    root = widget._root()
+    runner = _runners.get(root)
+    if runner is None:
+        runner = TaskRunner(root)
+        _runners[root] = runner
+    return runner
+
+
+class TaskHandle:
+    """State of one submitted job, updated on the Tk main thread
+
+    Jobs submitted with report_progress=True receive the handle as their
+    first argument and may call report() and check cancelled from the
+    worker thread. status is 'running', 'done', 'error' or 'cancelled'.
+    """
+
+    def __init__(self, key, description, cancellable):
+        self.key = key
+        self.description = description
+        self.cancellable = cancellable
+        self.status = "running"
+        self.done_count = 0
+        self.total = None
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.future = None
+        self._runner = None
+        self._cancel_event = threading.Event()
+        self._callbacks = []
+        self._listeners = []
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self):
+        return self.status != "running"
+
+    def report(self, done=None, total=None, message=None):
+        """Post progress from the worker; the GUI picks it up on its next poll"""
+        self._runner.messages.put(("progress", self, done, total, message))
+
+    def cancel(self):
+        """Ask the job to stop; jobs that have not started yet never run"""
+        if self.finished:
+            return
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def subscribe(self, listener):
+        """Call listener(handle) on the main thread on every progress or state change"""
+        self._listeners.append(listener)
+
+    def _notify(self):
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Error updating task listener: {e}")
+
+
+class TaskRunner:
+    """Shared thread/process pool for tool windows
+
+    submit() returns at once with a TaskHandle. Results, errors and
+    progress are queued by the workers and delivered to the callbacks on
+    the Tk main thread by a root.after() poll that only runs while jobs
+    are active. Submitting a job whose key matches a running job returns
+    the running job's handle instead of starting it twice.
+    """
+
+    def __init__(self, root, max_workers=DEFAULT_TASK_WORKERS):
+        self.root = root
+        self.max_workers = max_workers
+        self.messages = queue.Queue()
+        self.active = {}
+        self._threads = None
+        self._processes = None
+        self._polling = False
+
+    def submit(self, fn, *args, key=None, description="", on_done=None, on_error=None,
+               report_progress=False, use_process=False, **kwargs):
+        """Run fn(*args, **kwargs) in the background
+
+        on_done(result) and on_error(message) run on the Tk main thread.
+        A job cancelled before it started runs neither; one that returns
+        after being asked to cancel still gets on_done, so work it
+        completed is reported. With report_progress the
+        job is called as fn(handle, *args, **kwargs). use_process runs it
+        in a worker process (fn and arguments must be picklable, and
+        progress reporting is not available there).
+        """
+        if key is not None and key in self.active:
+            handle = self.active[key]
+            handle._callbacks.append((on_done, on_error))
+            return handle
+
+        if use_process and report_progress:
+            raise ValueError("Progress reporting is only available for thread jobs")
+        handle = TaskHandle(key, description, cancellable=report_progress)
+        handle._runner = self
+        handle._callbacks.append((on_done, on_error))
+        if report_progress:
+            args = (handle,) + args
+
+        executor = self._process_pool() if use_process else self._thread_pool()
+        handle.future = executor.submit(fn, *args, **kwargs)
+        self.active[key if key is not None else id(handle)] = handle
+        handle.future.add_done_callback(lambda future: self.messages.put(("finished", handle)))
+        self._ensure_polling()
+        return handle
+
+    def _thread_pool(self):
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pwd-task")
+        return self._threads
+
+    def _process_pool(self):
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._processes
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(TASK_POLL_MS, self.poll)
+
+    def poll(self):
+        """Deliver queued progress and results on the Tk main thread"""
+        try:
+            while True:
+                message = self.messages.get_nowait()
+                if message[0] == "progress":
+                    _, handle, done, total, text = message
+                    if handle.finished:
+                        continue
+                    if done is not None:
+                        handle.done_count = done
+                    if total is not None:
+                        handle.total = total
+                    if text is not None:
+                        handle.message = text
+                    handle._notify()
+                else:
+                    self._finish(message[1])
+        except queue.Empty:
+            pass
+
+        if self.active:
+            try:
+                self.root.after(TASK_POLL_MS, self.poll)
+                return
+            except Exception:
+                # Root window was destroyed; nothing left to report to
+                pass
+        self._polling = False
+
+    def _finish(self, handle):
+        for key, active in list(self.active.items()):
+            if active is handle:
+                del self.active[key]
+
+        # A job asked to cancel may still have finished (or stopped early
+        # with part of its work done); its result is delivered all the same
+        future = handle.future
+        if future.cancelled():
+            handle.status = "cancelled"
+        elif future.exception() is not None:
+            if handle.cancelled:
+                handle.status = "cancelled"
+            else:
+                handle.status = "error"
+                handle.error = str(future.exception()) or type(future.exception()).__name__
+        else:
+            handle.status = "done"
+            handle.result = future.result()
+        handle._notify()
+
+        for on_done, on_error in handle._callbacks:
+            try:
+                if handle.status == "done" and on_done is not None:
+                    on_done(handle.result)
+                elif handle.status == "error" and on_error is not None:
+                    on_error(handle.error)
+                elif handle.status == "error":
+                    print(f"Error in background task {handle.description or handle.key}: {handle.error}")
+            except Exception as e:
+                print(f"Error in task callback: {e}")
+
+    def cancel_all(self):
+        for handle in list(self.active.values()):
+            handle.cancel()
+
+    def shutdown(self):
+        """Cancel pending jobs and stop the pools without waiting
+
+        Called when the application closes. Jobs already running are asked
+        to cancel; a thread job that cannot stop part-way still finishes
+        before the interpreter exits.
+        """
+        self.cancel_all()
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
@@ -0,0 +1,280 @@
+"""
+Template Engine for PWD Tools Desktop Application
+Precompiled HTML document templates rendered by plain substitution
+"""
+
+import html
+import io
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+from utils.indian_numbering import amount_to_words, format_indian_number, format_inr, number_to_words
+from utils.report_templates import REPORT_TEMPLATES
+
+# {{ field }} or {{ field|filter }}; CSS braces are left alone
+PLACEHOLDER = re.compile(r"\{\{\s*([\w.]+)\s*(?:\|\s*(\w+)\s*)?\}\}")
+DEPARTMENT_DEFAULTS = {
+    "name": "Public Works Department",
+    "office": "PWD Office, Udaipur",
+    "state": "Rajasthan",
+    "contact": "",
+}
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+    # NaN and NaT are not equal to themselves; pandas NA refuses the comparison
+    try:
+        return bool(value != value)
+    except (TypeError, ValueError):
+        return True
+
+
+def _text(value):
+    return html.escape(str(value))
+
+
+def _date(value):
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%d/%m/%Y')
+    return _text(value)
+
+
+def _lines(value):
+    return _text(value).replace("\n", "<br>\n")
+
+
+# Filter name -> function turning a present value into HTML text
+FILTERS = {
+    "text": _text,
+    "raw": str,
+    "date": _date,
+    "lines": _lines,
+    "inr": lambda value: format_inr(value),
+    "inr0": lambda value: format_inr(value, 0),
+    "number": lambda value: format_indian_number(value),
+    "number0": lambda value: format_indian_number(value, 0),
+    "words": lambda value: _text(amount_to_words(value)),
+    "words_hi": lambda value: _text(amount_to_words(value, "hi")),
+    "rupee_words": lambda value: _text(number_to_words(int(float(value)))),
+}
+
+
+def format_value(value, filter_name="text"):
+    """Return one field value as HTML text; missing values give ''"""
+    if _is_missing(value):
+        return ""
+    return FILTERS[filter_name](value)
+
+
+def format_column(values, filter_name="text"):
+    """format_value for a whole column, converting each distinct value once
+
+    Values are told apart by type too: True, 1 and 1.0 are equal in Python
+    but each is formatted as itself.
+    """
+    convert = FILTERS[filter_name]
+    converted = {}
+    column = []
+    for value in values:
+        if _is_missing(value):
+            column.append("")
+            continue
+        key = (type(value), value)
+        try:
+            text = converted[key]
+        except KeyError:
+            text = converted[key] = convert(value)
+        except TypeError:
+            # Unhashable values are converted every time
+            text = convert(value)
+        column.append(text)
+    return column
+
+
+class CompiledTemplate:
+    """A template split once into static text and field slots
+
+    Rendering interleaves the static parts with the formatted field
+    values and joins them; nothing is parsed again. bind() turns fields
+    that are the same for every render (department details, run date)
+    into static text.
+    """
+
+    def __init__(self, literals, slots):
+        self.literals = tuple(literals)
+        self.slots = tuple(slots)
+        self.fields = tuple(dict.fromkeys(name for name, _ in self.slots))
+        # Static parts at even positions; field values fill the odd ones
+        self._parts = [None] * (2 * len(self.slots) + 1)
+        self._parts[0::2] = self.literals
+
+    @classmethod
+    def compile(cls, source):
+        """Split source into len(slots) + 1 static parts and the (field, filter) slots"""
+        for match in PLACEHOLDER.finditer(source):
+            filter_name = match.group(2) or "text"
+            if filter_name not in FILTERS:
+                raise ValueError(f"Unknown template filter '{filter_name}' in {match.group(0)}")
+        pieces = PLACEHOLDER.split(source)
+        literals = pieces[0::3]
+        slots = [(name, filter_name or "text") for name, filter_name in zip(pieces[1::3], pieces[2::3])]
+        return cls(literals, slots)
+
+    def bind(self, values):
+        """Return a template with the fields present in values fixed as static text"""
+        literals = [self.literals[0]]
+        slots = []
+        for (name, filter_name), literal in zip(self.slots, self.literals[1:]):
+            if name in values:
+                literals[-1] += format_value(values[name], filter_name) + literal
+            else:
+                slots.append((name, filter_name))
+                literals.append(literal)
+        return CompiledTemplate(literals, slots)
+
+    def render(self, values):
+        """Render one record given as a dict; absent fields are left empty"""
+        if not self.slots:
+            return self.literals[0]
+        parts = list(self._parts)
+        parts[1::2] = [format_value(values.get(name), filter_name) for name, filter_name in self.slots]
+        return "".join(parts)
+
+    def render_columns(self, columns, count):
+        """Yield count rendered records from preformatted text columns, one per slot"""
+        if not self.slots:
+            for _ in range(count):
+                yield self.literals[0]
+            return
+        parts = list(self._parts)
+        for texts in zip(*columns):
+            parts[1::2] = texts
+            yield "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def compile_template(source):
+    """Compile a template source once per process"""
+    return CompiledTemplate.compile(source)
+
+
+class DocumentTemplate:
+    """An HTML document made of a head, a repeated item and a tail
+
+    A single record renders as head + item + tail; a whole table renders
+    the head and tail once with one item per row, so many receipts can go
+    into one file and print one per page.
+    """
+
+    def __init__(self, head, item, tail):
+        self.head = head
+        self.item = item
+        self.tail = tail
+
+    @classmethod
+    def compile(cls, sources):
+        return cls(*(compile_template(sources[part]) for part in ("head", "item", "tail")))
+
+    def bind(self, values):
+        return DocumentTemplate(self.head.bind(values), self.item.bind(values), self.tail.bind(values))
+
+    def render(self, values):
+        """Render one record as a complete document"""
+        return self.head.render(values) + self.item.render(values) + self.tail.render(values)
+
+    def write_frame(self, stream, frame, columns=None):
+        """Write every row of a DataFrame (or list of dicts) as one document
+
+        columns maps template fields to differently named frame columns.
+        Each field is formatted column-wise before the rows are assembled.
+        Returns the number of records written.
+        """
+        import pandas as pd
+
+        if not isinstance(frame, pd.DataFrame):
+            frame = pd.DataFrame(list(frame))
+        columns = columns or {}
+        count = len(frame)
+        texts = []
+        for name, filter_name in self.item.slots:
+            column = columns.get(name, name)
+            if column in frame.columns:
+                texts.append(format_column(frame[column].to_numpy(dtype=object), filter_name))
+            else:
+                texts.append([""] * count)
+
+        stream.write(self.head.render({}))
+        for record in self.item.render_columns(texts, count):
+            stream.write(record)
+        stream.write(self.tail.render({}))
+        return count
+
+
+class TemplateEngine:
+    """Registry of compiled document templates with the department details filled in
+
+    Templates are compiled once and the department block from settings is
+    bound into them on first use. The bound copy is kept until the
+    department details change, so rendering only substitutes record
+    fields. A 'generated_on' timestamp is bound per render call.
+    """
+
+    def __init__(self, settings=None, templates=None):
+        self.settings = settings
+        self.templates = templates if templates is not None else REPORT_TEMPLATES
+        self._bound = {}
+
+    def department_values(self):
+        """Return the dept.* template fields from settings"""
+        dept_info = self.settings.get_department_info() if self.settings is not None else {}
+        return {
+            f"dept.{key}": dept_info.get(key) or default
+            for key, default in DEPARTMENT_DEFAULTS.items()
+        }
+
+    def get(self, name):
+        """Return the named template with the department details bound"""
+        if name not in self.templates:
+            raise KeyError(f"Unknown template '{name}'")
+        department = self.department_values()
+        key = tuple(department.items())
+        cached = self._bound.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, DocumentTemplate.compile(self.templates[name]).bind(department))
+            self._bound[name] = cached
+        return cached[1]
+
+    def _context(self, context):
+        values = {"generated_on": datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+        values.update(context or {})
+        return values
+
+    def render(self, name, values, context=None):
+        """Render one record as a complete HTML document"""
+        template = self.get(name)
+        merged = self._context(context)
+        merged.update(values)
+        return template.render(merged)
+
+    def render_frame(self, name, frame, stream=None, context=None, columns=None):
+        """Render all rows into stream, or return the document when stream is None"""
+        template = self.get(name).bind(self._context(context))
+        if stream is not None:
+            template.write_frame(stream, frame, columns)
+            return None
+        buffer = io.StringIO()
+        template.write_frame(buffer, frame, columns)
+        return buffer.getvalue()
+
+    def write_frame(self, name, frame, filename, context=None, columns=None):
+        """Render all rows into an HTML file; returns True on success"""
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                self.render_frame(name, frame, f, context, columns)
+            return True
+        except Exception as e:
+            print(f"Error writing {name} document: {e}")
+            return False